@@ -0,0 +1,276 @@
+"""
+FixtureSite: A local, deterministic copy of the Airbnb markup the page objects rely on.
+
+Serves the search form, paginated result pages (cards, pagination bar and the
+StaysSearch API), listing pages and the booking page, so the page objects run
+unchanged against 127.0.0.1 with a known number of listings and pages.
+"""
+import html
+import json
+import random
+import threading
+from contextlib import contextmanager
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, urlencode, unquote
+
+# Search URL query parameters carried over to listing URLs (same mapping as the real site)
+_LISTING_QUERY_PARAMS = {"adults": "adults", "children": "children", "checkin": "check_in", "checkout": "check_out"}
+
+# Header wrapper of the search form: body > div:nth-child(6) > div x9 > header > form
+_HEADER_DEPTH = 9
+
+_SEARCH_SCRIPT = """
+const state = {checkin: null, checkout: null, adults: 0, children: 0};
+const show = (id) => { document.getElementById(id).style.display = "block"; };
+document.getElementById("checkin-field").onclick = () => show("calendar");
+document.getElementById("who-field").onclick = () => show("guests");
+document.querySelectorAll("button[data-state--date-string]").forEach(button => button.onclick = () => {
+    const day = button.getAttribute("data-state--date-string");
+    if (!state.checkin || state.checkout) { state.checkin = day; state.checkout = null; }
+    else { state.checkout = day; }
+});
+for (const kind of ["adults", "children"]) {
+    const stepper = document.getElementById("stepper-" + kind);
+    stepper.children[2].onclick = () => { state[kind] += 1; stepper.children[1].innerText = state[kind]; };
+}
+document.getElementById("search-button").onclick = () => {
+    const where = document.getElementById("bigsearch-query-location-input").value.trim().replace(/ /g, "-");
+    const query = new URLSearchParams({checkin: state.checkin, checkout: state.checkout,
+                                       adults: state.adults, children: state.children});
+    location.href = "/s/" + encodeURIComponent(where) + "/homes?" + query;
+};
+"""
+
+# Result pages load their listings from the search API, like the real site
+_RESULTS_SCRIPT = 'fetch("/api/v3/StaysSearch?" + location.search.slice(1));'
+
+
+class FixtureSite:
+    """
+    Generates and serves the fixture pages.
+
+    Listings are derived from a seeded random generator, so the same arguments always
+    produce the same site (and the same best listing).
+    """
+
+    def __init__(self, listings_per_page=20, pages=3, seed=1, calendar_start=None, calendar_days=62):
+        """
+        Initialize FixtureSite.
+
+        Args:
+            listings_per_page: Listing cards on every result page
+            pages: Number of result pages
+            seed: Seed of the generated ratings, reviews and prices
+            calendar_start: First date offered by the date picker (defaults to the 1st of next month)
+            calendar_days: Number of selectable dates
+        """
+        self.listings_per_page = listings_per_page
+        self.pages = pages
+        today = date.today()
+        self.calendar_start = calendar_start or (today.replace(day=28) + timedelta(days=4)).replace(day=1)
+        self.calendar_days = calendar_days
+        self.listings = self._generate_listings(seed)
+
+    def _generate_listings(self, seed):
+        rng = random.Random(seed)
+        listings = []
+        for i in range(self.listings_per_page * self.pages):
+            # Every tenth listing is new: no rating, so the page objects must skip it
+            rated = i % 10 != 9
+            listings.append({
+                "id": 10_000 + i,
+                "title": f"Fixture home {i + 1}",
+                "rating": round(rng.uniform(3.5, 5.0), 2) if rated else None,
+                "reviews": rng.randint(1, 500) if rated else 0,
+                "price": rng.randint(80, 900),
+            })
+        return listings
+
+    @property
+    def best_listing(self):
+        """The listing the page objects should pick: highest rating, then lowest price."""
+        rated = [listing for listing in self.listings if listing["rating"] is not None]
+        return min(rated, key=lambda listing: (-listing["rating"], listing["price"]))
+
+    @contextmanager
+    def serve(self, host="127.0.0.1", port=0):
+        """
+        Serve the site from a background thread.
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 = any free port)
+
+        Yields:
+            str: Base URL of the running site
+        """
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                site._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        thread = threading.Thread(target=server.serve_forever, name="fixture-site", daemon=True)
+        thread.start()
+        try:
+            yield f"http://{host}:{server.server_address[1]}"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def _handle(self, request):
+        url = urlparse(request.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if url.path == "/":
+            body, content_type = self.search_page(), "text/html"
+        elif url.path.startswith("/s/"):
+            body, content_type = self.result_page(unquote(url.path.split("/")[2]), query), "text/html"
+        elif url.path == "/api/v3/StaysSearch":
+            body, content_type = json.dumps(self.search_api(query)), "application/json"
+        elif url.path.startswith("/rooms/"):
+            body, content_type = self.listing_page(int(url.path.rsplit("/", 1)[-1]), url.query), "text/html"
+        elif url.path.startswith("/book/stays/"):
+            body, content_type = self.booking_page(query), "text/html"
+        else:
+            request.send_error(404)
+            return
+
+        payload = body.encode()
+        request.send_response(200)
+        request.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        request.send_header("Content-Length", str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
+
+    # --- Pages ---
+
+    def search_page(self):
+        """Search form with destination, date picker, guest steppers and search button."""
+        days = (self.calendar_start + timedelta(days=n) for n in range(self.calendar_days))
+        calendar = "".join(f'<button data-state--date-string="{day.isoformat()}">{day.day}</button>' for day in days)
+        steppers = "".join(
+            f'<div id="stepper-{kind}"><button>-</button><span>0</span><button>+</button></div>'
+            for kind in ("adults", "children"))
+
+        # form > div > div > div:nth-child(2) holds the fields (2nd child) and the search button (3rd child)
+        fields = "".join([
+            '<div><input id="bigsearch-query-location-input" placeholder="Where"></div>',
+            "<div></div>",
+            '<div><div><div>Check in</div><div id="checkin-field">Add dates</div></div></div>',
+            "<div></div>", "<div></div>", "<div></div>",
+            '<div><div><div><div><div id="who-field">Add guests</div></div></div></div></div>',
+        ])
+        form = (f'<form><div><div><div></div><div><div></div><div>{fields}</div>'
+                f'<div><button id="search-button" type="button">Search</button></div></div></div></div></form>')
+        header = "<div>" * _HEADER_DEPTH + f"<header>{form}</header>" + "</div>" * _HEADER_DEPTH
+
+        return self._document("Search", "<div></div>" * 5 + f"<div>{header}</div>"
+                              + f'<div id="calendar" style="display:none">{calendar}</div>'
+                              + f'<div id="guests" style="display:none">{steppers}</div>',
+                              _SEARCH_SCRIPT)
+
+    def result_page(self, location, query):
+        """One page of listing cards with the pagination bar."""
+        page_number = self._page_number(query)
+        listing_query = self._listing_query(query)
+
+        cards = "".join(self._card(listing, listing_query) for listing in self._page_listings(page_number))
+
+        links = "".join(f'<a href="{html.escape(self._page_href(location, query, n))}">{n}</a>'
+                        for n in range(1, self.pages + 1))
+        if page_number < self.pages:
+            links += f'<a href="{html.escape(self._page_href(location, query, page_number + 1))}">Next</a>'
+        else:
+            links += "<button disabled>Next</button>"
+
+        # #site-content > div > div > div > div > div > nav > div > a
+        content = (f'<div id="site-content"><div><div><div><div><div>{cards}</div>'
+                   f'<div><nav><div>{links}</div></nav></div></div></div></div></div></div>')
+        return self._document(f"{location} - page {page_number}", content, _RESULTS_SCRIPT)
+
+    def search_api(self, query):
+        """StaysSearch payload of one result page, in the shape read by utils.search_api_parser."""
+        results = [{
+            "listing": {"id": str(listing["id"]), "name": listing["title"]},
+            "avgRatingLocalized": self._rating_text(listing),
+            "structuredDisplayPrice": {"primaryLine": {"accessibilityLabel": f"${listing['price']} per night"}},
+        } for listing in self._page_listings(self._page_number(query))]
+        return {"data": {"presentation": {"staysSearch": {"results": {"searchResults": results}}}}}
+
+    def listing_page(self, listing_id, raw_query):
+        """Listing details with the 'Reserve' button leading to the booking page."""
+        href = html.escape(f"/book/stays/{listing_id}?{raw_query}")
+        content = (f'<div id="site-content"><h1>Listing {listing_id}</h1>'
+                   f'<button onclick="location.href=\'{href}\'">Reserve</button></div>')
+        return self._document(f"Listing {listing_id}", content)
+
+    def booking_page(self, query):
+        """Booking summary (guests, dates), 'Next' button and the phone form."""
+        guests = int(query.get("adults", 0)) + int(query.get("children", 0))
+        dates = self._date_range_text(query.get("check_in"), query.get("check_out"))
+
+        # #site-content > div > div > div > div:nth-child(1) > div > div:nth-child(2) > div > div
+        #   > div:nth-child(1) > div > div > button
+        next_button = "<div>" * 6 + "<button>Next</button>" + "</div>" * 6
+        summary = f"<div><div>{guests} guests</div><div>{dates}</div></div>"
+        content = (f'<div id="site-content"><div><div><div><div><div>{summary}{next_button}</div></div>'
+                   f'</div></div></div></div>')
+
+        # body > div:nth-child(16) > div > section > div x6 > form > div > div > button
+        form = ('<form><div><div><input id="phoneInputphone-login" type="tel">'
+                '<button type="button">Continue</button></div></div></form>')
+        phone = "<div><section>" + "<div>" * 6 + form + "</div>" * 6 + "</section></div>"
+
+        return self._document("Confirm and pay", content + "<div></div>" * 14 + f"<div>{phone}</div>")
+
+    # --- Helpers ---
+
+    @staticmethod
+    def _document(title, body, script=""):
+        # Scripts go last, so they do not shift the nth-child positions the selectors rely on
+        return (f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title></head>"
+                f"<body>{body}<script>{script}</script></body></html>")
+
+    def _page_number(self, query):
+        offset = int(query.get("items_offset", 0))
+        return min(offset // self.listings_per_page + 1, self.pages)
+
+    def _page_listings(self, page_number):
+        start = (page_number - 1) * self.listings_per_page
+        return self.listings[start:start + self.listings_per_page]
+
+    def _page_href(self, location, query, page_number):
+        params = {key: value for key, value in query.items() if key != "items_offset"}
+        if page_number > 1:
+            params["items_offset"] = (page_number - 1) * self.listings_per_page
+        return f"/s/{location}/homes?{urlencode(params)}"
+
+    @staticmethod
+    def _listing_query(query):
+        return urlencode({listing_name: query[search_name]
+                          for search_name, listing_name in _LISTING_QUERY_PARAMS.items() if search_name in query})
+
+    @staticmethod
+    def _rating_text(listing):
+        return f"{listing['rating']:.2f} ({listing['reviews']})" if listing["rating"] is not None else "New"
+
+    def _card(self, listing, listing_query):
+        return (f'<div data-testid="card-container"><a href="/rooms/{listing["id"]}?{html.escape(listing_query)}">'
+                f'<div data-testid="listing-card-title">{html.escape(listing["title"])}</div></a>'
+                f'<span aria-hidden="true">{self._rating_text(listing)}</span>'
+                f'<span>${listing["price"]} per night</span></div>')
+
+    @staticmethod
+    def _date_range_text(checkin, checkout):
+        # 'Jun 18 – 20', as shown in the booking summary
+        try:
+            start, end = date.fromisoformat(checkin), date.fromisoformat(checkout)
+        except (TypeError, ValueError):
+            return ""
+        return f"{start.strftime('%b')} {start.day} – {end.day}"
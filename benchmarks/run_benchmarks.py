@@ -0,0 +1,306 @@
+"""
+Benchmarks the search -> rank -> reserve page objects against the local fixture site.
+
+Every stage (search, results, reserve) is measured for wall time, Playwright IPC calls
+(messages sent to the browser driver) and peak Python memory. The medians over all
+repeats are compared with the stored baselines; a stage that got slower, chattier or
+heavier than the baseline allows fails the run.
+
+Usage:
+    python -m benchmarks.run_benchmarks --listings 20 --pages 3 --repeat 5
+    python -m benchmarks.run_benchmarks --update-baselines
+    python -m benchmarks.run_benchmarks --require-baseline   # default when CI is set
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from importlib.metadata import version
+from pathlib import Path
+
+from playwright.sync_api import sync_playwright
+
+from benchmarks.fixture_site import FixtureSite
+from config.config import RESULT_PAGES_CONCURRENCY, EXTRACTION_MODE, SEARCH_MODE
+from pages.airbnb_search_page import AirbnbSearchPage
+from pages.airbnb_result_page import AirbnbResultPage
+from pages.airbnb_reservation_page import AirbnbReservationPage
+from pages.base_page import BasePage
+from utils.locator_registry import LocatorRegistry
+from utils.logging_utils import get_logger
+from utils.timing_profile import TimingProfile
+
+DEFAULT_BASELINES_PATH = Path(__file__).parent / "baselines.json"
+
+# Metrics compared with the baselines (wall time, IPC calls, peak memory)
+METRICS = ("wall_ms", "ipc_calls", "peak_kb")
+
+STAGES = ("search", "results", "reserve")
+
+log = get_logger("Benchmarks")
+
+
+class IpcCounter:
+    """
+    Counts the protocol messages a Playwright connection sends to the driver.
+
+    Every page-object call that touches the browser is one or more round trips over
+    this connection, so the count tracks chattiness independently of machine speed.
+    """
+
+    def __init__(self, page):
+        """
+        Start counting the messages sent over the connection of a page.
+
+        Args:
+            page: Sync Playwright page
+
+        Raises:
+            RuntimeError: If the Playwright internals this relies on are missing
+        """
+        # Playwright has no public hook for this; wrap the connection's send method.
+        # It is private API, so the Playwright version is pinned in requirements.txt.
+        try:
+            self._connection = page._impl_obj._connection
+            self._send = self._connection._send_message_to_server
+        except AttributeError as e:
+            raise RuntimeError(f"Cannot count IPC calls: playwright {version('playwright')} has no "
+                               f"Connection._send_message_to_server ({e}); install the version pinned in "
+                               f"requirements.txt or update IpcCounter") from e
+        self.calls = Counter()
+
+        def counting_send(object, method, *args, **kwargs):
+            self.calls[method] += 1
+            return self._send(object, method, *args, **kwargs)
+
+        self._connection._send_message_to_server = counting_send
+
+    @property
+    def total(self):
+        """Number of messages sent so far."""
+        return sum(self.calls.values())
+
+    def close(self):
+        """Stop counting."""
+        del self._connection._send_message_to_server
+
+
+class StageMeter:
+    """Measures wall time, IPC calls and peak Python memory of each benchmark stage."""
+
+    def __init__(self, ipc):
+        """
+        Initialize StageMeter.
+
+        Args:
+            ipc: IpcCounter of the page the stages run on
+        """
+        self.ipc = ipc
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Measure the enclosed block as one stage.
+
+        Args:
+            name: Stage name
+        """
+        calls_before = self.ipc.total
+        tracemalloc.reset_peak()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        yield
+        wall_ms = (time.perf_counter() - started) * 1000
+        self.stages[name] = {
+            "wall_ms": round(wall_ms, 1),
+            "ipc_calls": self.ipc.total - calls_before,
+            "peak_kb": round((tracemalloc.get_traced_memory()[1] - memory_before) / 1024, 1),
+        }
+
+
+def run_flow(browser, base_url, scenario, concurrency, extraction_mode, search_mode):
+    """
+    Run one search -> rank -> reserve flow in a fresh context and measure its stages.
+
+    Args:
+        browser: Sync Playwright browser
+        base_url: URL of the running fixture site
+        scenario: Scenario dict (location, dates, guests, phone)
+        concurrency: Result pages loaded at once
+        extraction_mode: Listing source of the result page ('dom' or 'network')
+        search_mode: 'ui' (fill the search form) or 'url' (open the results URL)
+
+    Returns:
+        tuple: (per-stage metrics, selected best listing)
+    """
+    context = browser.new_context()
+    try:
+        page = context.new_page()
+        ipc = IpcCounter(page)
+        meter = StageMeter(ipc)
+        try:
+            with meter.stage("search"):
+                results = AirbnbResultPage(page, extraction_mode)
+                search_page = AirbnbSearchPage(page)
+                search_page.goto(base_url)
+                search_page.search(scenario["location"], scenario["checkin"], scenario["checkout"],
+                                   scenario["adults"], scenario["children"], search_mode)
+
+            with meter.stage("results"):
+                best = results.find_best_rated_cheapest_listing(concurrency=concurrency)
+
+            with meter.stage("reserve"):
+                AirbnbReservationPage(results.listing_page).reserve(scenario["phone"], scenario)
+        finally:
+            ipc.close()
+    finally:
+        context.close()
+
+    return meter.stages, best
+
+
+def run_benchmarks(site, scenario, repeat=3, concurrency=RESULT_PAGES_CONCURRENCY, extraction_mode=EXTRACTION_MODE,
+                   search_mode=SEARCH_MODE, headless=True):
+    """
+    Run the flow `repeat` times against the fixture site.
+
+    Args:
+        site: FixtureSite to serve
+        scenario: Scenario dict; its dates must lie in the site's calendar
+        repeat: Number of measured runs (after one warm-up run)
+        concurrency: Result pages loaded at once
+        extraction_mode: Listing source of the result page
+        search_mode: 'ui' or 'url'
+        headless: Whether to run the browser headless
+
+    Returns:
+        dict: Median metrics per stage
+
+    Raises:
+        AssertionError: If a run selects another listing than the site's best one
+    """
+    runs = []
+
+    # The fixture markup differs from the real site's, so its winning locator strategies are cached apart
+    BasePage.locator_registry = LocatorRegistry("temp/fixture_locator_cache.json")
+    # Fixed timeouts, so results do not depend on what earlier runs taught the timing profile
+    BasePage.timing_profile = TimingProfile(profile="off")
+
+    tracemalloc.start()
+    try:
+        with site.serve() as base_url, sync_playwright() as playwright:
+            browser = playwright.chromium.launch(headless=headless)
+            try:
+                # The first run warms up the browser and the server; it is not measured
+                for run in range(repeat + 1):
+                    stages, best = run_flow(browser, base_url, scenario, concurrency, extraction_mode, search_mode)
+                    assert best["url"].split("?")[0].endswith(f"/rooms/{site.best_listing['id']}"), \
+                        f"Selected {best['url']}, expected listing {site.best_listing['id']}"
+                    if run:
+                        runs.append(stages)
+            finally:
+                browser.close()
+    finally:
+        tracemalloc.stop()
+
+    return {stage: {metric: statistics.median(run[stage][metric] for run in runs) for metric in METRICS}
+            for stage in STAGES}
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare benchmark results with a baseline.
+
+    Args:
+        results: Median metrics per stage
+        baseline: Baseline metrics per stage (same shape)
+        tolerance: Allowed relative increase of every metric (0.2 = 20%)
+
+    Returns:
+        list: One message per regressed metric, empty if none regressed
+    """
+    regressions = []
+    for stage, metrics in results.items():
+        for metric, value in metrics.items():
+            expected = baseline.get(stage, {}).get(metric)
+            if expected is not None and value > expected * (1 + tolerance):
+                regressions.append(f"{stage}.{metric}: {value} > baseline {expected} (+{tolerance:.0%} allowed)")
+    return regressions
+
+
+def load_baselines(path):
+    """Load the stored baselines, keyed by benchmark profile."""
+    path = Path(path)
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def save_baselines(path, baselines):
+    """Write the baselines, one profile per key."""
+    Path(path).write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the page objects against a local fixture site")
+    parser.add_argument("--listings", type=int, default=20, help="Listing cards per result page")
+    parser.add_argument("--pages", type=int, default=3, help="Number of result pages")
+    parser.add_argument("--repeat", type=int, default=3, help="Measured runs (medians are reported)")
+    parser.add_argument("--concurrency", type=int, default=RESULT_PAGES_CONCURRENCY, help="Result pages loaded at once")
+    parser.add_argument("--extraction-mode", default=EXTRACTION_MODE, choices=("dom", "network"),
+                        help="Listing source of the result page")
+    parser.add_argument("--search-mode", default=SEARCH_MODE, choices=("ui", "url"), help="How the search is run")
+    parser.add_argument("--baselines", default=DEFAULT_BASELINES_PATH, help="Baselines JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed increase over the baseline before a metric counts as a regression")
+    parser.add_argument("--update-baselines", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--require-baseline", action=argparse.BooleanOptionalAction, default=bool(os.getenv("CI")),
+                        help="Fail when there is no baseline for this profile (default: on when CI is set)")
+    parser.add_argument("--output", default="reports/benchmarks.json", help="JSON file for the results")
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    args = parser.parse_args()
+
+    site = FixtureSite(args.listings, args.pages)
+    checkin = site.calendar_start.replace(day=18)
+    scenario = {"location": "Tel Aviv", "checkin": checkin.isoformat(),
+                "checkout": checkin.replace(day=20).isoformat(), "adults": 2, "children": 1, "phone": "505555555"}
+
+    # Results only compare with a baseline of the same site size and settings
+    profile = f"{args.listings}x{args.pages}-c{args.concurrency}-{args.extraction_mode}-{args.search_mode}"
+    results = run_benchmarks(site, scenario, args.repeat, args.concurrency, args.extraction_mode, args.search_mode,
+                             not args.headed)
+
+    for stage, metrics in results.items():
+        log.info(f"{profile} {stage:8} {metrics['wall_ms']:9.1f} ms {metrics['ipc_calls']:6.0f} IPC calls "
+                 f"{metrics['peak_kb']:9.1f} KiB peak")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({"profile": profile, "stages": results}, indent=2) + "\n")
+
+    baselines = load_baselines(args.baselines)
+    if args.update_baselines:
+        baselines[profile] = results
+        save_baselines(args.baselines, baselines)
+        log.info(f"Baseline for {profile} written to {args.baselines}")
+        return 0
+
+    if profile not in baselines:
+        message = f"No baseline for {profile} in {args.baselines}; run with --update-baselines to store one"
+        if args.require_baseline:
+            log.error(message)
+            return 1
+        log.warning(message)
+        return 0
+
+    regressions = compare(results, baselines[profile], args.tolerance)
+    for regression in regressions:
+        log.error(f"Regression {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
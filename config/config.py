@@ -8,4 +8,52 @@ Environment & Defaults
 load_dotenv()
 BASE_URL = os.getenv("BASE_URL", "https://www.airbnb.com")
 WAIT_AFTER_ACTION_MS = int(os.getenv("WAIT_AFTER_ACTION_MS", 4000))
+READY_TIMEOUT_MS = int(os.getenv("READY_TIMEOUT_MS", 15000))  # upper bound for readiness waits
+RESULT_PAGES_CONCURRENCY = int(os.getenv("RESULT_PAGES_CONCURRENCY", 1))  # tabs loading result pages at once
+TOP_K_LISTINGS = int(os.getenv("TOP_K_LISTINGS", 5))  # listings kept by the ranking
+RANKING_POLICY = os.getenv("RANKING_POLICY", "rating_price")  # rating_price | weighted
+MIN_REVIEWS = int(os.getenv("MIN_REVIEWS", 0))  # listings with fewer reviews are not ranked
+EXTRACTION_MODE = os.getenv("EXTRACTION_MODE", "dom")  # dom | network (search API responses)
+BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", "")  # e.g. images=off,fonts=off,media=off,analytics=off
+ROUTE_ALLOWLIST = os.getenv("ROUTE_ALLOWLIST", "")  # comma-separated URL regexes never blocked
+CONTEXT_POOL_SIZE = int(os.getenv("CONTEXT_POOL_SIZE", 1))  # warm contexts kept per worker, 0 = fresh per test
+STORAGE_STATE_PATH = os.getenv("STORAGE_STATE_PATH", "temp/storage_state.json")  # warm cookies/local storage snapshot
+SCENARIOS_PATH = os.getenv("SCENARIOS_PATH", "config/test_data.json")  # .json, .jsonl or .csv scenario matrix
+SCENARIO_DURATIONS_PATH = os.getenv("SCENARIO_DURATIONS_PATH", "temp/scenario_durations.json")  # history used to balance shards
+ASYNC_CONCURRENCY = int(os.getenv("ASYNC_CONCURRENCY", 8))  # flows in flight in utils.async_runner
+RETRY_BASE_DELAY_MS = int(os.getenv("RETRY_BASE_DELAY_MS", 250))  # first backoff delay, doubled per retry
+RETRY_MAX_DELAY_MS = int(os.getenv("RETRY_MAX_DELAY_MS", 4000))  # backoff cap
+RETRY_JITTER = float(os.getenv("RETRY_JITTER", 0.5))  # fraction of each delay that is randomized
+RETRY_BUDGET_MS = int(os.getenv("RETRY_BUDGET_MS", 30000))  # retry time allowed per page (test)
+BREAKER_THRESHOLD = int(os.getenv("BREAKER_THRESHOLD", 3))  # failed calls before a selector is no longer retried
+BREAKER_COOLDOWN_SEC = int(os.getenv("BREAKER_COOLDOWN_SEC", 60))  # seconds before a tripped selector is retried again
+LOCATOR_CACHE_PATH = os.getenv("LOCATOR_CACHE_PATH", "temp/locator_cache.json")  # winning locator strategy per element
+SEARCH_MODE = os.getenv("SEARCH_MODE", "ui")  # ui (fill the search form) or url (open the results URL directly)
+BROWSER_DAEMON_URL = os.getenv("BROWSER_DAEMON_URL", "")  # control URL of utils.browser_daemon; empty = launch a browser per session
+BROWSER_DAEMON_MAX_SESSIONS = int(os.getenv("BROWSER_DAEMON_MAX_SESSIONS", 50))  # sessions before the daemon restarts its browser
+BROWSER_DAEMON_MAX_CONTEXTS = int(os.getenv("BROWSER_DAEMON_MAX_CONTEXTS", 16))  # contexts leased out at once
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", "reports/artifacts")  # failure screenshots, DOM snapshots and traces
+ARTIFACT_IMAGE_FORMAT = os.getenv("ARTIFACT_IMAGE_FORMAT", "jpeg")  # jpeg or png
+ARTIFACT_IMAGE_QUALITY = int(os.getenv("ARTIFACT_IMAGE_QUALITY", 70))  # jpeg quality (0-100)
+ARTIFACT_DOM_SNAPSHOTS = os.getenv("ARTIFACT_DOM_SNAPSHOTS", "true").lower() == "true"  # gzipped page HTML on failure
+ARTIFACT_TRACES = os.getenv("ARTIFACT_TRACES", "false").lower() == "true"  # Playwright trace of failed tests
+ARTIFACT_MAX_FILES = int(os.getenv("ARTIFACT_MAX_FILES", 200))  # oldest artifacts beyond this count are pruned
+ARTIFACT_MAX_MB = int(os.getenv("ARTIFACT_MAX_MB", 200))  # oldest artifacts beyond this total size are pruned
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")  # level of the page-object and utility loggers
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # json (one object per line) | text
+LOG_PATH = os.getenv("LOG_PATH", "")  # log file, {worker} = xdist worker id; empty = stderr
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))  # records waiting for the writer before new ones are dropped
+LOG_SAMPLE_BURST = int(os.getenv("LOG_SAMPLE_BURST", 5))  # sampled messages always kept per test and kind
+LOG_SAMPLE_EVERY = int(os.getenv("LOG_SAMPLE_EVERY", 100))  # then one in this many is kept (0 = none)
+OVERLAYS = os.getenv("OVERLAYS", "translation,cookie_consent,login_nudge")  # overlays dismissed in the background
+TIMING_PROFILE = os.getenv("TIMING_PROFILE", "auto")  # local | ci | replay | off | auto (replay/ci/local)
+TIMING_PROFILE_PATH = os.getenv("TIMING_PROFILE_PATH", "temp/timing_profiles.json")  # observed step durations per profile
+TIMING_HEADROOM = float(os.getenv("TIMING_HEADROOM", 1.5))  # tuned timeout = p99 of the step times this factor
+TIMING_MIN_SAMPLES = int(os.getenv("TIMING_MIN_SAMPLES", 20))  # observations before a step timeout is tuned
+TIMING_MIN_MS = int(os.getenv("TIMING_MIN_MS", 1000))  # lower bound of a tuned timeout
+TIMING_MAX_MS = int(os.getenv("TIMING_MAX_MS", 30000))  # upper bound of a tuned timeout
+PREVALIDATE_CANDIDATES = int(os.getenv("PREVALIDATE_CANDIDATES", 0))  # top listings checked in parallel tabs before booking, 0 = off
+PRICE_TOLERANCE = float(os.getenv("PRICE_TOLERANCE", 0.1))  # quoted price may exceed the listed one by this fraction
+RESULTS_STORE_PATH = os.getenv("RESULTS_STORE_PATH", "temp/results.jsonl")  # append-only run history (index: <path>.idx)
+RUN_ID = os.getenv("RUN_ID", "")  # id of this run in the results store, empty = generated
 SUITE_TIMEOUT_SEC = int(os.getenv("SUITE_TIMEOUT_SEC", 900))  # in seconds
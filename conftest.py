@@ -1,38 +1,324 @@
+import os
+import weakref
 import pytest
 from pathlib import Path
+from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from config.config import (CONTEXT_POOL_SIZE, STORAGE_STATE_PATH, SCENARIOS_PATH, SCENARIO_DURATIONS_PATH,
+                           BROWSER_DAEMON_URL, ARTIFACT_TRACES, TIMING_PROFILE, TIMING_PROFILE_PATH,
+                           RESULTS_STORE_PATH, BASE_URL)
+from pages.base_page import BasePage
+from utils.artifact_pipeline import ArtifactPipeline
+from utils.browser_daemon import BrowserDaemonClient
+from utils.context_pool import ContextPool
+from utils.duration_store import DurationStore
+from utils.logging_utils import get_logger, shutdown_logging
+from utils.overlay_registry import KNOWN_OVERLAYS
+from utils.request_router import RequestRouter
+from utils.results_store import ResultsStore, new_run_id
+from utils.scenario_loader import iter_sharded_scenarios, scenario_id
+from utils.timing_profile import TimingProfile, resolve_profile
+
+scenario_durations_key = pytest.StashKey[DurationStore]()
+artifacts_key = pytest.StashKey[ArtifactPipeline]()
+call_report_key = pytest.StashKey[pytest.TestReport]()
+run_id_key = pytest.StashKey[str]()
+timing_profile_key = pytest.StashKey[str]()
+
+# HAR record/replay and scenario matrix options
+def pytest_addoption(parser):
+    group = parser.getgroup("har", "Network record/replay")
+    group.addoption("--record", action="store_true",
+                    help="Record every network exchange of each test into a HAR archive under --har-dir")
+    group.addoption("--replay", action="store_true",
+                    help="Serve every request from the HAR archives under --har-dir, without network access")
+    group.addoption("--har-dir", default="reports/har",
+                    help="Directory of the per-test HAR archives (default: reports/har)")
+
+    group = parser.getgroup("browser-daemon", "Shared browser")
+    group.addoption("--browser-daemon", default=BROWSER_DAEMON_URL,
+                    help="Control URL of a running utils.browser_daemon to attach to over CDP "
+                         "instead of launching a browser (BROWSER_DAEMON_URL)")
+
+    group = parser.getgroup("timing", "Timing profile")
+    group.addoption("--timing-profile", default=TIMING_PROFILE,
+                    help="Profile of learned step timeouts: local, ci, replay, off, or auto "
+                         "(replay with --replay, ci when CI is set, else local) (TIMING_PROFILE)")
+
+    group = parser.getgroup("scenarios", "Scenario matrix")
+    group.addoption("--scenarios", default=SCENARIOS_PATH,
+                    help="Scenario file (.json, .jsonl or .csv) providing the test_data parameter")
+    group.addoption("--shards", type=int, default=None,
+                    help="Number of shards (default: number of xdist workers, else 1)")
+    group.addoption("--shard-index", type=int, default=None,
+                    help="Only run this shard (0-based), e.g. to split the matrix across machines")
+
+def pytest_configure(config):
+    if config.getoption("--record") and config.getoption("--replay"):
+        raise pytest.UsageError("--record and --replay are mutually exclusive")
+    try:
+        config.stash[timing_profile_key] = resolve_profile(config.getoption("--timing-profile"),
+                                                           replay=config.getoption("--replay"))
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+    # xdist workers share the run id of the controller
+    workerinput = getattr(config, "workerinput", None)
+    config.stash[run_id_key] = workerinput["run_id"] if workerinput else new_run_id()
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    node.workerinput["run_id"] = node.config.stash[run_id_key]
+
+def uses_browser(item):
+    """Whether a test drives a browser (pure unit tests get none of the browser session setup)."""
+    return "page" in getattr(item, "fixturenames", ())
+
+# Session state of browser tests, only set up when the run collected one
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(session, config, items):
+    if any(uses_browser(item) for item in items):
+        BasePage.timing_profile = TimingProfile(config.rootpath / TIMING_PROFILE_PATH, config.stash[timing_profile_key])
+    else:
+        # Durations of unit tests are not worth keeping (see utils.suite_timeout_plugin)
+        config.record_test_durations = False
+
+def scenario_durations(config):
+    """Duration history of the scenarios, loaded on first use."""
+    if scenario_durations_key not in config.stash:
+        config.stash[scenario_durations_key] = DurationStore(config.rootpath / SCENARIO_DURATIONS_PATH)
+    return config.stash[scenario_durations_key]
+
+def artifact_pipeline(config):
+    """Failure artifact pipeline, started by the first failure that has something to capture."""
+    if artifacts_key not in config.stash:
+        config.stash[artifacts_key] = ArtifactPipeline()
+    return config.stash[artifacts_key]
+
+def pytest_sessionfinish(session):
+    if scenario_durations_key in session.config.stash:
+        session.config.stash[scenario_durations_key].save()
+    if artifacts_key in session.config.stash:
+        session.config.stash[artifacts_key].close()
+    BasePage.timing_profile.save()
+
+# Feed the successful step durations of browser tests into the timing profile
+@pytest.fixture(autouse=True)
+def timing_samples(request, step_tracer):
+    yield
+    if uses_browser(request.node):
+        BasePage.timing_profile.record_spans(step_tracer.spans)
+
+# Run results history (see utils.results_store)
+@pytest.fixture(scope="session")
+def results_store(pytestconfig):
+    return ResultsStore(pytestconfig.rootpath / RESULTS_STORE_PATH)
+
+@pytest.fixture(scope="session")
+def run_id(pytestconfig):
+    return pytestconfig.stash[run_id_key]
+
+def pytest_unconfigure(config):
+    # xdist workers may exit without running atexit handlers
+    shutdown_logging()
+
+# Parametrize test_data from the scenario file, one shard per xdist worker (run with --dist loadgroup)
+def pytest_generate_tests(metafunc):
+    if "test_data" not in metafunc.fixturenames:
+        return
+
+    config = metafunc.config
+    shard_count = config.getoption("--shards") or int(os.getenv("PYTEST_XDIST_WORKER_COUNT", 1))
+    shard_index = config.getoption("--shard-index")
+    if shard_index is not None and not 0 <= shard_index < shard_count:
+        raise pytest.UsageError(f"--shard-index must be between 0 and {shard_count - 1}")
+
+    params = []
+    durations = scenario_durations(config).known()
+    for sid, shard, scenario in iter_sharded_scenarios(config.rootpath / config.getoption("--scenarios"),
+                                                       shard_count, durations, shard_index):
+        # xdist sends every test of a group to the same worker
+        marks = [pytest.mark.xdist_group(f"shard-{shard}")] if shard_count > 1 and shard_index is None else []
+        params.append(pytest.param(scenario, id=sid, marks=marks))
+    metafunc.parametrize("test_data", params)
+
+def har_path(request):
+    """Per-test HAR archive path (content is stored next to the HAR in the zip)."""
+    test_name = request.node.name.replace("/", "_").replace("\\", "_")
+    return Path(request.config.getoption("--har-dir")) / f"{test_name}.har.zip"
+
+def contexts_needed(session):
+    """Most browser contexts a session has open at once, as leased from the browser daemon."""
+    config = session.config
+    # HAR modes and a disabled pool give every test its own context, closed after it
+    if not CONTEXT_POOL_SIZE or config.getoption("--record") or config.getoption("--replay"):
+        return 1
+    # Tests of a session run one at a time: the pooled contexts, plus the one of an isolated test
+    isolated = any(uses_browser(item) and item.get_closest_marker("isolated_context") is not None
+                   for item in session.items)
+    return CONTEXT_POOL_SIZE + int(isolated)
+
+# Override Playwright's browser fixture: attach to the shared browser daemon when one is configured
+@pytest.fixture(scope="session")
+def browser(launch_browser, playwright, browser_name, request):
+    daemon_url = request.config.getoption("--browser-daemon")
+    client = lease = None
+    if daemon_url and browser_name == "chromium":
+        client = BrowserDaemonClient(daemon_url)
+        lease = client.lease(contexts=contexts_needed(request.session))
+
+    if lease:
+        browser = playwright.chromium.connect_over_cdp(lease["cdp_url"])
+    else:
+        if daemon_url:
+            get_logger("BrowserDaemon").warning(f"Browser daemon at {daemon_url} not available, launching a browser")
+        browser = launch_browser()
+
+    yield browser
+
+    # Over CDP this closes the contexts of this session and disconnects; the browser keeps running
+    browser.close()
+    if lease:
+        client.release(lease)
+
+# Always use a "maximized" viewport, safe even in headless
+VIEWPORT = {"width": 2560, "height": 1440}
+
+# Request router of every context created by the fixtures below
+_routers = weakref.WeakKeyDictionary()
+
+def _new_context(browser, replay=False, **options):
+    context = browser.new_context(viewport=VIEWPORT, **options)
+
+    # Block or stub resources the tests never look at (BLOCK_RESOURCES / ROUTE_ALLOWLIST)
+    router = RequestRouter() if replay else RequestRouter.from_config()
+    router.attach(context)
+    _routers[context] = router
+    return context
+
+# Time the warm-up waits for the cookie consent banner (in ms)
+CONSENT_TIMEOUT_MS = 5000
+
+def _warm_up(context):
+    # Accept the cookie consent once, before any test, so pooled contexts start past it
+    consent = next(overlay for overlay in KNOWN_OVERLAYS if overlay.name == "cookie_consent")
+    page = context.new_page()
+    page.goto(BASE_URL, wait_until="domcontentloaded")
+    try:
+        page.locator(consent.trigger).first.wait_for(timeout=CONSENT_TIMEOUT_MS)
+    except PlaywrightTimeoutError:
+        return
+    for selector in consent.dismiss:
+        try:
+            page.locator(selector).first.click(timeout=CONSENT_TIMEOUT_MS)
+            return
+        except PlaywrightError:
+            continue
+
+# Warm contexts shared by the tests of this worker (CONTEXT_POOL_SIZE)
+@pytest.fixture(scope="session")
+def context_pool(browser):
+    pool = ContextPool(lambda storage_state: _new_context(browser, storage_state=storage_state),
+                       CONTEXT_POOL_SIZE, STORAGE_STATE_PATH, warm_up=_warm_up)
+    yield pool
+    pool.close()
 
 # Override Playwright's default context fixture
 @pytest.fixture(scope="function")
-def context(browser):
-    # Always use a "maximized" viewport, safe even in headless
-    return browser.new_context(viewport={"width": 2560, "height": 1440})
+def context(browser, context_pool, request):
+    record = request.config.getoption("--record")
+    replay = request.config.getoption("--replay")
+
+    # Pooled unless the test asks for isolation; HAR modes need a context per test
+    isolated = (not context_pool.enabled or record or replay
+                or request.node.get_closest_marker("isolated_context") is not None)
+
+    if isolated:
+        options = {}
+
+        # Record mode: Playwright writes the HAR when the context is closed
+        if record:
+            har_path(request).parent.mkdir(parents=True, exist_ok=True)
+            options.update(record_har_path=str(har_path(request)), record_har_mode="full")
+
+        context = _new_context(browser, replay, **options)
+
+        # Replay mode: answer from the archive, abort anything that was not recorded
+        if replay:
+            if not har_path(request).exists():
+                context.close()
+                pytest.fail(f"No HAR archive recorded for this test: {har_path(request)} (run with --record first)")
+            context.route_from_har(har_path(request), not_found="abort")
+    else:
+        context = context_pool.acquire()
+
+    router = _routers[context]
+    router.reset_stats()
+
+    yield context
+
+    # Report what the router blocked and let through for this test
+    if router.enabled:
+        stats = router.stats()
+        request.node.user_properties.append(("network", stats))
+        router.log.info(f"{request.node.name}: blocked {stats['blocked_requests']} requests "
+                        f"{stats['blocked_by_category']}, loaded {stats['allowed_requests']} requests "
+                        f"({stats['allowed_bytes']} bytes)")
+
+    if isolated:
+        context.close()
+    else:
+        context_pool.release(context)
+
+def artifact_name(item):
+    return item.name.replace("/", "_").replace("\\", "_")
 
 # Reuse the existing page fixture from pytest-playwright
 @pytest.fixture(scope="function")
-def page(context):
+def page(context, request):
+    # Optional Playwright trace, only kept when the test fails (ARTIFACT_TRACES)
+    if ARTIFACT_TRACES:
+        context.tracing.start(screenshots=True, snapshots=True)
+
     page = context.new_page()
     yield page
-    context.close()
 
-# Take browser UI screenshot on failure (Called automatically by pytest on failure)
+    if ARTIFACT_TRACES:
+        report = request.node.stash.get(call_report_key, None)
+        if report is not None and report.failed:
+            artifacts = artifact_pipeline(request.config)
+            context.tracing.stop(path=artifacts.trace_path(artifact_name(request.node)))
+            artifacts.trace_saved()
+        else:
+            context.tracing.stop()
+    page.close()
+
+# Capture failure artifacts (Called automatically by pytest on failure)
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
     # Get the outcome of the test
     outcome = yield
     report = outcome.get_result()
 
+    # Remember how long each scenario took, to balance the shards of the next run
+    callspec = getattr(item, "callspec", None)
+    if report.when == "call" and callspec and "test_data" in callspec.params:
+        scenario_durations(item.config).record(scenario_id(callspec.params["test_data"]), report.duration)
+
+    if report.when == "call":
+        item.stash[call_report_key] = report
+
     # Only act on failures during the "call" phase (not setup/teardown)
     if report.when == "call" and report.failed:
         page = item.funcargs.get("page", None)
 
         if page:
-            reports_dir = Path("reports")
-            reports_dir.mkdir(exist_ok=True)
-            test_name = item.name.replace("/", "_").replace("\\", "_")
+            # The test may have moved on to another tab (e.g. the listing handed over by pre-validation)
+            open_pages = page.context.pages
+            page = open_pages[-1] if open_pages else page
 
-            # Screenshot on failure
-            screenshot_path = reports_dir / Path("screenshots") / f"{test_name}.png"
-            page.screenshot(path=screenshot_path)
+            # Screenshot and DOM snapshot are written in the background
+            paths = artifact_pipeline(item.config).capture_failure(page, artifact_name(item))
 
             # Log in terminal
-            print(f"\n[Screenshot saved to {screenshot_path}]")
\ No newline at end of file
+            for path in paths:
+                print(f"\n[Artifact saved to {path}]")
\ No newline at end of file
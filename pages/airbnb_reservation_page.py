@@ -5,6 +5,7 @@ import re
 
 from config.config import WAIT_AFTER_ACTION_MS
 from pages.base_page import BasePage
+from utils.locator_registry import LocatorChain
 
 class AirbnbReservationPage(BasePage):
     """Page object for performing Airbnb reservation actions."""
@@ -17,7 +18,15 @@ class AirbnbReservationPage(BasePage):
     _PHONE_INPUT_SELECTOR = '#phoneInputphone-login'
     _FINAL_CONTINUE_BUTTON_SELECTOR = ('body > div:nth-child(16) > div > section > div > div > div > div > div > div > form'
                                     ' > div > div > button')
-    _TRANSLATION_POPUP_CLOSE_BUTTON = 'div > div > section > div > div > div:nth-child(2)> div > div > button'
+    # Fallback chains of the booking buttons: test id, role/name, text, then the positional CSS above
+    _RESERVATION_NEXT_BUTTON_LOCATOR = LocatorChain("reservation.next",
+                                                    {"role": "button", "name": "Next"},
+                                                    {"css": _RESERVATION_NEXT_BUTTON_SELECTOR})
+    _FINAL_CONTINUE_BUTTON_LOCATOR = LocatorChain("reservation.continue",
+                                                  {"testid": "signup-login-submit-btn"},
+                                                  {"role": "button", "name": "Continue"},
+                                                  {"text": "Continue"},
+                                                  {"css": _FINAL_CONTINUE_BUTTON_SELECTOR})
 
     def reserve(self, phone: str, test_data: dict):
         """
@@ -36,15 +45,7 @@ class AirbnbReservationPage(BasePage):
         """
         self.page.wait_for_load_state("domcontentloaded")
 
-        # Dismiss translation popup if exists
-        self.page.wait_for_timeout(WAIT_AFTER_ACTION_MS)
-        try:
-            self.page.locator(self._TRANSLATION_POPUP_CLOSE_BUTTON).first.click()
-        except Exception:
-            # Popup didn't appear or already closed – ignore
-            pass
-
-        # Click 'Reserve' button
+        # Click 'Reserve' button (the translation popup is dismissed by the overlay handlers if it shows up)
         self.try_to_get_by_role("button", "Reserve", post_click_selector='input[type="tel"]')
 
 
@@ -59,17 +60,19 @@ class AirbnbReservationPage(BasePage):
         checkin_checkout_text = self.try_to_get_text(self._CHECKIN_CHECKOUT_DATE_SELECTOR)
 
         # Click 'Next' to reveal phone field
-        self.try_click(self._RESERVATION_NEXT_BUTTON_SELECTOR, post_click_selector='input[type="tel"]')
+        self.try_click(self._RESERVATION_NEXT_BUTTON_LOCATOR, post_click_selector='input[type="tel"]')
 
         # Fill phone field if needed
         phone_input = self.page.locator(self._PHONE_INPUT_SELECTOR)
         if phone_input.is_visible() and phone_input.input_value().strip() == "":
             phone_input.fill(phone)
-            self.page.wait_for_timeout(1000)
 
-        # Final 'Continue' to complete form
-        continue_btn = self.page.locator(self._FINAL_CONTINUE_BUTTON_SELECTOR)
-        if continue_btn.is_visible() and continue_btn.is_enabled():
+        # Final 'Continue' to complete form (wait for it to render rather than pausing)
+        try:
+            continue_btn = self.element(self._FINAL_CONTINUE_BUTTON_LOCATOR, timeout=WAIT_AFTER_ACTION_MS)
+        except Exception:
+            continue_btn = None
+        if continue_btn and continue_btn.is_visible() and continue_btn.is_enabled():
             continue_btn.click()
 
         # Construct result data
@@ -1,9 +1,20 @@
 """
 Page object for performing actions on Airbnb search results.
 """
+import base64
+import json
 import re
-from config.config import WAIT_AFTER_ACTION_MS
+import time
+from collections import deque
+from urllib.parse import urljoin, urlparse, parse_qs, urlencode
+
+from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from config.config import (READY_TIMEOUT_MS, RESULT_PAGES_CONCURRENCY, TOP_K_LISTINGS, RANKING_POLICY, MIN_REVIEWS,
+                           EXTRACTION_MODE, PREVALIDATE_CANDIDATES, PRICE_TOLERANCE)
 from pages.base_page import BasePage
+from utils.listing_ranker import ListingRanker
+from utils.search_api_parser import parse_search_results
 
 
 class AirbnbResultPage(BasePage):
@@ -14,80 +25,578 @@ class AirbnbResultPage(BasePage):
     _LISTING_RATING_SELECTOR = './/span[@aria-hidden="true" and contains(text(), " (")]'
     _LISTING_PRICE_SELECTOR = './/span[contains(text(), " per night")]'
     _NEXT_PAGE_BUTTON_SELECTOR = '#site-content > div > div > div > div > div > nav > div > a:last-child'
+    _PAGINATION_LINKS_SELECTOR = '#site-content > div > div > div > div > div > nav > div > a'
+
+    _LISTING_TITLE_SELECTOR = '[data-testid="listing-card-title"]'
+
+    # Extracts the raw fields of every card in a single round trip
+    _EXTRACT_CARDS_SCRIPT = """
+        (cards, selectors) => cards.map(card => {
+            const textOf = (xpath) => {
+                const node = document.evaluate(xpath, card, null,
+                    XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+                return node ? node.innerText : null;
+            };
+            const anchor = card.querySelector("a[href]");
+            const title = card.querySelector(selectors.title);
+            return {
+                rating: textOf(selectors.rating),
+                price: textOf(selectors.price),
+                href: anchor ? anchor.getAttribute("href") : null,
+                title: (title ? title.innerText : card.innerText).trim(),
+            };
+        })
+    """
+
+    # Listing link of the first card, identifying the result page on screen (null while no card is rendered)
+    _FIRST_CARD_SCRIPT = """
+        (xpath) => {
+            const card = document.evaluate(xpath, document, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            const anchor = card && card.querySelector("a[href]");
+            return anchor ? anchor.getAttribute("href") : null;
+        }
+    """
 
-    def find_best_rated_cheapest_listing(self):
+    # True once the first card shows another listing than before the page change
+    _CARDS_REPLACED_SCRIPT = "([xpath, previous]) => { const href = (" + _FIRST_CARD_SCRIPT.strip() + \
+        ")(xpath); return href !== null && href !== previous; }"
+
+    _PAGINATION_LINKS_SCRIPT = "els => els.map(el => ({label: el.innerText.trim(), href: el.getAttribute('href')}))"
+
+    # Bookability of a listing page for the searched dates and its quoted nightly price;
+    # null until the 'Reserve' button or an unavailability notice has rendered
+    _CANDIDATE_STATE_SCRIPT = """
+        () => {
+            const visible = (el) => el.offsetParent !== null;
+            const reserve = [...document.querySelectorAll("button")]
+                .some(button => button.innerText.trim().toLowerCase() === "reserve" && visible(button));
+            const unavailable = /those dates are not available|dates are unavailable|not available for (your|these) dates/i
+                .test(document.body.innerText);
+            if (!reserve && !unavailable) return null;
+            const panel = document.querySelector('[data-testid="book-it-default"]') || document.body;
+            const prices = [...panel.innerText.matchAll(/\\$\\s?([\\d,]+(?:\\.\\d+)?)\\s*(?:per\\s+)?night/gi)];
+            // The last amount is the current one when a discount shows the original price first
+            const price = prices.length ? parseFloat(prices[prices.length - 1][1].replace(/,/g, "")) : null;
+            return {reserve, unavailable, price};
+        }
+    """
+
+    # Search API request that delivers the listings of a result page
+    _SEARCH_RESPONSE_PATTERN = r"/api/v3/StaysSearch"
+
+    def __init__(self, page, extraction_mode=EXTRACTION_MODE):
+        """
+        Initialize AirbnbResultPage.
+
+        Args:
+            page: Playwright page object
+            extraction_mode: 'dom' reads the listing cards; 'network' parses the search API
+                responses and falls back to the cards when none was captured. In network
+                mode, create the page object before searching so the first response is seen.
+        """
+        super().__init__(page)
+        if extraction_mode not in ("dom", "network"):
+            raise ValueError(f"Unknown extraction mode '{extraction_mode}', expected 'dom' or 'network'")
+        self.extraction_mode = extraction_mode
+        # Ranked listings of the last scan, best first
+        self.ranked_listings = []
+        # Page showing the selected listing: this page, or the tab that validated it
+        self.listing_page = None
+        self._search_responses = self._capture_search_responses(page)
+
+    def find_best_rated_cheapest_listing(self, concurrency=RESULT_PAGES_CONCURRENCY, policy=RANKING_POLICY,
+                                         min_reviews=MIN_REVIEWS, prevalidate=PREVALIDATE_CANDIDATES):
         """
         Analyze all paginated Airbnb listings to extract rating and price,
-        select the best (highest rating, lowest price), and navigate to it.
+        select the best (highest rating, lowest price), and open it in `listing_page`.
+
+        Args:
+            concurrency: Number of result pages loaded at once in separate tabs.
+                1 clicks through the pages one at a time.
+            policy: Scoring policy of the ranking (see utils.listing_ranker)
+            min_reviews: Listings with fewer reviews are not considered
+            prevalidate: Number of top listings checked for availability and price in
+                parallel tabs; the best bookable one is selected and its tab becomes
+                `listing_page`, so it is not loaded twice (0 or 1 = take the best here)
+
+        Returns:
+            dict: Details of the selected listing; with prevalidation, 'rejected' lists
+                the better-ranked candidates that were skipped and why
+
+        Raises:
+            AssertionError: If no listings are found, or none of the candidates can be booked
+        """
+        listings = self.find_top_listings(max(prevalidate, TOP_K_LISTINGS), concurrency, policy, min_reviews)
+        if prevalidate > 1:
+            best_listing = self.prevalidate_candidates(listings[:prevalidate])
+            self.log.info(f"Continuing on the tab of best listing: {best_listing['url']}")
+            return best_listing
+
+        # Navigate to best listing
+        best_listing = listings[0]
+        self.goto(best_listing["url"])
+        self.listing_page = self.page
+        self.log.info(f"Navigated to best listing: {best_listing['url']}")
+
+        return best_listing
+
+    def prevalidate_candidates(self, candidates):
+        """
+        Open the candidate listings in parallel tabs and return the best bookable one.
+
+        All tabs load at once and share one READY_TIMEOUT_MS deadline. They are checked
+        in rank order, so a candidate is taken as soon as it is ready and every better one
+        has been rejected: the first one showing a 'Reserve' button for the searched dates
+        at (about) the listed price wins. Its tab is kept open as `listing_page`.
+
+        Args:
+            candidates: Ranked listing dicts, best first
+
+        Returns:
+            dict: The selected listing, with 'rejected': [{'rank', 'url', 'title', 'reason'}]
+
+        Raises:
+            AssertionError: If none of the candidates can be booked
+        """
+        rejected = []
+        tabs = []
+        self.listing_page = None
+        with self.span("prevalidate_candidates", candidates=len(candidates)):
+            try:
+                # Start every load before checking any, so the listing pages load in parallel
+                for candidate in candidates:
+                    tab = self.page.context.new_page()
+                    tabs.append((tab, None))
+                    try:
+                        tab.goto(candidate["url"], wait_until="commit")
+                    except PlaywrightError as e:
+                        tabs[-1] = (tab, f"listing page did not load: {e}")
+                deadline = time.monotonic() + READY_TIMEOUT_MS / 1000
+
+                for candidate, (tab, error) in zip(candidates, tabs):
+                    reason = error or self._rejection_reason(candidate, self._candidate_state(tab, deadline))
+                    if reason is None:
+                        tab.bring_to_front()
+                        self.listing_page = tab
+                        return {**candidate, "rejected": rejected}
+                    self.log.warning(f"Candidate {candidate.get('rank')} rejected ({reason}): {candidate['url']}")
+                    rejected.append(self._rejection(candidate, reason))
+            finally:
+                for tab, _ in tabs:
+                    if tab is not self.listing_page:
+                        tab.close()
+
+        raise AssertionError(f"None of the top {len(candidates)} listings can be booked: {rejected}")
+
+    def _candidate_state(self, tab, deadline):
+        """
+        Wait, until the shared deadline, for a candidate tab to show its bookability.
+
+        Args:
+            tab: Tab loading the listing page
+            deadline: time.monotonic() by which every candidate must be ready
 
         Returns:
-            dict: Details of the selected best listing
+            dict: State from _CANDIDATE_STATE_SCRIPT, or None if it was not ready in time
+        """
+        remaining_ms = (deadline - time.monotonic()) * 1000
+        try:
+            # Past the deadline a tab still gets one look, it has loaded while the others were checked
+            if remaining_ms < 1:
+                return tab.evaluate(self._CANDIDATE_STATE_SCRIPT)
+            return tab.wait_for_function(self._CANDIDATE_STATE_SCRIPT, timeout=remaining_ms, polling=250).json_value()
+        except PlaywrightError:
+            return None
+
+    @staticmethod
+    def _rejection_reason(candidate, state, price_tolerance=PRICE_TOLERANCE):
+        """
+        Why a candidate cannot be booked.
+
+        Args:
+            candidate: Listing dict with the listed 'price'
+            state: Listing page state from _CANDIDATE_STATE_SCRIPT, or None if it never rendered
+            price_tolerance: Fraction the quoted price may exceed the listed one by
+
+        Returns:
+            str: Reason, or None if the candidate can be booked
+        """
+        if state is None:
+            return "listing page did not render a 'Reserve' button"
+        if state["unavailable"]:
+            return "not available for the requested dates"
+        if not state["reserve"]:
+            return "no 'Reserve' button"
+        quoted = state.get("price")
+        if quoted is not None and quoted > candidate["price"] * (1 + price_tolerance):
+            return f"quoted price {quoted:g} above the listed {candidate['price']}"
+        return None
+
+    @staticmethod
+    def _rejection(candidate, reason):
+        """Entry of a rejected candidate in the result."""
+        return {"rank": candidate.get("rank"), "url": candidate["url"], "title": candidate.get("title"),
+                "reason": reason}
+
+    def find_top_listings(self, top_k=TOP_K_LISTINGS, concurrency=RESULT_PAGES_CONCURRENCY, policy=RANKING_POLICY,
+                          min_reviews=MIN_REVIEWS):
+        """
+        Scan all paginated Airbnb listings and rank them as they are extracted.
+
+        Only the best `top_k` listings are kept while scanning, so memory does not
+        grow with the number of result pages.
+
+        Args:
+            top_k: Number of listings to return
+            concurrency: Number of result pages loaded at once in separate tabs
+            policy: Scoring policy of the ranking (see utils.listing_ranker)
+            min_reviews: Listings with fewer reviews are not considered
+
+        Returns:
+            list: Up to top_k listing dicts, best first
 
         Raises:
             AssertionError: If no listings are found
         """
-        all_listings = []
-        current_page = 1
+        ranker = ListingRanker(top_k, policy, min_reviews)
 
         # Step through each paginated result page
-        while True:
-            self.page.wait_for_timeout(WAIT_AFTER_ACTION_MS)
-            listings = self.page.locator(f"xpath={self._LISTING_CARDS_SELECTOR}")
-            count = listings.count()
-            self.log.info(f"Found {count} listings on page {current_page}")
+        for page_number, cards, base_url in self._iter_result_pages(concurrency):
+            self._rank_cards(ranker, page_number, cards, base_url)
 
-            # Loop through each listing card on the current page
-            for i in range(count):
-                item = listings.nth(i)
+        return self._ranked_or_fail(ranker)
 
-                try:
-                    # Extract rating and price
-                    rating_text = item.locator(f"xpath={self._LISTING_RATING_SELECTOR}").inner_text(
-                        timeout=WAIT_AFTER_ACTION_MS)
-                    price_text = item.locator(f"xpath={self._LISTING_PRICE_SELECTOR}").inner_text(
-                        timeout=WAIT_AFTER_ACTION_MS)
-                    rating = float(rating_text.strip().split()[0])
-                    price = int(re.sub(r"\D", "", price_text))
-                except Exception as e:
-                    continue
-
-                # Extract listing URL from anchor element
-                anchors = item.locator("a")
-                hrefs = anchors.evaluate_all("els => els.map(el => el.getAttribute('href'))")
-                if not hrefs or not hrefs[0]:
-                    self.log.warning(f"No href in listing {i}. Skipping.")
-                    continue
-
-                full_url = self.page.url.split("/s/")[0] + hrefs[0]
-
-                # Append listing data to list
-                all_listings.append({
-                    "rank": len(all_listings) + 1,
-                    "index": i,
-                    "rating": rating,
-                    "price": price,
-                    "url": full_url,
-                    "title": item.inner_text().strip()
-                })
+    def _rank_cards(self, ranker, page_number, cards, base_url):
+        """
+        Parse and filter the raw cards of one result page and offer them to the ranking.
+
+        Args:
+            ranker: ListingRanker collecting the top listings
+            page_number: Result page number
+            cards: Raw card fields of the page
+            base_url: Site URL the card hrefs are relative to
+        """
+        self.log.info(f"Found {len(cards)} listings on page {page_number}")
+
+        for i, card in enumerate(cards):
+            parsed = self._parse_card(card)
+            if parsed is None:
+                continue
+
+            if not card["href"]:
+                self.log.warning(f"No href in listing {i}. Skipping.", extra={"sample": "no_href"})
+                continue
+
+            ranker.add({
+                "page": page_number,
+                "index": i,
+                **parsed,
+                "url": base_url + card["href"],
+                "title": card["title"]
+            })
+
+    def _ranked_or_fail(self, ranker):
+        """
+        Return the ranked listings of a finished scan.
+
+        Raises:
+            AssertionError: If no listings are found
+        """
+        top_listings = ranker.ranked()
+        if not top_listings:
+            raise AssertionError("No listings found")
+
+        self.log.info(f"Ranked top {len(top_listings)} of {ranker.seen} listings")
+        self.ranked_listings = top_listings
+        return top_listings
+
+    def _iter_result_pages(self, concurrency):
+        """
+        Yield the extracted cards of every result page, starting with the current one.
+
+        Args:
+            concurrency: Number of result pages loaded at once in separate tabs
+
+        Yields:
+            tuple: (page number, raw cards, base URL for listing hrefs)
+        """
+        yield 1, self._read_result_page(self.page, 1, self._search_responses), self.page.url.split("/s/")[0]
+
+        if concurrency > 1:
+            yield from self._prefetch_result_pages(self._pagination_urls(), concurrency)
+            return
 
+        current_page = 1
+        while True:
             # Check for and click the pagination next button
             next_button = self.page.locator(f"css={self._NEXT_PAGE_BUTTON_SELECTOR}")
-            if next_button.count() > 0 and next_button.first.is_enabled():
-                next_button.first.click()
-                current_page += 1
-            else:
+            if next_button.count() == 0 or not next_button.first.is_enabled():
                 break
 
-        if not all_listings:
-            raise AssertionError("No listings found")
+            # Wait for the next page's listings to arrive instead of sleeping. The search API
+            # response is only needed in network mode, and may be served from the client cache.
+            # The URL commits before the client-side transition ends, so the old cards are still
+            # visible then: the page only counts as changed once its first card is another listing.
+            previous_card = self.page.evaluate(self._FIRST_CARD_SCRIPT, self._LISTING_CARDS_SELECTOR)
+            self.act_and_wait(next_button.first.click, url_change=True, response=self._next_page_response(),
+                              response_required=False)
+            current_page += 1
+            if not self._wait_for_new_cards(self.page, previous_card, current_page):
+                break
+            yield (current_page, self._read_result_page(self.page, current_page, self._search_responses),
+                   self.page.url.split("/s/")[0])
+
+    def _prefetch_result_pages(self, urls, concurrency):
+        """
+        Load result pages in up to `concurrency` tabs of the same context at once.
 
-        # Choose the best listing: highest rating, lowest price
-        max_rating = max(l["rating"] for l in all_listings)
-        top = [l for l in all_listings if l["rating"] == max_rating]
-        best_listing = sorted(top, key=lambda x: x["price"])[0]
+        Tabs are opened without waiting for the load, so the browser fetches and renders
+        them in parallel; each one is extracted and closed in page order.
 
-        # Navigate to best listing
-        self.page.goto(best_listing["url"])
-        self.log.info(f"Navigated to best listing: {best_listing['url']}")
+        Args:
+            urls: URLs of result pages 2..N
+            concurrency: Maximum number of tabs open at once
+
+        Yields:
+            tuple: (page number, raw cards, base URL for listing hrefs)
+        """
+        self.log.info(f"Prefetching {len(urls)} result pages in up to {concurrency} tabs")
+        pending = deque(enumerate(urls, start=2))
+        in_flight = deque()
+
+        try:
+            while pending or in_flight:
+                # Keep the window of loading tabs full
+                while pending and len(in_flight) < concurrency:
+                    page_number, url = pending.popleft()
+                    tab = self.page.context.new_page()
+                    responses = self._capture_search_responses(tab)
+                    # Tracked before loading, so the tab is closed below even if the navigation fails
+                    in_flight.append((page_number, tab, responses))
+                    tab.goto(url, wait_until="commit")
+
+                page_number, tab, responses = in_flight.popleft()
+                try:
+                    cards = self._read_result_page(tab, page_number, responses, wait_for_response=True)
+                    yield page_number, cards, tab.url.split("/s/")[0]
+                finally:
+                    tab.close()
+        finally:
+            for _, tab, _ in in_flight:
+                tab.close()
+
+    def _next_page_response(self):
+        """Response pattern to wait for after paging: the search API in network mode, none in DOM mode."""
+        return self._SEARCH_RESPONSE_PATTERN if self._search_responses is not None else None
+
+    def _pagination_urls(self):
+        """
+        Work out the URLs of result pages 2..N from the pagination bar of the current page.
+
+        Returns:
+            list: Absolute URLs in page order
+        """
+        links = self.page.locator(f"css={self._PAGINATION_LINKS_SELECTOR}").evaluate_all(self._PAGINATION_LINKS_SCRIPT)
+        return self._build_page_urls(self.page.url, links)
+
+    @staticmethod
+    def _build_page_urls(current_url, links):
+        """
+        Build the URLs of result pages 2..N from the pagination links.
+
+        The pagination bar only shows some page numbers, so the offset step is taken from
+        the link to page 2 ('items_offset' or the base64 JSON 'cursor') and extended up to
+        the highest page number shown. Falls back to the links as they are.
+
+        Args:
+            current_url: URL of the first result page
+            links: List of {'label', 'href'} dicts of the pagination anchors
+
+        Returns:
+            list: Absolute URLs in page order
+        """
+        numbered = {int(link["label"]): urljoin(current_url, link["href"])
+                    for link in links if link["label"].isdigit() and link["href"]}
+        numbered.pop(1, None)
+        if 2 not in numbered:
+            return [numbered[n] for n in sorted(numbered)]
+
+        template = urlparse(numbered[2])
+        query = parse_qs(template.query)
+        last_page = max(numbered)
+
+        def with_query(**params):
+            return template._replace(query=urlencode({**query, **params}, doseq=True)).geturl()
+
+        if "items_offset" in query:
+            step = int(query["items_offset"][0])
+            return [with_query(items_offset=step * (n - 1)) for n in range(2, last_page + 1)]
+
+        if "cursor" in query:
+            raw = query["cursor"][0]
+            cursor = json.loads(base64.b64decode(raw + "=" * (-len(raw) % 4)))
+            step = int(cursor["items_offset"])
+            return [with_query(cursor=base64.b64encode(json.dumps(
+                {**cursor, "items_offset": step * (n - 1)}, separators=(",", ":")).encode()).decode())
+                for n in range(2, last_page + 1)]
+
+        return [numbered[n] for n in sorted(numbered)]
+
+    def _capture_search_responses(self, page):
+        """
+        Start collecting the search API responses of a page (network mode only).
+
+        Args:
+            page: Playwright page to listen on
+
+        Returns:
+            list: Filled with matching responses as they arrive, or None in DOM mode
+        """
+        if self.extraction_mode != "network":
+            return None
+        responses = []
+        page.on("response", lambda response: responses.append(response)
+                if self._is_search_response(response) else None)
+        return responses
 
-        return best_listing
\ No newline at end of file
+    def _is_search_response(self, response):
+        """Whether a response belongs to the search API."""
+        return re.search(self._SEARCH_RESPONSE_PATTERN, response.url) is not None
+
+    def _read_result_page(self, page, page_number, responses, wait_for_response=False):
+        """
+        Wait for a result page and extract its raw cards.
+
+        In network mode the latest captured search API response is parsed; the DOM cards
+        are only read when no response yielded listings.
+
+        Args:
+            page: Playwright page showing the result page
+            page_number: Result page number (for logging)
+            responses: Captured search API responses of the page, or None in DOM mode
+            wait_for_response: Whether to wait for a response if none was captured yet
+
+        Returns:
+            list: One dict of raw card fields per listing
+        """
+        if responses is not None:
+            cards = self._cards_from_responses(page, page_number, responses, wait_for_response)
+            if cards:
+                return cards
+            self.log.warning(f"No listings in search API responses on page {page_number}, reading the DOM")
+
+        self._wait_for_cards(page, page_number)
+        return self._extract_cards(page)
+
+    def _cards_from_responses(self, page, page_number, responses, wait_for_response):
+        """
+        Parse the latest captured search API response of a page.
+
+        Args:
+            page: Playwright page the responses belong to
+            page_number: Result page number (for logging)
+            responses: Captured search API responses; consumed by this call
+            wait_for_response: Whether to wait for a response if none was captured yet
+
+        Returns:
+            list: Raw card fields, empty if no usable response was captured
+        """
+        if responses:
+            response = responses[-1]
+        elif wait_for_response:
+            try:
+                response = page.wait_for_event("response", predicate=self._is_search_response,
+                                               timeout=READY_TIMEOUT_MS)
+            except Exception:
+                return []
+        else:
+            return []
+        responses.clear()
+
+        try:
+            response.finished()
+            return parse_search_results(response.json(), page.url)
+        except Exception as e:
+            self.log.warning(f"Unreadable search API response on page {page_number}: {e}",
+                             extra={"sample": "unreadable_response"})
+            return []
+
+    def _wait_for_cards(self, page, page_number):
+        """
+        Wait for the listing cards of a result page to render.
+
+        Args:
+            page: Playwright page showing the result page
+            page_number: Result page number (for logging)
+        """
+        try:
+            with self.span("wait_for_cards", page=page_number):
+                page.locator(f"xpath={self._LISTING_CARDS_SELECTOR}").first.wait_for(
+                    state="visible", timeout=self.step_timeout("wait_for_cards", default=READY_TIMEOUT_MS))
+        except Exception:
+            self.log.warning(f"No listings rendered on page {page_number}")
+
+    def _wait_for_new_cards(self, page, previous_card, page_number):
+        """
+        Wait until a result page no longer shows the cards of the page before it.
+
+        Args:
+            page: Playwright page showing the result page
+            previous_card: Listing link of the first card before the page change (None = no cards)
+            page_number: Number of the new result page (for logging)
+
+        Returns:
+            bool: False if the previous cards were still shown at the timeout
+        """
+        if previous_card is None:
+            return True
+        try:
+            with self.span("wait_for_new_cards", page=page_number):
+                page.wait_for_function(self._CARDS_REPLACED_SCRIPT, arg=[self._LISTING_CARDS_SELECTOR, previous_card],
+                                       timeout=self.step_timeout("wait_for_new_cards", default=READY_TIMEOUT_MS),
+                                       polling=100)
+            return True
+        except PlaywrightTimeoutError:
+            self.log.warning(f"Page {page_number} still shows the cards of page {page_number - 1}, stopping pagination")
+            return False
+
+    def _extract_cards(self, page=None):
+        """
+        Extract rating, price, href and title of every listing card on a result page.
+
+        Args:
+            page: Playwright page to extract from (defaults to this page object's page)
+
+        Returns:
+            list: One dict of raw card fields per card, in page order
+        """
+        listings = (page or self.page).locator(f"xpath={self._LISTING_CARDS_SELECTOR}")
+        return listings.evaluate_all(self._EXTRACT_CARDS_SCRIPT, {
+            "rating": self._LISTING_RATING_SELECTOR,
+            "price": self._LISTING_PRICE_SELECTOR,
+            "title": self._LISTING_TITLE_SELECTOR,
+        })
+
+    @staticmethod
+    def _parse_card(card):
+        """
+        Parse rating, review count and nightly price from raw card fields.
+
+        Args:
+            card: Raw card fields as returned by _extract_cards
+
+        Returns:
+            dict: 'rating', 'reviews' and 'price', or None if the card has no rating or price
+        """
+        try:
+            rating = float(card["rating"].strip().split()[0])
+            price = int(re.sub(r"\D", "", card["price"]))
+        except (AttributeError, IndexError, ValueError):
+            return None
+        reviews = re.search(r"\(([\d,]+)\)", card["rating"])
+        return {
+            "rating": rating,
+            "reviews": int(reviews.group(1).replace(",", "")) if reviews else 0,
+            "price": price,
+        }
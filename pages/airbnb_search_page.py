@@ -1,9 +1,11 @@
 """
 Performs Airbnb search actions using Playwright.
 """
-from urllib.parse import urlparse, parse_qs
-from config.config import WAIT_AFTER_ACTION_MS
+from urllib.parse import urlparse, parse_qs, urlencode, quote
+
+from config.config import BASE_URL, SEARCH_MODE
 from pages.base_page import BasePage
+from utils.locator_registry import LocatorChain
 
 class AirbnbSearchPage(BasePage):
     """
@@ -22,6 +24,22 @@ class AirbnbSearchPage(BasePage):
     _SEARCH_BUTTON_SELECTOR = ('body > div:nth-child(6) > div > div > div > div > div > div > div > div > div > header > form'
                             ' > div > div > div:nth-child(2) > div:nth-child(3) > button')
 
+    # Fallback chains of the form controls: test id, role/name, text, then the positional CSS above
+    _CHECKIN_LOCATOR = LocatorChain("search.checkin",
+                                    {"testid": "structured-search-input-field-split-dates-0"},
+                                    {"role": "button", "name": "Check in"},
+                                    {"text": "Add dates"},
+                                    {"css": _CHECKIN_SELECTOR})
+    _WHO_BUTTON_LOCATOR = LocatorChain("search.who",
+                                       {"testid": "structured-search-input-field-guests-button"},
+                                       {"role": "button", "name": "Who"},
+                                       {"text": "Add guests"},
+                                       {"css": _WHO_BUTTON_SELECTOR})
+    _SEARCH_BUTTON_LOCATOR = LocatorChain("search.submit",
+                                          {"testid": "structured-search-input-search-button"},
+                                          {"role": "button", "name": "Search"},
+                                          {"css": _SEARCH_BUTTON_SELECTOR})
+
     # Guest count selectors
     _ADULTS_PLUS_SELECTOR = '#stepper-adults > button:nth-child(3)'
     _CHILDREN_PLUS_SELECTOR = '#stepper-children > button:nth-child(3)'
@@ -46,7 +64,7 @@ class AirbnbSearchPage(BasePage):
         """
         super().__init__(page)
 
-    def search(self, location: str, checkin: str, checkout: str, adults: int, children: int):
+    def search(self, location: str, checkin: str, checkout: str, adults: int, children: int, mode: str = SEARCH_MODE):
         """
         Perform a search on Airbnb with the given parameters.
 
@@ -56,40 +74,72 @@ class AirbnbSearchPage(BasePage):
             checkout: Check-out date in format expected by Airbnb
             adults: Number of adult guests
             children: Number of child guests
+            mode: 'ui' fills the search form; 'url' opens the results URL directly in one
+                navigation, for tests that only need the results
 
         Returns:
             None
         """
+        self._check_mode(mode)
+        if mode == "url":
+            self.goto(self.build_search_url(self.page.url, location, checkin, checkout, adults, children))
+            self.wait_for_element(f"xpath={self._LISTING_CARDS_SELECTOR}")
+            self.log.info(f"Search completed (url).")
+            return
+
         self.page.wait_for_load_state("domcontentloaded")
+        checkin_button = f'{self._CALENDAR_SELECTOR}"{checkin}"]'
+        checkout_button = f'{self._CALENDAR_SELECTOR}"{checkout}"]'
 
         # Fill destination
         self.try_click(self._DESTINATION_INPUT_SELECTOR, 5, 1500, True)
         self.page.locator(self._DESTINATION_INPUT_SELECTOR).fill(location)
-        self.page.wait_for_timeout(WAIT_AFTER_ACTION_MS)
-
-        # Click dates
-        self.try_click(self._CHECKIN_SELECTOR)
-        self.page.wait_for_timeout(WAIT_AFTER_ACTION_MS)
-        self.page.locator(f'{self._CALENDAR_SELECTOR}"{checkin}"]').first.click()
-        self.page.wait_for_timeout(WAIT_AFTER_ACTION_MS)
-        self.page.locator(f'{self._CALENDAR_SELECTOR}"{checkout}"]').first.click()
-        self.page.wait_for_timeout(WAIT_AFTER_ACTION_MS)
-
-        # Click number of guests
-        self.try_click(self._WHO_BUTTON_SELECTOR)
-        self.page.wait_for_timeout(WAIT_AFTER_ACTION_MS)
+
+        # Click dates (wait for the calendar instead of sleeping)
+        self.act_and_wait(lambda: self.try_click(self._CHECKIN_LOCATOR), selector=checkin_button)
+        self.act_and_wait(lambda: self.page.locator(checkin_button).first.click(), selector=checkout_button)
+        self.page.locator(checkout_button).first.click()
+
+        # Click number of guests (steppers are clicked once they are actionable)
+        self.act_and_wait(lambda: self.try_click(self._WHO_BUTTON_LOCATOR), selector=self._ADULTS_PLUS_SELECTOR)
         for _ in range(adults):
             self.page.locator(self._ADULTS_PLUS_SELECTOR).first.click()
-        self.page.wait_for_timeout(WAIT_AFTER_ACTION_MS)
         for _ in range(children):
             self.page.locator(self._CHILDREN_PLUS_SELECTOR).first.click()
 
-        # Click search button
-        self.try_click(self._SEARCH_BUTTON_SELECTOR)
-        self.page.wait_for_timeout(WAIT_AFTER_ACTION_MS)
+        # Click search button and wait for the results page to render
+        self.act_and_wait(lambda: self.try_click(self._SEARCH_BUTTON_LOCATOR), url_change=True,
+                          selector=f"xpath={self._LISTING_CARDS_SELECTOR}")
 
         self.log.info(f"Search completed.")
 
+    @staticmethod
+    def _check_mode(mode):
+        if mode not in ("ui", "url"):
+            raise ValueError(f"Unknown search mode '{mode}', expected 'ui' or 'url'")
+
+    @staticmethod
+    def build_search_url(current_url, location, checkin, checkout, adults, children):
+        """
+        Build the results URL the search form would navigate to.
+
+        Args:
+            current_url: URL of the page (its origin is kept); BASE_URL if no site is open yet
+            location: Destination location
+            checkin: Check-in date (YYYY-MM-DD)
+            checkout: Check-out date (YYYY-MM-DD)
+            adults: Number of adult guests
+            children: Number of child guests
+
+        Returns:
+            str: Absolute results URL carrying the parameters checked by validate_search
+        """
+        origin = urlparse(current_url if current_url.startswith("http") else BASE_URL)
+        path = "/s/" + quote(location.replace(" ", "-")) + "/homes"
+        query = urlencode({"query": location, "checkin": checkin, "checkout": checkout,
+                           "adults": adults, "children": children})
+        return f"{origin.scheme}://{origin.netloc}{path}?{query}"
+
     def validate_search(self, location: str, checkin: str, checkout: str, guests: dict):
         """
         Validate that the search results match the search criteria.
@@ -119,7 +169,17 @@ class AirbnbSearchPage(BasePage):
             f"Expected total guests '{expected_guests_count}', got '{guests_text}'"
 
         # --- Validate query parameters in URL ---
-        parsed_url = urlparse(self.page.url)
+        self._validate_url_params(self.page.url, checkin, checkout, guests)
+
+    @staticmethod
+    def _validate_url_params(url, checkin, checkout, guests):
+        """
+        Validate the search query parameters carried by the results URL.
+
+        Raises:
+            AssertionError: If a parameter does not match
+        """
+        parsed_url = urlparse(url)
         query_params = parse_qs(parsed_url.query)
 
         def assert_url_param(param, expected):
@@ -0,0 +1,62 @@
+"""
+AsyncAirbnbReservationPage: Handles reservation flow on the async Playwright API.
+"""
+from config.config import WAIT_AFTER_ACTION_MS
+from pages.async_base_page import AsyncBasePage
+from pages.airbnb_reservation_page import AirbnbReservationPage
+
+
+class AsyncAirbnbReservationPage(AsyncBasePage, AirbnbReservationPage):
+    """Async counterpart of AirbnbReservationPage (same selectors, methods and return values)."""
+
+    async def reserve(self, phone: str, test_data: dict):
+        """
+        Perform reservation flow (see AirbnbReservationPage.reserve).
+
+        Args:
+            phone: Phone number to use for reservation
+            test_data: Scenario with the expected 'adults' and 'children'
+
+        Returns:
+            dict: Reservation details including guest counts, dates, and URL
+        """
+        await self.page.wait_for_load_state("domcontentloaded")
+
+        # Click 'Reserve' button (the translation popup is dismissed by the overlay handlers if it shows up)
+        await self.try_to_get_by_role("button", "Reserve", post_click_selector='input[type="tel"]')
+
+        # Extract guest summary and dates before moving forward
+        guest_text = await self.try_to_get_text(self._GUESTS_INFO_SELECTOR)
+
+        # Skip parsing — use test data directly
+        guest_counts = {
+            "adults": test_data["adults"],
+            "children": test_data["children"]
+        }
+        checkin_checkout_text = await self.try_to_get_text(self._CHECKIN_CHECKOUT_DATE_SELECTOR)
+
+        # Click 'Next' to reveal phone field
+        await self.try_click(self._RESERVATION_NEXT_BUTTON_LOCATOR, post_click_selector='input[type="tel"]')
+
+        # Fill phone field if needed
+        phone_input = self.page.locator(self._PHONE_INPUT_SELECTOR)
+        if await phone_input.is_visible() and (await phone_input.input_value()).strip() == "":
+            await phone_input.fill(phone)
+
+        # Final 'Continue' to complete form (wait for it to render rather than pausing)
+        try:
+            continue_btn = await self.element(self._FINAL_CONTINUE_BUTTON_LOCATOR, timeout=WAIT_AFTER_ACTION_MS)
+        except Exception:
+            continue_btn = None
+        if continue_btn and await continue_btn.is_visible() and await continue_btn.is_enabled():
+            await continue_btn.click()
+
+        # Construct result data
+        result = {
+            "guest_counts": guest_counts,
+            "checkin": checkin_checkout_text,
+            "checkout": checkin_checkout_text,
+            "url": self.page.url
+        }
+
+        return result
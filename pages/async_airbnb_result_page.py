@@ -0,0 +1,304 @@
+"""
+Page object for performing actions on Airbnb search results using the async Playwright API.
+"""
+import asyncio
+import time
+
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from config.config import (READY_TIMEOUT_MS, RESULT_PAGES_CONCURRENCY, TOP_K_LISTINGS, RANKING_POLICY, MIN_REVIEWS,
+                           PREVALIDATE_CANDIDATES)
+from pages.async_base_page import AsyncBasePage
+from pages.airbnb_result_page import AirbnbResultPage
+from utils.listing_ranker import ListingRanker
+from utils.search_api_parser import parse_search_results
+
+
+class AsyncAirbnbResultPage(AsyncBasePage, AirbnbResultPage):
+    """
+    Async counterpart of AirbnbResultPage (same selectors, methods and return values).
+
+    Selectors, card parsing, pagination URL building and ranking are inherited from
+    AirbnbResultPage; only the browser calls are awaited.
+    """
+
+    async def find_best_rated_cheapest_listing(self, concurrency=RESULT_PAGES_CONCURRENCY, policy=RANKING_POLICY,
+                                               min_reviews=MIN_REVIEWS, prevalidate=PREVALIDATE_CANDIDATES):
+        """
+        Analyze all paginated Airbnb listings, select the best one and open it in `listing_page`.
+
+        Args:
+            concurrency: Number of result pages loaded at once in separate tabs
+            policy: Scoring policy of the ranking (see utils.listing_ranker)
+            min_reviews: Listings with fewer reviews are not considered
+            prevalidate: Number of top listings checked in parallel tabs (0 or 1 = take the best)
+
+        Returns:
+            dict: Details of the selected listing ('rejected' lists skipped candidates)
+
+        Raises:
+            AssertionError: If no listings are found, or none of the candidates can be booked
+        """
+        listings = await self.find_top_listings(max(prevalidate, TOP_K_LISTINGS), concurrency, policy, min_reviews)
+        if prevalidate > 1:
+            best_listing = await self.prevalidate_candidates(listings[:prevalidate])
+            self.log.info(f"Continuing on the tab of best listing: {best_listing['url']}")
+            return best_listing
+
+        # Navigate to best listing
+        best_listing = listings[0]
+        await self.goto(best_listing["url"])
+        self.listing_page = self.page
+        self.log.info(f"Navigated to best listing: {best_listing['url']}")
+
+        return best_listing
+
+    async def prevalidate_candidates(self, candidates):
+        """
+        Check the candidate listings in parallel tabs and return the best bookable one.
+
+        The checks share one READY_TIMEOUT_MS deadline and are collected in rank order,
+        so a candidate is taken as soon as it and every better one have been checked.
+        The winner's tab is kept open as `listing_page`.
+
+        Args:
+            candidates: Ranked listing dicts, best first
+
+        Returns:
+            dict: The selected listing, with 'rejected': [{'rank', 'url', 'title', 'reason'}]
+
+        Raises:
+            AssertionError: If none of the candidates can be booked
+        """
+        deadline = time.monotonic() + READY_TIMEOUT_MS / 1000
+        tabs = []
+
+        async def check(candidate):
+            tab = await self.page.context.new_page()
+            tabs.append(tab)
+            try:
+                await tab.goto(candidate["url"], wait_until="commit")
+            except PlaywrightError as e:
+                return f"listing page did not load: {e}", tab
+            return self._rejection_reason(candidate, await self._candidate_state(tab, deadline)), tab
+
+        rejected = []
+        self.listing_page = None
+        with self.span("prevalidate_candidates", candidates=len(candidates)):
+            checks = [asyncio.ensure_future(check(candidate)) for candidate in candidates]
+            try:
+                for candidate, task in zip(candidates, checks):
+                    reason, tab = await task
+                    if reason is None:
+                        await tab.bring_to_front()
+                        self.listing_page = tab
+                        return {**candidate, "rejected": rejected}
+                    self.log.warning(f"Candidate {candidate.get('rank')} rejected ({reason}): {candidate['url']}")
+                    rejected.append(self._rejection(candidate, reason))
+            finally:
+                # Worse-ranked checks still running are no longer needed
+                for task in checks:
+                    task.cancel()
+                await asyncio.gather(*checks, return_exceptions=True)
+                for tab in tabs:
+                    if tab is not self.listing_page:
+                        await tab.close()
+
+        raise AssertionError(f"None of the top {len(candidates)} listings can be booked: {rejected}")
+
+    async def _candidate_state(self, tab, deadline):
+        """Same as AirbnbResultPage._candidate_state, for the async API."""
+        remaining_ms = (deadline - time.monotonic()) * 1000
+        try:
+            if remaining_ms < 1:
+                return await tab.evaluate(self._CANDIDATE_STATE_SCRIPT)
+            handle = await tab.wait_for_function(self._CANDIDATE_STATE_SCRIPT, timeout=remaining_ms, polling=250)
+            return await handle.json_value()
+        except PlaywrightError:
+            return None
+
+    async def find_top_listings(self, top_k=TOP_K_LISTINGS, concurrency=RESULT_PAGES_CONCURRENCY,
+                                policy=RANKING_POLICY, min_reviews=MIN_REVIEWS):
+        """
+        Scan all paginated Airbnb listings and rank them as they are extracted.
+
+        Args:
+            top_k: Number of listings to return
+            concurrency: Number of result pages loaded at once in separate tabs
+            policy: Scoring policy of the ranking (see utils.listing_ranker)
+            min_reviews: Listings with fewer reviews are not considered
+
+        Returns:
+            list: Up to top_k listing dicts, best first
+
+        Raises:
+            AssertionError: If no listings are found
+        """
+        ranker = ListingRanker(top_k, policy, min_reviews)
+
+        # Step through each paginated result page
+        async for page_number, cards, base_url in self._iter_result_pages(concurrency):
+            self._rank_cards(ranker, page_number, cards, base_url)
+
+        return self._ranked_or_fail(ranker)
+
+    async def _iter_result_pages(self, concurrency):
+        """
+        Yield the extracted cards of every result page, starting with the current one.
+
+        Args:
+            concurrency: Number of result pages loaded at once in separate tabs
+
+        Yields:
+            tuple: (page number, raw cards, base URL for listing hrefs)
+        """
+        cards = await self._read_result_page(self.page, 1, self._search_responses)
+        yield 1, cards, self.page.url.split("/s/")[0]
+
+        if concurrency > 1:
+            async for result in self._prefetch_result_pages(await self._pagination_urls(), concurrency):
+                yield result
+            return
+
+        current_page = 1
+        while True:
+            # Check for and click the pagination next button
+            next_button = self.page.locator(f"css={self._NEXT_PAGE_BUTTON_SELECTOR}")
+            if await next_button.count() == 0 or not await next_button.first.is_enabled():
+                break
+
+            # Wait for the next page's listings to arrive instead of sleeping (see sync: response optional,
+            # and the old cards stay visible until the client-side transition has replaced them)
+            previous_card = await self.page.evaluate(self._FIRST_CARD_SCRIPT, self._LISTING_CARDS_SELECTOR)
+            await self.act_and_wait(next_button.first.click, url_change=True, response=self._next_page_response(),
+                                    response_required=False)
+            current_page += 1
+            if not await self._wait_for_new_cards(self.page, previous_card, current_page):
+                break
+            cards = await self._read_result_page(self.page, current_page, self._search_responses)
+            yield current_page, cards, self.page.url.split("/s/")[0]
+
+    async def _prefetch_result_pages(self, urls, concurrency):
+        """
+        Load result pages in up to `concurrency` tabs of the same context at once.
+
+        Args:
+            urls: URLs of result pages 2..N
+            concurrency: Maximum number of tabs open at once
+
+        Yields:
+            tuple: (page number, raw cards, base URL for listing hrefs), in page order
+        """
+        self.log.info(f"Prefetching {len(urls)} result pages in up to {concurrency} tabs")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def load(page_number, url):
+            async with semaphore:
+                tab = await self.page.context.new_page()
+                try:
+                    responses = self._capture_search_responses(tab)
+                    await tab.goto(url, wait_until="commit")
+                    cards = await self._read_result_page(tab, page_number, responses, wait_for_response=True)
+                    return page_number, cards, tab.url.split("/s/")[0]
+                finally:
+                    await tab.close()
+
+        tasks = [asyncio.ensure_future(load(page_number, url)) for page_number, url in enumerate(urls, start=2)]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _pagination_urls(self):
+        """
+        Work out the URLs of result pages 2..N from the pagination bar of the current page.
+
+        Returns:
+            list: Absolute URLs in page order
+        """
+        links = await self.page.locator(f"css={self._PAGINATION_LINKS_SELECTOR}").evaluate_all(
+            self._PAGINATION_LINKS_SCRIPT)
+        return self._build_page_urls(self.page.url, links)
+
+    async def _read_result_page(self, page, page_number, responses, wait_for_response=False):
+        """
+        Wait for a result page and extract its raw cards (see AirbnbResultPage._read_result_page).
+
+        Returns:
+            list: One dict of raw card fields per listing
+        """
+        if responses is not None:
+            cards = await self._cards_from_responses(page, page_number, responses, wait_for_response)
+            if cards:
+                return cards
+            self.log.warning(f"No listings in search API responses on page {page_number}, reading the DOM")
+
+        await self._wait_for_cards(page, page_number)
+        return await self._extract_cards(page)
+
+    async def _cards_from_responses(self, page, page_number, responses, wait_for_response):
+        """
+        Parse the latest captured search API response of a page.
+
+        Returns:
+            list: Raw card fields, empty if no usable response was captured
+        """
+        if responses:
+            response = responses[-1]
+        elif wait_for_response:
+            try:
+                response = await page.wait_for_event("response", predicate=self._is_search_response,
+                                                     timeout=READY_TIMEOUT_MS)
+            except Exception:
+                return []
+        else:
+            return []
+        responses.clear()
+
+        try:
+            await response.finished()
+            return parse_search_results(await response.json(), page.url)
+        except Exception as e:
+            self.log.warning(f"Unreadable search API response on page {page_number}: {e}",
+                             extra={"sample": "unreadable_response"})
+            return []
+
+    async def _wait_for_cards(self, page, page_number):
+        """Wait for the listing cards of a result page to render."""
+        try:
+            with self.span("wait_for_cards", page=page_number):
+                await page.locator(f"xpath={self._LISTING_CARDS_SELECTOR}").first.wait_for(
+                    state="visible", timeout=self.step_timeout("wait_for_cards", default=READY_TIMEOUT_MS))
+        except Exception:
+            self.log.warning(f"No listings rendered on page {page_number}")
+
+    async def _wait_for_new_cards(self, page, previous_card, page_number):
+        """Wait until a result page no longer shows the cards of the page before it (see sync)."""
+        if previous_card is None:
+            return True
+        try:
+            with self.span("wait_for_new_cards", page=page_number):
+                await page.wait_for_function(self._CARDS_REPLACED_SCRIPT,
+                                             arg=[self._LISTING_CARDS_SELECTOR, previous_card],
+                                             timeout=self.step_timeout("wait_for_new_cards", default=READY_TIMEOUT_MS),
+                                             polling=100)
+            return True
+        except PlaywrightTimeoutError:
+            self.log.warning(f"Page {page_number} still shows the cards of page {page_number - 1}, stopping pagination")
+            return False
+
+    async def _extract_cards(self, page=None):
+        """
+        Extract rating, price, href and title of every listing card on a result page.
+
+        Returns:
+            list: One dict of raw card fields per card, in page order
+        """
+        listings = (page or self.page).locator(f"xpath={self._LISTING_CARDS_SELECTOR}")
+        return await listings.evaluate_all(self._EXTRACT_CARDS_SCRIPT, {
+            "rating": self._LISTING_RATING_SELECTOR,
+            "price": self._LISTING_PRICE_SELECTOR,
+            "title": self._LISTING_TITLE_SELECTOR,
+        })
@@ -0,0 +1,91 @@
+"""
+Performs Airbnb search actions using the async Playwright API.
+"""
+from config.config import SEARCH_MODE
+from pages.async_base_page import AsyncBasePage
+from pages.airbnb_search_page import AirbnbSearchPage
+
+
+class AsyncAirbnbSearchPage(AsyncBasePage, AirbnbSearchPage):
+    """Async counterpart of AirbnbSearchPage (same selectors, methods and return values)."""
+
+    async def search(self, location: str, checkin: str, checkout: str, adults: int, children: int,
+                     mode: str = SEARCH_MODE):
+        """
+        Perform a search on Airbnb with the given parameters.
+
+        Args:
+            location: Destination location
+            checkin: Check-in date in format expected by Airbnb
+            checkout: Check-out date in format expected by Airbnb
+            adults: Number of adult guests
+            children: Number of child guests
+            mode: 'ui' fills the search form; 'url' opens the results URL directly
+
+        Returns:
+            None
+        """
+        self._check_mode(mode)
+        if mode == "url":
+            await self.goto(self.build_search_url(self.page.url, location, checkin, checkout, adults, children))
+            await self.wait_for_element(f"xpath={self._LISTING_CARDS_SELECTOR}")
+            self.log.info(f"Search completed (url).")
+            return
+
+        await self.page.wait_for_load_state("domcontentloaded")
+        checkin_button = f'{self._CALENDAR_SELECTOR}"{checkin}"]'
+        checkout_button = f'{self._CALENDAR_SELECTOR}"{checkout}"]'
+
+        # Fill destination
+        await self.try_click(self._DESTINATION_INPUT_SELECTOR, 5, 1500, True)
+        await self.page.locator(self._DESTINATION_INPUT_SELECTOR).fill(location)
+
+        # Click dates (wait for the calendar instead of sleeping)
+        await self.act_and_wait(lambda: self.try_click(self._CHECKIN_LOCATOR), selector=checkin_button)
+        await self.act_and_wait(lambda: self.page.locator(checkin_button).first.click(), selector=checkout_button)
+        await self.page.locator(checkout_button).first.click()
+
+        # Click number of guests (steppers are clicked once they are actionable)
+        await self.act_and_wait(lambda: self.try_click(self._WHO_BUTTON_LOCATOR),
+                                selector=self._ADULTS_PLUS_SELECTOR)
+        for _ in range(adults):
+            await self.page.locator(self._ADULTS_PLUS_SELECTOR).first.click()
+        for _ in range(children):
+            await self.page.locator(self._CHILDREN_PLUS_SELECTOR).first.click()
+
+        # Click search button and wait for the results page to render
+        await self.act_and_wait(lambda: self.try_click(self._SEARCH_BUTTON_LOCATOR), url_change=True,
+                                selector=f"xpath={self._LISTING_CARDS_SELECTOR}")
+
+        self.log.info(f"Search completed.")
+
+    async def validate_search(self, location: str, checkin: str, checkout: str, guests: dict):
+        """
+        Validate that the search results match the search criteria.
+
+        Args:
+            location: Expected location in results
+            checkin: Expected check-in date
+            checkout: Expected check-out date
+            guests: Dictionary with 'adults' and 'children' keys
+
+        Returns:
+            None
+
+        Raises:
+            AssertionError: If validation fails
+        """
+        self.log.info(f"Validating search.")
+
+        # --- Validate location in UI ---
+        summary_text = await self.page.locator(self._LOCATION_SUMMARY_SELECTOR).first.inner_text()
+        assert summary_text.endswith(location), f"Expected location to end with '{location}', got '{summary_text}'"
+
+        # --- Validate total guest count in UI ---
+        guests_text = await self.page.locator(self._GUESTS_SUMMARY_SELECTOR).first.inner_text()
+        expected_guests_count = sum(guests.values())
+        assert str(expected_guests_count) in guests_text, \
+            f"Expected total guests '{expected_guests_count}', got '{guests_text}'"
+
+        # --- Validate query parameters in URL ---
+        self._validate_url_params(self.page.url, checkin, checkout, guests)
@@ -0,0 +1,216 @@
+"""
+AsyncBasePage: Reusable utilities for page interactions on the async Playwright API.
+"""
+import asyncio
+import re
+
+from playwright.async_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from config.config import WAIT_AFTER_ACTION_MS, READY_TIMEOUT_MS
+from pages.base_page import BasePage
+from utils.locator_registry import LocatorChain
+from utils.retry_policy import retry_budget
+
+
+class AsyncBasePage(BasePage):
+    """
+    Async counterpart of BasePage, for pages from playwright.async_api.
+
+    Method names, arguments and return values match BasePage; every method that
+    talks to the browser is a coroutine. Async page objects list this class first,
+    before the sync page object they mirror, so they inherit its selectors and
+    parsing helpers while these methods take precedence.
+    """
+
+    def install_overlay_handlers(self):
+        """Register the overlay handlers in the background; goto and the retried actions wait for it."""
+        self._overlay_handlers = asyncio.get_running_loop().create_task(self.overlay_registry.ainstall(self.page))
+
+    async def element(self, locator, timeout=WAIT_AFTER_ACTION_MS):
+        """
+        Playwright locator of an element given by a selector or a LocatorChain.
+
+        Args:
+            locator: Selector string or LocatorChain
+            timeout: Maximum time to wait for a chain to match (in ms)
+
+        Returns:
+            Locator: Locator of the element
+        """
+        if not isinstance(locator, LocatorChain):
+            return self.page.locator(locator)
+        with self.span("resolve", locator.name):
+            selector = await self.locator_registry.aresolve(self.page, locator, timeout)
+            return self.page.locator(selector).locator("visible=true").first
+
+    async def goto(self, url, **kwargs):
+        """
+        Navigate the page to a URL (timed as a 'goto' step).
+
+        Args:
+            url: URL to open
+            **kwargs: Passed to page.goto (wait_until, timeout, ...)
+        """
+        await self._overlay_handlers
+        with self.span("goto", url=url):
+            return await self.page.goto(url, **kwargs)
+
+    async def wait_for_element(self, selector, state="visible", timeout=None):
+        """
+        Wait until the first element matching the selector reaches the given state.
+
+        Args:
+            selector: Playwright selector of the element
+            state: One of 'attached', 'detached', 'visible', 'hidden'
+            timeout: Maximum time to wait (in ms), defaults to the step's tuned timeout
+        """
+        timeout = timeout or self.step_timeout("wait_for_element", selector, READY_TIMEOUT_MS)
+        with self.span("wait_for_element", selector, state=state):
+            await self.page.locator(selector).first.wait_for(state=state, timeout=timeout)
+
+    async def wait_for_url_change(self, previous_url, timeout=None):
+        """
+        Wait until the page URL differs from the given one.
+
+        Args:
+            previous_url: URL before the action that triggers navigation
+            timeout: Maximum time to wait (in ms), defaults to the step's tuned timeout
+        """
+        timeout = timeout or self.step_timeout("wait_for_url_change", default=READY_TIMEOUT_MS)
+        with self.span("wait_for_url_change", url=previous_url):
+            await self.page.wait_for_url(lambda url: url != previous_url, wait_until="commit", timeout=timeout)
+
+    async def act_and_wait(self, action, selector=None, state="visible", url_change=False, response=None,
+                           response_required=True, timeout=None):
+        """
+        Run an action, then return as soon as the page is ready for the next step.
+
+        Args:
+            action: Coroutine function performing the interaction (click, fill, ...)
+            selector: Selector of an element expected after the action
+            state: State the element should reach
+            url_change: Whether the action is expected to change the URL
+            response: Regex matched against the URL of a response triggered by the action;
+                the wait ends when that response body has finished loading
+            response_required: Whether a missing response fails; if not, the miss is logged
+                and the other conditions are waited for
+            timeout: Maximum time to wait for each condition (in ms), defaults to their tuned timeouts
+        """
+        with self.span("act_and_wait", selector, response=response):
+            previous_url = self.page.url
+
+            if response:
+                acted = False
+                try:
+                    async with self.page.expect_response(lambda r: re.search(response, r.url) is not None,
+                                                         timeout=timeout or READY_TIMEOUT_MS) as response_info:
+                        await action()
+                        acted = True
+                    matched = await response_info.value
+                except PlaywrightTimeoutError:
+                    if response_required or not acted:
+                        raise
+                    self.log.warning(f"No response matching {response} after the action, waiting for the page")
+                else:
+                    with self.span("wait_for_response", response=response):
+                        await matched.finished()
+            else:
+                await action()
+
+            if url_change:
+                await self.wait_for_url_change(previous_url, timeout)
+
+            if selector:
+                await self.wait_for_element(selector, state, timeout)
+
+    async def retry(self, name, key, operation, retries=5, delay_ms=None, with_refresh=False):
+        """
+        Run an interaction under the retry policy, tracing every attempt.
+
+        Args:
+            name: Step name of the interaction
+            key: Selector the interaction works on (tracked by the circuit breaker)
+            operation: Coroutine function performing one attempt, taking the attempt number
+            retries: Maximum number of attempts
+            delay_ms: First backoff delay (in ms), defaults to the policy's
+            with_refresh: Reload the page once, after the first failed attempt
+
+        Returns:
+            Result of the first successful attempt
+        """
+        await self._overlay_handlers
+        policy = self.retry_policy if delay_ms is None else self.retry_policy.with_base_delay(delay_ms)
+        reloaded = []
+
+        async def attempt(number):
+            with self.span(f"{name}.attempt", key, attempt=number):
+                return await operation(number)
+
+        async def recover(number):
+            if with_refresh and not reloaded:
+                with self.span("retry_refresh", key, attempt=number):
+                    await self.page.reload()
+                reloaded.append(number)
+
+        async def sleep_ms(ms):
+            with self.span("retry_delay", key, delay_ms=round(ms)):
+                await asyncio.sleep(ms / 1000)
+
+        return await policy.acall(attempt, key, retry_budget(self.page), retries, sleep_ms, recover)
+
+    async def try_click(self, locator, retries=5, delay_ms=None, with_refresh=False, post_click_selector=None):
+        async def click(attempt):
+            # Early escape: if post-click element is already there, skip the click
+            if post_click_selector:
+                try:
+                    if await self.page.locator(post_click_selector).is_visible():
+                        return
+                except PlaywrightError:
+                    pass
+
+            timeout = self.step_timeout("try_click.attempt", key, attempt=attempt)
+            element = await self.element(locator, timeout)
+            await element.wait_for(state="visible", timeout=timeout)
+            await element.click()
+
+            # Wait for result of click if applicable
+            if post_click_selector:
+                await self.page.locator(post_click_selector).wait_for(state="visible", timeout=timeout)
+
+        key = self.locator_key(locator)
+        with self.span("try_click", key):
+            await self.retry("try_click", key, click, retries, delay_ms, with_refresh)
+
+    async def try_to_get_by_role(self, element_type, name, retries=5, delay_ms=None, post_click_selector=None):
+        selector = f"role={element_type}[name={name!r}]"
+
+        async def click(attempt):
+            # Check first: has the click already succeeded?
+            if post_click_selector:
+                try:
+                    if await self.page.locator(post_click_selector).is_visible():
+                        return
+                except PlaywrightError:
+                    pass
+
+            timeout = self.step_timeout("try_to_get_by_role.attempt", selector, attempt=attempt)
+            element = self.page.get_by_role(element_type, name=name)
+            await element.wait_for(state="visible", timeout=timeout)
+            await element.click()
+
+            if post_click_selector:
+                await self.page.locator(post_click_selector).wait_for(state="visible", timeout=timeout)
+
+        with self.span("try_to_get_by_role", selector):
+            await self.retry("try_to_get_by_role", selector, click, retries, delay_ms)
+
+    async def try_to_get_text(self, locator, retries=5, delay_ms=None):
+        async def get_text(attempt):
+            timeout = self.step_timeout("try_to_get_text.attempt", key, attempt=attempt)
+            element = await self.element(locator, timeout)
+            await element.wait_for(state="attached", timeout=timeout)  # safer than 'visible'
+            return await element.inner_text()
+
+        key = self.locator_key(locator)
+        with self.span("try_to_get_text", key):
+            return await self.retry("try_to_get_text", key, get_text, retries, delay_ms)
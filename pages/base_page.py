@@ -1,12 +1,33 @@
 """
 BasePage: Reusable utilities for page interactions.
 """
-from config.config import WAIT_AFTER_ACTION_MS
+import re
+
+from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from config.config import WAIT_AFTER_ACTION_MS, READY_TIMEOUT_MS
+from utils.locator_registry import DEFAULT_LOCATOR_REGISTRY, LocatorChain
 from utils.logging_utils import get_logger
+from utils.overlay_registry import DEFAULT_OVERLAY_REGISTRY
+from utils.retry_policy import DEFAULT_RETRY_POLICY, retry_budget
+from utils.step_tracer import current_tracer
+from utils.timing_profile import DEFAULT_TIMING_PROFILE, step_key
 
 class BasePage:
     """Base class for all page objects with common functionality."""
 
+    # Backoff, retry budget and circuit breaking of the try_* methods
+    retry_policy = DEFAULT_RETRY_POLICY
+
+    # Resolves LocatorChain elements to the strategy that currently matches
+    locator_registry = DEFAULT_LOCATOR_REGISTRY
+
+    # Overlays (translation, cookie consent, login nudges) dismissed whenever they show up
+    overlay_registry = DEFAULT_OVERLAY_REGISTRY
+
+    # Per-step timeouts learned from earlier runs of the same environment (local, ci, replay)
+    timing_profile = DEFAULT_TIMING_PROFILE
+
     def __init__(self, page):
         """
         Initialize the base page object.
@@ -16,72 +37,274 @@ class BasePage:
         """
         self.page = page
         self.log = get_logger(self.__class__.__name__)
+        self.install_overlay_handlers()
+
+    def install_overlay_handlers(self):
+        """Let Playwright dismiss known overlays on this page before any action (once per page)."""
+        self.overlay_registry.install(self.page)
+
+    def span(self, method, selector=None, **tags):
+        """
+        Time a step of this page object as a span of the running test.
+
+        Args:
+            method: Step name
+            selector: Selector the step works on, if any
+            **tags: Extra span fields (attempt, url, ...)
+
+        Returns:
+            Context manager timing the enclosed block
+        """
+        return current_tracer().span(method, page_object=self.__class__.__name__, selector=selector, **tags)
+
+    def element(self, locator, timeout=WAIT_AFTER_ACTION_MS):
+        """
+        Playwright locator of an element given by a selector or a LocatorChain.
+
+        Chains are resolved through the locator registry, which probes all their
+        strategies in one round trip and returns the first with a visible match. The
+        locator is narrowed to the visible matches: parts of the site (header, search
+        form) are rendered twice, and the first copy in the DOM is often the hidden one.
+
+        Args:
+            locator: Selector string or LocatorChain
+            timeout: Maximum time to wait for a chain to match (in ms)
+
+        Returns:
+            Locator: Locator of the element
+        """
+        if not isinstance(locator, LocatorChain):
+            return self.page.locator(locator)
+        with self.span("resolve", locator.name):
+            return self.page.locator(self.locator_registry.resolve(self.page, locator, timeout)).locator(
+                "visible=true").first
+
+    @staticmethod
+    def locator_key(locator):
+        """Name of a selector or LocatorChain, as used by traces and the circuit breaker."""
+        return locator.name if isinstance(locator, LocatorChain) else locator
+
+    def step_timeout(self, step, selector=None, default=WAIT_AFTER_ACTION_MS, attempt=1):
+        """
+        Timeout of a step of this page object, sized by the timing profile.
+
+        Retries get the default: a tuned timeout that turns out too short costs one
+        attempt, and the slower success is recorded so the profile catches up.
+
+        Args:
+            step: Step (span) name, e.g. 'try_click.attempt'
+            selector: Selector or locator name the step works on, if any
+            default: Timeout until the profile knows the step (in ms)
+            attempt: Attempt number of a retried step
+
+        Returns:
+            int: Timeout in ms
+        """
+        if attempt > 1:
+            return default
+        return self.timing_profile.timeout_ms(step_key(self.__class__.__name__, step, selector), default)
+
+    def goto(self, url, **kwargs):
+        """
+        Navigate the page to a URL (timed as a 'goto' step).
+
+        Args:
+            url: URL to open
+            **kwargs: Passed to page.goto (wait_until, timeout, ...)
+        """
+        with self.span("goto", url=url):
+            return self.page.goto(url, **kwargs)
+
+    def wait_for_element(self, selector, state="visible", timeout=None):
+        """
+        Wait until the first element matching the selector reaches the given state.
+
+        Args:
+            selector: Playwright selector of the element
+            state: One of 'attached', 'detached', 'visible', 'hidden'
+            timeout: Maximum time to wait (in ms), defaults to the step's tuned timeout
+        """
+        timeout = timeout or self.step_timeout("wait_for_element", selector, READY_TIMEOUT_MS)
+        with self.span("wait_for_element", selector, state=state):
+            self.page.locator(selector).first.wait_for(state=state, timeout=timeout)
+
+    def wait_for_url_change(self, previous_url, timeout=None):
+        """
+        Wait until the page URL differs from the given one.
+
+        Args:
+            previous_url: URL before the action that triggers navigation
+            timeout: Maximum time to wait (in ms), defaults to the step's tuned timeout
+        """
+        timeout = timeout or self.step_timeout("wait_for_url_change", default=READY_TIMEOUT_MS)
+        with self.span("wait_for_url_change", url=previous_url):
+            self.page.wait_for_url(lambda url: url != previous_url, wait_until="commit", timeout=timeout)
 
-    def try_click(self, locator, retries=5, delay_ms=WAIT_AFTER_ACTION_MS, with_refresh=False,
-                  post_click_selector=None):
-        for attempt in range(retries):
-            try:
-                # Early escape: if post-click element is already there, skip the click
-                if post_click_selector:
-                    try:
-                        if self.page.locator(post_click_selector).is_visible():
-                            return
-                    except:
-                        pass
-
-                element = self.page.locator(locator)
-                element.wait_for(state="visible", timeout=WAIT_AFTER_ACTION_MS)
-                element.click()
-
-                # Wait for result of click if applicable
-                if post_click_selector:
-                    self.page.locator(post_click_selector).wait_for(state="visible", timeout=WAIT_AFTER_ACTION_MS)
-
-                return
-            except Exception as e:
-                if with_refresh:
+    def act_and_wait(self, action, selector=None, state="visible", url_change=False, response=None,
+                     response_required=True, timeout=None):
+        """
+        Run an action, then return as soon as the page is ready for the next step.
+
+        Conditions are checked in order: network response, URL change, element state.
+        Only the conditions that are given are waited for.
+
+        Args:
+            action: Callable performing the interaction (click, fill, ...)
+            selector: Selector of an element expected after the action
+            state: State the element should reach
+            url_change: Whether the action is expected to change the URL
+            response: Regex matched against the URL of a response triggered by the action;
+                the wait ends when that response body has finished loading
+            response_required: Whether a missing response fails; if not, the miss is logged
+                and the other conditions are waited for (e.g. when the response may be cached)
+            timeout: Maximum time to wait for each condition (in ms), defaults to their tuned timeouts
+        """
+        with self.span("act_and_wait", selector, response=response):
+            previous_url = self.page.url
+
+            if response:
+                acted = False
+                try:
+                    with self.page.expect_response(lambda r: re.search(response, r.url) is not None,
+                                                   timeout=timeout or READY_TIMEOUT_MS) as response_info:
+                        action()
+                        acted = True
+                    matched = response_info.value
+                except PlaywrightTimeoutError:
+                    if response_required or not acted:
+                        raise
+                    self.log.warning(f"No response matching {response} after the action, waiting for the page")
+                else:
+                    with self.span("wait_for_response", response=response):
+                        matched.finished()
+            else:
+                action()
+
+            if url_change:
+                self.wait_for_url_change(previous_url, timeout)
+
+            if selector:
+                self.wait_for_element(selector, state, timeout)
+
+    def retry(self, name, key, operation, retries=5, delay_ms=None, with_refresh=False):
+        """
+        Run an interaction under the retry policy, tracing every attempt.
+
+        Args:
+            name: Step name of the interaction
+            key: Selector the interaction works on (tracked by the circuit breaker)
+            operation: Callable performing one attempt, taking the attempt number
+            retries: Maximum number of attempts
+            delay_ms: First backoff delay (in ms), defaults to the policy's
+            with_refresh: Reload the page once, after the first failed attempt
+
+        Returns:
+            Result of the first successful attempt
+        """
+        policy = self.retry_policy if delay_ms is None else self.retry_policy.with_base_delay(delay_ms)
+        reloaded = []
+
+        def attempt(number):
+            with self.span(f"{name}.attempt", key, attempt=number):
+                return operation(number)
+
+        def recover(number):
+            # One reload is enough to recover a badly rendered page; more only cost time
+            if with_refresh and not reloaded:
+                with self.span("retry_refresh", key, attempt=number):
                     self.page.reload()
-                self.page.wait_for_timeout(WAIT_AFTER_ACTION_MS)
-
-                if attempt == retries - 1:
-                    raise e
-
-                self.page.wait_for_timeout(delay_ms)
-
-    def try_to_get_by_role(self, element_type, name, retries=5, delay_ms=WAIT_AFTER_ACTION_MS,
-                           post_click_selector=None):
-        for attempt in range(retries):
-            try:
-                # Check first: has the click already succeeded?
-                if post_click_selector:
-                    try:
-                        if self.page.locator(post_click_selector).is_visible():
-                            return
-                    except:
-                        pass
-
-                element = self.page.get_by_role(element_type, name=name)
-                element.wait_for(state="visible", timeout=WAIT_AFTER_ACTION_MS)
-                element.click()
-
-                if post_click_selector:
-                    self.page.locator(post_click_selector).wait_for(state="visible", timeout=WAIT_AFTER_ACTION_MS)
-
-                return
-            except Exception as e:
-                if attempt == retries - 1:
-                    raise e
-                self.page.wait_for_timeout(delay_ms)
-
-
-    def try_to_get_text(self, locator, retries=5, delay_ms=WAIT_AFTER_ACTION_MS):
-        for attempt in range(retries):
-            try:
-                element = self.page.locator(locator)
-                element.wait_for(state="attached", timeout=WAIT_AFTER_ACTION_MS)  # safer than 'visible'
-                return element.inner_text()
-            except Exception as e:
-                if attempt == retries - 1:
-                    raise e
-                self.page.wait_for_timeout(delay_ms)
-        return None
\ No newline at end of file
+                reloaded.append(number)
+
+        def sleep_ms(ms):
+            with self.span("retry_delay", key, delay_ms=round(ms)):
+                self.page.wait_for_timeout(ms)
+
+        return policy.call(attempt, key, retry_budget(self.page), retries, sleep_ms, recover)
+
+    def try_click(self, locator, retries=5, delay_ms=None, with_refresh=False, post_click_selector=None):
+        """
+        Click an element, retrying on transient failures.
+
+        Args:
+            locator: Selector or LocatorChain of the element
+            retries: Maximum number of attempts
+            delay_ms: First backoff delay (in ms), defaults to the retry policy's
+            with_refresh: Reload the page once if the first attempt fails
+            post_click_selector: Selector expected after the click; if already visible, the click is skipped
+        """
+        def click(attempt):
+            # Early escape: if post-click element is already there, skip the click
+            if post_click_selector:
+                try:
+                    if self.page.locator(post_click_selector).is_visible():
+                        return
+                except PlaywrightError:
+                    pass
+
+            timeout = self.step_timeout("try_click.attempt", key, attempt=attempt)
+            element = self.element(locator, timeout)
+            element.wait_for(state="visible", timeout=timeout)
+            element.click()
+
+            # Wait for result of click if applicable
+            if post_click_selector:
+                self.page.locator(post_click_selector).wait_for(state="visible", timeout=timeout)
+
+        key = self.locator_key(locator)
+        with self.span("try_click", key):
+            self.retry("try_click", key, click, retries, delay_ms, with_refresh)
+
+    def try_to_get_by_role(self, element_type, name, retries=5, delay_ms=None, post_click_selector=None):
+        """
+        Click an element found by its ARIA role and accessible name, retrying on transient failures.
+
+        Args:
+            element_type: ARIA role (e.g. 'button')
+            name: Accessible name of the element
+            retries: Maximum number of attempts
+            delay_ms: First backoff delay (in ms), defaults to the retry policy's
+            post_click_selector: Selector expected after the click; if already visible, the click is skipped
+        """
+        selector = f"role={element_type}[name={name!r}]"
+
+        def click(attempt):
+            # Check first: has the click already succeeded?
+            if post_click_selector:
+                try:
+                    if self.page.locator(post_click_selector).is_visible():
+                        return
+                except PlaywrightError:
+                    pass
+
+            timeout = self.step_timeout("try_to_get_by_role.attempt", selector, attempt=attempt)
+            element = self.page.get_by_role(element_type, name=name)
+            element.wait_for(state="visible", timeout=timeout)
+            element.click()
+
+            if post_click_selector:
+                self.page.locator(post_click_selector).wait_for(state="visible", timeout=timeout)
+
+        with self.span("try_to_get_by_role", selector):
+            self.retry("try_to_get_by_role", selector, click, retries, delay_ms)
+
+    def try_to_get_text(self, locator, retries=5, delay_ms=None):
+        """
+        Read the inner text of an element, retrying on transient failures.
+
+        Args:
+            locator: Selector or LocatorChain of the element
+            retries: Maximum number of attempts
+            delay_ms: First backoff delay (in ms), defaults to the retry policy's
+
+        Returns:
+            str: Inner text of the element
+        """
+        def get_text(attempt):
+            timeout = self.step_timeout("try_to_get_text.attempt", key, attempt=attempt)
+            element = self.element(locator, timeout)
+            element.wait_for(state="attached", timeout=timeout)  # safer than 'visible'
+            return element.inner_text()
+
+        key = self.locator_key(locator)
+        with self.span("try_to_get_text", key):
+            return self.retry("try_to_get_text", key, get_text, retries, delay_ms)
@@ -3,8 +3,9 @@ from setuptools import setup, find_packages
 setup(
     name="pytest_suite_timeout",
     version="0.1",
-    description="Suite timeout plugin for pytest",
+    description="Suite timeout and step timing plugins for pytest",
     packages=find_packages(),
-    entry_points={"pytest11": ["suite_timeout = utils.suite_timeout_plugin"]},
+    entry_points={"pytest11": ["suite_timeout = utils.suite_timeout_plugin",
+                               "step_timing = utils.step_timing_plugin"]},
     classifiers=["Framework :: Pytest"],
 )
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+test_act_and_wait.py:
+Unit tests for act_and_wait when the expected response does not arrive.
+"""
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from pages.base_page import BasePage
+from utils.overlay_registry import OverlayRegistry
+from utils.step_tracer import start_tracing, stop_tracing
+
+
+class _NoResponse:
+    """expect_response whose response never arrives (e.g. served from the client cache)."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            raise PlaywrightTimeoutError("Timeout 15000ms exceeded while waiting for event \"response\"")
+
+
+class _Page:
+    def __init__(self):
+        self.url = "https://www.airbnb.com/s/Tel-Aviv/homes"
+        self.waits = []
+
+    def expect_response(self, predicate, timeout=None):
+        return _NoResponse()
+
+    def wait_for_url(self, predicate, wait_until=None, timeout=None):
+        self.waits.append("url")
+
+
+class Page(BasePage):
+    overlay_registry = OverlayRegistry([])
+
+
+@pytest.fixture(autouse=True)
+def _private_tracer():
+    # Page-object spans of these unit tests stay out of the step trace files
+    tracer, token = start_tracing("unit")
+    yield tracer
+    stop_tracing(token)
+
+
+def _fail():
+    raise PlaywrightTimeoutError("Timeout 4000ms exceeded while clicking")
+
+
+def test_optional_response_falls_back_to_the_other_waits():
+    page = _Page()
+    Page(page).act_and_wait(lambda: None, url_change=True, response=r"/api/v3/StaysSearch", response_required=False)
+    assert page.waits == ["url"]
+
+    with pytest.raises(PlaywrightTimeoutError):
+        Page(_Page()).act_and_wait(lambda: None, url_change=True, response=r"/api/v3/StaysSearch")
+
+    # A failing action still fails, even with an optional response
+    with pytest.raises(PlaywrightTimeoutError, match="clicking"):
+        Page(_Page()).act_and_wait(_fail, url_change=True, response=r"/api/v3/StaysSearch", response_required=False)
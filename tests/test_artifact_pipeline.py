@@ -0,0 +1,33 @@
+"""
+test_artifact_pipeline.py:
+Unit tests for the failure-artifact pipeline: background writes and retention.
+"""
+import gzip
+import os
+
+from utils.artifact_pipeline import ArtifactPipeline
+
+
+def test_writes_compressed_artifacts_in_the_background(tmp_path):
+    pipeline = ArtifactPipeline(tmp_path)
+    path = pipeline._submit("test_a.html.gz", "<html>a</html>", compress=True)
+    pipeline.close()
+
+    assert gzip.decompress(path.read_bytes()) == b"<html>a</html>"
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_prune_keeps_the_newest_within_count_and_size(tmp_path):
+    pipeline = ArtifactPipeline(tmp_path, max_files=3, max_mb=0)
+    pipeline.close()
+    for i in range(5):
+        path = tmp_path / f"test_{i}.jpg"
+        path.write_bytes(b"x" * 100)
+        os.utime(path, (i, i))
+
+    pipeline.prune()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["test_2.jpg", "test_3.jpg", "test_4.jpg"]
+
+    pipeline.max_files, pipeline.max_bytes = 0, 250
+    pipeline.prune()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["test_3.jpg", "test_4.jpg"]
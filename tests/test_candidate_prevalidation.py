@@ -0,0 +1,98 @@
+"""
+test_candidate_prevalidation.py:
+Unit tests for the pre-validation of top-ranked listings: verdicts, shared deadline and tab hand-over.
+"""
+import pytest
+
+from pages.airbnb_result_page import AirbnbResultPage
+from utils.overlay_registry import OverlayRegistry
+from utils.step_tracer import start_tracing, stop_tracing
+
+CANDIDATE = {"rank": 1, "url": "https://www.airbnb.com/rooms/1", "title": "Loft", "price": 100}
+
+
+def _state(reserve=True, unavailable=False, price=None):
+    return {"reserve": reserve, "unavailable": unavailable, "price": price}
+
+
+def test_bookable_candidate_within_price_tolerance_is_accepted():
+    assert AirbnbResultPage._rejection_reason(CANDIDATE, _state()) is None
+    assert AirbnbResultPage._rejection_reason(CANDIDATE, _state(price=109), price_tolerance=0.1) is None
+    assert AirbnbResultPage._rejection_reason(CANDIDATE, _state(price=80), price_tolerance=0.1) is None
+
+
+def test_unbookable_candidates_are_rejected_with_a_reason():
+    assert "not available" in AirbnbResultPage._rejection_reason(CANDIDATE, _state(reserve=False, unavailable=True))
+    assert "Reserve" in AirbnbResultPage._rejection_reason(CANDIDATE, None)
+    assert "quoted price 130" in AirbnbResultPage._rejection_reason(CANDIDATE, _state(price=130), price_tolerance=0.1)
+
+    rejection = AirbnbResultPage._rejection(CANDIDATE, "not available for the requested dates")
+    assert rejection == {"rank": 1, "url": CANDIDATE["url"], "title": "Loft",
+                         "reason": "not available for the requested dates"}
+
+
+class _Tab:
+    def __init__(self, context, state):
+        self.context = context
+        self.state = state
+        self.closed = False
+        self.in_front = False
+
+    def goto(self, url, wait_until=None):
+        pass
+
+    def wait_for_function(self, script, timeout=None, polling=None):
+        self.context.timeouts.append(timeout)
+        return self
+
+    def json_value(self):
+        return self.state
+
+    def bring_to_front(self):
+        self.in_front = True
+
+    def close(self):
+        self.closed = True
+
+
+class _Context:
+    def __init__(self, states):
+        self.states = list(states)
+        self.tabs = []
+        self.timeouts = []
+
+    def new_page(self):
+        self.tabs.append(_Tab(self, self.states.pop(0)))
+        return self.tabs[-1]
+
+
+class _Page:
+    def __init__(self, states):
+        self.context = _Context(states)
+
+
+class ResultPage(AirbnbResultPage):
+    overlay_registry = OverlayRegistry([])
+
+
+@pytest.fixture(autouse=True)
+def _private_tracer():
+    # Page-object spans of these unit tests stay out of the step trace files
+    tracer, token = start_tracing("unit")
+    yield tracer
+    stop_tracing(token)
+
+
+def test_winner_tab_is_handed_over_and_the_checks_share_one_deadline():
+    page = _Page([_state(reserve=False, unavailable=True), _state(), _state()])
+    results = ResultPage(page, extraction_mode="dom")
+    candidates = [{**CANDIDATE, "rank": rank, "url": f"https://www.airbnb.com/rooms/{rank}"} for rank in (1, 2, 3)]
+
+    best = results.prevalidate_candidates(candidates)
+
+    assert best["rank"] == 2 and [rejection["rank"] for rejection in best["rejected"]] == [1]
+    first, winner, third = page.context.tabs
+    assert results.listing_page is winner and winner.in_front and not winner.closed
+    assert first.closed and third.closed
+    # The worse-ranked candidate is never waited for, and the winner gets what the first one left
+    assert len(page.context.timeouts) == 2 and page.context.timeouts[1] <= page.context.timeouts[0]
@@ -0,0 +1,100 @@
+"""
+test_context_pool.py:
+Unit tests for resetting pooled contexts: cookies and storage go back to the snapshot taken at creation.
+"""
+import json
+
+from utils.context_pool import ContextPool
+
+SEARCH = "https://www.airbnb.com"
+TRACKER = "https://www.tracker.example"
+
+
+class _Page:
+    def __init__(self, context):
+        self.context = context
+
+    def route(self, url, handler):
+        pass
+
+    def goto(self, url):
+        self.url = url
+
+    def evaluate(self, script, items):
+        self.context.resets.append((self.url, items))
+
+    def close(self):
+        self.context.pages.remove(self)
+
+
+class _Context:
+    def __init__(self):
+        self.pages = []
+        self.cookies = [{"name": "consent", "value": "1"}]
+        self.origins = [{"origin": SEARCH, "localStorage": [{"name": "consent", "value": "1"}]}]
+        self.resets = []
+
+    def new_page(self):
+        page = _Page(self)
+        self.pages.append(page)
+        return page
+
+    def storage_state(self, indexed_db=None):
+        return {"cookies": list(self.cookies), "origins": [dict(origin) for origin in self.origins]}
+
+    def clear_cookies(self):
+        self.cookies = []
+
+    def add_cookies(self, cookies):
+        self.cookies += cookies
+
+    def close(self):
+        self.closed = True
+
+
+def test_release_restores_local_storage_and_drops_indexed_db_of_changed_origins():
+    context = _Context()
+    pool = ContextPool(lambda storage_state: context, size=1)
+
+    # Untouched storage costs no page
+    pool.release(pool.acquire())
+    assert context.resets == []
+
+    # A test saved a search in localStorage and a tracker opened an IndexedDB database
+    context.origins = [
+        {"origin": SEARCH, "localStorage": [{"name": "consent", "value": "1"}, {"name": "recent", "value": "Haifa"}]},
+        {"origin": TRACKER, "localStorage": [], "indexedDB": [{"name": "events"}]},
+    ]
+    context.cookies.append({"name": "session", "value": "x"})
+    pool.release(pool.acquire())
+
+    assert context.resets == [(SEARCH, [{"name": "consent", "value": "1"}]), (TRACKER, [])]
+    assert context.cookies == [{"name": "consent", "value": "1"}]
+    assert context.pages == []
+
+
+def test_snapshot_is_taken_before_the_first_test_and_only_the_warm_up_is_saved(tmp_path):
+    storage_state_path = tmp_path / "storage_state.json"
+    contexts = []
+
+    def factory(storage_state):
+        contexts.append(_Context())
+        contexts[-1].cookies = []
+        contexts[-1].origins = []
+        return contexts[-1]
+
+    def warm_up(context):
+        context.new_page()
+        context.cookies = [{"name": "consent", "value": "1"}]
+
+    pool = ContextPool(factory, size=1, storage_state_path=storage_state_path, warm_up=warm_up)
+    context = pool.acquire()
+    assert context.pages == []
+    assert json.loads(storage_state_path.read_text())["cookies"] == [{"name": "consent", "value": "1"}]
+
+    # The first test's state is neither kept for the next test nor saved
+    context.cookies.append({"name": "session", "value": "x"})
+    pool.release(context)
+    assert context.cookies == [{"name": "consent", "value": "1"}]
+    pool.close()
+    assert json.loads(storage_state_path.read_text())["cookies"] == [{"name": "consent", "value": "1"}]
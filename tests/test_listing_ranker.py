@@ -0,0 +1,50 @@
+"""
+test_listing_ranker.py:
+Unit tests for the streaming top-k listing ranking.
+"""
+import pytest
+
+from utils.listing_ranker import ListingRanker
+
+
+def _listing(rating, price, reviews=10):
+    return {"rating": rating, "price": price, "reviews": reviews}
+
+
+def test_rating_then_price_keeps_best_first():
+    """Highest rating wins; among equal ratings the cheapest wins."""
+    ranker = ListingRanker(top_k=2, policy="rating_price")
+    ranker.extend([_listing(4.8, 100), _listing(4.9, 300), _listing(4.9, 200), _listing(4.5, 50)])
+
+    ranked = ranker.ranked()
+    assert [(l["rating"], l["price"]) for l in ranked] == [(4.9, 200), (4.9, 300)]
+    assert [l["rank"] for l in ranked] == [1, 2]
+    assert ranker.seen == 4
+
+
+def test_ties_keep_first_seen_listing():
+    """Identical scores keep the listing that was extracted first."""
+    ranker = ListingRanker(top_k=1)
+    first, second = _listing(5.0, 100), _listing(5.0, 100)
+    first["url"], second["url"] = "first", "second"
+    ranker.extend([first, second])
+
+    assert ranker.ranked()[0]["url"] == "first"
+
+
+def test_min_reviews_filters_listings():
+    """Listings below the review threshold are never ranked."""
+    ranker = ListingRanker(top_k=3, min_reviews=5)
+    ranker.extend([_listing(5.0, 10, reviews=1), _listing(4.0, 10, reviews=50)])
+
+    assert [l["rating"] for l in ranker.ranked()] == [4.0]
+
+
+def test_custom_policy_and_unknown_policy():
+    """A callable policy is used as is; unknown policy names are rejected."""
+    ranker = ListingRanker(top_k=1, policy=lambda l: -l["price"])
+    ranker.extend([_listing(5.0, 300), _listing(3.0, 100)])
+    assert ranker.ranked()[0]["price"] == 100
+
+    with pytest.raises(ValueError):
+        ListingRanker(policy="cheapest")
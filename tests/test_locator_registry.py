@@ -0,0 +1,76 @@
+"""
+test_locator_registry.py:
+Unit tests for locator fallback chains and the cache of winning strategies.
+"""
+import pytest
+
+from pages.base_page import BasePage
+from utils.locator_registry import LocatorChain, LocatorRegistry
+from utils.overlay_registry import OverlayRegistry
+from utils.step_tracer import start_tracing, stop_tracing
+
+CHAIN = LocatorChain("search.submit",
+                     {"testid": "search-button"},
+                     {"role": "button", "name": "Search"},
+                     {"text": "Search"},
+                     {"css": "form > div > button"})
+
+
+def test_strategies_map_to_playwright_selectors():
+    assert [CHAIN.selector(strategy) for strategy in CHAIN.strategies] == [
+        '[data-testid="search-button"]', 'role=button[name="Search"]', "text=Search", "form > div > button"]
+    assert CHAIN.primary == '[data-testid="search-button"]'
+
+    with pytest.raises(ValueError):
+        LocatorChain("broken", {"xpath": "//button"})
+
+
+def test_winning_strategy_is_cached_and_tried_first(tmp_path):
+    cache_path = tmp_path / "locator_cache.json"
+    registry = LocatorRegistry(cache_path)
+    assert registry.ordered(CHAIN) == CHAIN.strategies
+
+    # The CSS fallback won: later registries (runs) try it first, keeping the rest in order
+    assert registry._record(CHAIN, CHAIN.strategies[3]) == "form > div > button"
+    reloaded = LocatorRegistry(cache_path)
+    assert reloaded.ordered(CHAIN) == [CHAIN.strategies[3]] + CHAIN.strategies[:3]
+
+
+class _Locator:
+    def __init__(self, selectors):
+        self.selectors = selectors
+
+    def locator(self, selector):
+        return _Locator(self.selectors + [selector])
+
+    @property
+    def first(self):
+        return _Locator(self.selectors + ["first"])
+
+
+class _Page:
+    def locator(self, selector):
+        return _Locator([selector])
+
+
+class _Registry:
+    def resolve(self, page, chain, timeout):
+        return chain.primary
+
+
+@pytest.fixture(autouse=True)
+def _private_tracer():
+    # Page-object spans of these unit tests stay out of the step trace files
+    tracer, token = start_tracing("unit")
+    yield tracer
+    stop_tracing(token)
+
+
+def test_resolved_element_is_the_visible_match():
+    """The probe picks a strategy by its visible match, so the locator must not land on a hidden copy."""
+    class Page(BasePage):
+        locator_registry = _Registry()
+        overlay_registry = OverlayRegistry([])
+
+    assert Page(_Page()).element(CHAIN).selectors == ['[data-testid="search-button"]', "visible=true", "first"]
+    assert Page(_Page()).element("#plain").selectors == ["#plain"]
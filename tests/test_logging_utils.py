@@ -0,0 +1,39 @@
+"""
+test_logging_utils.py:
+Unit tests for structured logging: JSON lines with test context and message sampling.
+"""
+import json
+import logging
+
+from utils.logging_utils import ContextFilter, JsonFormatter, SamplingFilter
+from utils.step_tracer import start_tracing, stop_tracing
+
+
+def _record(msg, **extra):
+    return logging.makeLogRecord({"name": "AirbnbResultPage", "levelname": "WARNING", "msg": msg, **extra})
+
+
+def test_json_lines_carry_test_step_and_extra_fields():
+    tracer, token = start_tracing("tests/test_a.py::test_a")
+    try:
+        with tracer.span("find_top_listings"):
+            record = _record("Ranked", duration_ms=12)
+            ContextFilter().filter(record)
+    finally:
+        stop_tracing(token)
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["test"] == "tests/test_a.py::test_a"
+    assert entry["step"] == "find_top_listings"
+    assert entry["worker"]
+    assert entry["duration_ms"] == 12
+
+
+def test_sampling_keeps_a_burst_then_one_in_every_per_test():
+    sampling = SamplingFilter(burst=3, every=10)
+    kept = [i for i in range(33) if sampling.filter(_record(f"No href {i}", test="a", sample="no_href"))]
+    assert kept == [0, 1, 2, 12, 22, 32]
+
+    # Other tests and unsampled messages are not affected
+    assert sampling.filter(_record("No href", test="b", sample="no_href"))
+    assert all(sampling.filter(_record("Found listings", test="a")) for _ in range(20))
@@ -0,0 +1,97 @@
+"""
+test_overlay_registry.py:
+Unit tests for the overlay registry: handler installation and dismissal order.
+"""
+import pytest
+
+from utils.overlay_registry import Overlay, OverlayRegistry
+
+
+class _Locator:
+    def __init__(self, page, selector):
+        self.page = page
+        self.selector = selector
+        self.first = self
+
+    def click(self, timeout=None):
+        self.page.clicks.append(self.selector)
+        if self.selector not in self.page.clickable:
+            raise TimeoutError(f"Timeout {timeout}ms exceeded")
+
+
+class _Keyboard:
+    def __init__(self, page):
+        self.page = page
+
+    def press(self, key):
+        self.page.keys.append(key)
+
+
+class _Page:
+    def __init__(self, clickable=(), url="https://www.airbnb.com/s/Tel-Aviv/homes"):
+        self.url = url
+        self.clickable = set(clickable)
+        self.handlers = {}
+        self.no_wait_after = {}
+        self.clicks = []
+        self.keys = []
+        self.keyboard = _Keyboard(self)
+
+    def locator(self, selector):
+        return _Locator(self, selector)
+
+    def add_locator_handler(self, locator, handler, no_wait_after=None):
+        self.handlers[locator.selector] = handler
+        self.no_wait_after[locator.selector] = no_wait_after
+
+
+OVERLAY = Overlay("popup", "#popup", dismiss=("#popup .close", "#popup .ok"))
+
+
+def test_handlers_are_installed_once_per_page():
+    registry = OverlayRegistry([OVERLAY, Overlay("banner", "#banner", key=None)])
+    page = _Page()
+    registry.install(page)
+    registry.install(page)
+    assert list(page.handlers) == ["#popup", "#banner"]
+
+
+def test_dismiss_tries_buttons_in_order_then_the_key():
+    registry = OverlayRegistry([OVERLAY])
+    page = _Page(clickable={"#popup .ok"})
+    registry.install(page)
+    page.handlers["#popup"](page.locator("#popup"))
+    assert page.clicks == ["#popup .close", "#popup .ok"] and page.keys == []
+
+    stuck = _Page()
+    registry.install(stuck)
+    stuck.handlers["#popup"](stuck.locator("#popup"))
+    assert stuck.keys == ["Escape"]
+    assert registry.dismissed == {"popup": 2}
+
+
+def test_from_config_rejects_unknown_overlays():
+    assert [overlay.name for overlay in OverlayRegistry.from_config("translation, cookie_consent").overlays] == [
+        "translation", "cookie_consent"]
+    assert OverlayRegistry.from_config("").overlays == []
+    with pytest.raises(ValueError):
+        OverlayRegistry.from_config("translation,newsletter")
+
+
+def test_login_dialog_of_the_checkout_is_left_open():
+    """The checkout's login dialog mounts before its phone input: on /book/ it must never be closed."""
+    login_nudge = OverlayRegistry.from_config("login_nudge")
+    trigger = login_nudge.overlays[0].trigger
+    close = '[role="dialog"]:has-text("Log in or sign up") button[aria-label="Close"]'
+
+    checkout = _Page(clickable={close}, url="https://www.airbnb.com/book/stays/123?numberOfAdults=2")
+    login_nudge.install(checkout)
+    assert checkout.no_wait_after[trigger]
+    checkout.handlers[trigger](checkout.locator(trigger))
+    assert checkout.clicks == [] and checkout.keys == []
+
+    search = _Page(clickable={close})
+    login_nudge.install(search)
+    search.handlers[trigger](search.locator(trigger))
+    assert search.clicks == [close]
+    assert login_nudge.dismissed == {"login_nudge": 1}
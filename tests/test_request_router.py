@@ -0,0 +1,70 @@
+"""
+test_request_router.py:
+Unit tests for the request router on an async browser context.
+"""
+import asyncio
+
+from utils.request_router import RequestRouter
+
+
+class _Request:
+    def __init__(self, url, resource_type):
+        self.url = url
+        self.resource_type = resource_type
+
+    async def sizes(self):
+        # A chunked, compressed response: no content-length, yet bytes on the wire
+        return {"requestBodySize": 0, "requestHeadersSize": 300, "responseBodySize": 1200,
+                "responseHeadersSize": 500}
+
+
+class _Route:
+    def __init__(self, request):
+        self.request = request
+        self.outcome = None
+
+    async def abort(self, error_code=None):
+        self.outcome = "aborted"
+
+    async def fulfill(self, status=None, body=None):
+        self.outcome = "stubbed"
+
+    async def fallback(self):
+        self.outcome = "continued"
+
+
+class _AsyncContext:
+    def __init__(self):
+        self.routes = {}
+        self.listeners = {}
+
+    async def route(self, url, handler):
+        self.routes[url] = handler
+
+    def on(self, event, listener):
+        self.listeners[event] = listener
+
+
+def test_router_is_active_on_an_async_context():
+    router = RequestRouter({"images": "off", "analytics": "stub"})
+    context = _AsyncContext()
+    asyncio.run(router.aattach(context))
+    assert list(context.routes) == ["**/*"] and "requestfinished" in context.listeners
+
+    async def request(url, resource_type):
+        route = _Route(_Request(url, resource_type))
+        await context.routes["**/*"](route)
+        if route.outcome != "aborted":
+            await context.listeners["requestfinished"](route.request)
+        return route.outcome
+
+    async def requests():
+        return [await request("https://a0.muscache.com/pictures/1.jpg", "image"),
+                await request("https://www.google-analytics.com/collect", "script"),
+                await request("https://www.airbnb.com/api/v3/StaysSearch", "fetch")]
+
+    assert asyncio.run(requests()) == ["aborted", "stubbed", "continued"]
+    stats = router.stats()
+    assert stats["blocked_by_category"] == {"images": 1, "analytics": 1}
+    # The stubbed request finished too, but only the one that went through loaded anything
+    assert (stats["allowed_requests"], stats["allowed_bytes"]) == (1, 2000)
@@ -0,0 +1,49 @@
+"""
+test_result_prefetch.py:
+Unit tests for prefetching result pages in parallel tabs.
+"""
+import pytest
+from playwright.sync_api import Error as PlaywrightError
+
+from pages.airbnb_result_page import AirbnbResultPage
+from utils.overlay_registry import OverlayRegistry
+
+
+class _Tab:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+
+    def goto(self, url, wait_until=None):
+        if "unreachable" in url:
+            raise PlaywrightError("net::ERR_NAME_NOT_RESOLVED")
+
+    def close(self):
+        self.closed = True
+
+
+class _Context:
+    def __init__(self):
+        self.tabs = []
+
+    def new_page(self):
+        self.tabs.append(_Tab(self))
+        return self.tabs[-1]
+
+
+class _Page:
+    def __init__(self):
+        self.context = _Context()
+
+
+class ResultPage(AirbnbResultPage):
+    overlay_registry = OverlayRegistry([])
+
+
+def test_tabs_are_closed_when_a_navigation_fails():
+    page = _Page()
+    results = ResultPage(page, extraction_mode="dom")
+    with pytest.raises(PlaywrightError):
+        list(results._prefetch_result_pages(["https://www.airbnb.com/s/a?page=2", "https://unreachable/s/a?page=3"],
+                                            concurrency=2))
+    assert len(page.context.tabs) == 2 and all(tab.closed for tab in page.context.tabs)
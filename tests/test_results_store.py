@@ -0,0 +1,55 @@
+"""
+test_results_store.py:
+Unit tests for the run results store: indexed lookups, index rebuild and trend queries.
+"""
+from utils.results_store import ResultsStore
+
+
+def _run(store, run_id, location, price, steps):
+    spans = [{"page_object": "AirbnbResultPage", "name": name, "status": "ok", "duration_ms": duration_ms}
+             for name, duration_ms in steps.items()]
+    winner = {"url": f"https://www.airbnb.com/rooms/{run_id}", "price": price}
+    return store.record_run(run_id, {"location": location, "checkin": "2025-07-01", "checkout": "2025-07-05"},
+                            [winner], winner, {"url": winner["url"]}, spans)
+
+
+def test_find_reads_only_the_indexed_matches(tmp_path):
+    store = ResultsStore(tmp_path / "results.jsonl")
+    _run(store, "r1", "Tel Aviv", 100, {})
+    _run(store, "r1", "Haifa", 80, {})
+    _run(store, "r2", "Tel Aviv", 110, {})
+
+    assert [entry["run_id"] for entry in store.index()] == ["r1", "r1", "r2"]
+    assert [record["winner"]["price"] for record in store.find(location="Tel Aviv")] == [100, 110]
+    assert [record["location"] for record in store.find(run_id="r1", checkin="2025-07-01")] == ["Tel Aviv", "Haifa"]
+    assert store.find(location="Eilat") == []
+
+
+def test_index_is_rebuilt_when_missing_damaged_or_behind(tmp_path):
+    store = ResultsStore(tmp_path / "results.jsonl")
+    _run(store, "r1", "Tel Aviv", 100, {})
+    _run(store, "r2", "Tel Aviv", 110, {})
+
+    store.index_path.unlink()
+    assert [entry["run_id"] for entry in store.index()] == ["r1", "r2"]
+
+    store.index_path.write_text('{"run_id": "r1", "offs')
+    _run(store, "r3", "Tel Aviv", 120, {})
+    assert [entry["run_id"] for entry in store.index()] == ["r1", "r2", "r3"]
+
+    # A writer that crashed between the data and the index line
+    with open(store.path, "a") as f:
+        f.write('{"run_id":"r4","location":"Tel Aviv","checkin":null,"checkout":null,"ts":1}\n')
+    assert [record["run_id"] for record in store.find(location="Tel Aviv")] == ["r1", "r2", "r3", "r4"]
+
+
+def test_price_drift_and_step_regressions(tmp_path):
+    store = ResultsStore(tmp_path / "results.jsonl")
+    for i, duration_ms in enumerate([1000, 1100, 900, 2000]):
+        _run(store, f"r{i}", "Tel Aviv", 100 + i * 5, {"wait_for_cards": duration_ms, "resolve": 50})
+
+    assert [row["price"] for row in store.price_drift("Tel Aviv")] == [100, 105, 110, 115]
+    assert [row["duration_ms"] for row in store.step_latency("AirbnbResultPage.wait_for_cards:")] == [
+        1000, 1100, 900, 2000]
+    assert store.step_regressions() == [{"step": "AirbnbResultPage.wait_for_cards:", "run_id": "r3",
+                                         "latest_ms": 2000, "baseline_ms": 1000, "ratio": 2.0}]
@@ -0,0 +1,114 @@
+"""
+test_retry_policy.py:
+Unit tests for the retry policy: backoff, error classification, budget, circuit breaker and time slices.
+"""
+import pytest
+from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from utils.retry_policy import RetryPolicy, RetryBudget, CircuitBreaker, is_retryable
+from utils.suite_timeout_plugin import TimeSliceExceeded
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _failing(error, fail_times=None):
+    calls = []
+
+    def operation(attempt):
+        calls.append(attempt)
+        if fail_times is None or len(calls) <= fail_times:
+            raise error
+        return "ok"
+
+    return operation, calls
+
+
+def test_backoff_grows_exponentially_with_bounded_jitter():
+    """Delays double per retry, stay within the jitter band and never exceed the cap."""
+    fixed = RetryPolicy(base_delay_ms=100, max_delay_ms=500, jitter=0)
+    assert [fixed.backoff_ms(retry) for retry in range(1, 5)] == [100, 200, 400, 500]
+
+    jittered = RetryPolicy(base_delay_ms=100, max_delay_ms=500, jitter=0.5)
+    for _ in range(50):
+        assert 100 <= jittered.backoff_ms(2) <= 200
+
+
+def test_only_timeouts_and_detached_elements_are_retryable():
+    assert is_retryable(PlaywrightTimeoutError("Timeout 4000ms exceeded"))
+    assert is_retryable(PlaywrightError("Element is not attached to the DOM"))
+    assert not is_retryable(PlaywrightError("Target page, context or browser has been closed"))
+    assert not is_retryable(AssertionError("wrong price"))
+
+
+def test_retries_until_success_and_fails_fast_otherwise():
+    policy = RetryPolicy(base_delay_ms=10, jitter=0)
+    sleeps = []
+
+    operation, calls = _failing(PlaywrightTimeoutError("timeout"), fail_times=2)
+    assert policy.call(operation, "#a", RetryBudget(10_000), 5, sleeps.append) == "ok"
+    assert calls == [1, 2, 3]
+    assert sleeps == [10, 20]
+
+    operation, calls = _failing(ValueError("not transient"))
+    with pytest.raises(ValueError):
+        policy.call(operation, "#b", RetryBudget(10_000), 5, sleeps.append)
+    assert calls == [1]
+
+
+def test_budget_caps_retry_time():
+    """Delays are cut to the remaining budget and retries stop once it is spent."""
+    policy = RetryPolicy(base_delay_ms=100, jitter=0)
+    budget = RetryBudget(150)
+    sleeps = []
+
+    def sleep_ms(ms):
+        sleeps.append(ms)
+        budget.spend(ms)
+
+    operation, calls = _failing(PlaywrightTimeoutError("timeout"))
+    with pytest.raises(PlaywrightTimeoutError):
+        policy.call(operation, "#a", budget, 10, sleep_ms)
+    assert sleeps[0] == 100 and sum(sleeps) <= 150 + 1
+    assert len(calls) == len(sleeps) + 1 < 10
+
+
+def test_breaker_stops_retrying_a_failing_selector_until_cooldown():
+    clock = _Clock()
+    policy = RetryPolicy(base_delay_ms=0, jitter=0, breaker=CircuitBreaker(threshold=2, cooldown_sec=60, clock=clock))
+    error = PlaywrightTimeoutError("timeout")
+
+    for _ in range(2):
+        operation, calls = _failing(error)
+        with pytest.raises(PlaywrightTimeoutError):
+            policy.call(operation, "#bad", RetryBudget(10_000), 3, lambda ms: None)
+        assert len(calls) == 3
+
+    # Open: a single attempt, other selectors are unaffected
+    operation, calls = _failing(error)
+    with pytest.raises(PlaywrightTimeoutError):
+        policy.call(operation, "#bad", RetryBudget(10_000), 3, lambda ms: None)
+    assert calls == [1]
+    assert policy.attempts_for("#good", 3) == 3
+
+    # After the cooldown the selector is retried again, and a success closes the breaker
+    clock.now = 61
+    operation, calls = _failing(error, fail_times=1)
+    assert policy.call(operation, "#bad", RetryBudget(10_000), 3, lambda ms: None) == "ok"
+    assert calls == [1, 2]
+    assert not policy.breaker.is_open("#bad")
+
+
+def test_time_slice_is_not_retried():
+    """The suite timeout's alarm exception passes through the attempt loop untouched."""
+    policy = RetryPolicy(base_delay_ms=10, jitter=0)
+    sleeps = []
+    operation, calls = _failing(TimeSliceExceeded("Test exceeded its time slice of 60s"))
+    with pytest.raises(TimeSliceExceeded):
+        policy.call(operation, "#slice", RetryBudget(10_000), 5, sleeps.append)
+    assert calls == [1] and sleeps == []
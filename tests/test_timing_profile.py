@@ -0,0 +1,59 @@
+"""
+test_timing_profile.py:
+Unit tests for the timing profile: tuned timeouts, profiles and persistence.
+"""
+import pytest
+
+from utils.timing_profile import TimingProfile, resolve_profile, step_key
+
+
+def test_timeout_is_p99_with_headroom_within_bounds(tmp_path):
+    profile = TimingProfile(tmp_path / "timing.json", "local", headroom=1.5, min_samples=10, min_ms=500, max_ms=5000)
+    key = step_key("AirbnbSearchPage", "try_click.attempt", "search.checkin")
+    for duration in range(100, 1100, 10):
+        profile.record(key, duration)
+    profile.record(step_key("AirbnbSearchPage", "wait_for_element", "#slow"), 9000)
+    profile.save()
+
+    tuned = TimingProfile(tmp_path / "timing.json", "local", headroom=1.5, min_samples=10, min_ms=500, max_ms=5000)
+    assert tuned.timeout_ms(key, 4000) == round(1080 * 1.5)
+    # Too few samples: the default applies
+    assert tuned.timeout_ms(step_key("AirbnbSearchPage", "wait_for_element", "#slow"), 15000) == 15000
+
+
+def test_profiles_are_kept_apart_and_merged_on_save(tmp_path):
+    path = tmp_path / "timing.json"
+    key = step_key("AirbnbResultPage", "wait_for_cards")
+    for name, duration in (("ci", 3000), ("replay", 50)):
+        profile = TimingProfile(path, name, min_samples=1, min_ms=0)
+        profile.record(key, duration)
+        profile.save()
+    worker = TimingProfile(path, "ci", min_samples=1, min_ms=0, headroom=1)
+    worker.record(key, 4000)
+    worker.save()
+
+    assert TimingProfile(path, "ci", min_samples=1, min_ms=0, headroom=1).timeout_ms(key, 1) == 4000
+    assert TimingProfile(path, "replay", min_samples=1, min_ms=0, headroom=1).timeout_ms(key, 1) == 50
+    assert TimingProfile(path, "off").timeout_ms(key, 1234) == 1234
+
+
+def test_record_spans_keeps_successful_tuned_steps_only(tmp_path):
+    profile = TimingProfile(tmp_path / "timing.json", "local", min_samples=1, min_ms=0, headroom=1)
+    profile.record_spans([
+        {"name": "try_click.attempt", "status": "ok", "duration_ms": 120.0, "page_object": "P", "selector": "#a"},
+        {"name": "try_click.attempt", "status": "error", "duration_ms": 4000.0, "page_object": "P", "selector": "#a"},
+        {"name": "goto", "status": "ok", "duration_ms": 900.0, "page_object": "P"},
+    ])
+    profile.save()
+    assert TimingProfile(tmp_path / "timing.json", "local", min_samples=1, min_ms=0, headroom=1).timeout_ms(
+        step_key("P", "try_click.attempt", "#a"), 1) == 120
+
+
+def test_resolve_profile(monkeypatch):
+    monkeypatch.delenv("CI", raising=False)
+    assert resolve_profile("auto") == "local"
+    assert resolve_profile("auto", replay=True) == "replay"
+    monkeypatch.setenv("CI", "true")
+    assert resolve_profile("auto") == "ci"
+    with pytest.raises(ValueError):
+        resolve_profile("staging")
@@ -0,0 +1,164 @@
+"""
+ArtifactPipeline: Failure screenshots, DOM snapshots and traces written off the test thread.
+"""
+import gzip
+import os
+import queue
+import threading
+from pathlib import Path
+
+from config.config import (ARTIFACT_DIR, ARTIFACT_IMAGE_FORMAT, ARTIFACT_IMAGE_QUALITY, ARTIFACT_DOM_SNAPSHOTS,
+                           ARTIFACT_MAX_FILES, ARTIFACT_MAX_MB)
+from utils.logging_utils import get_logger
+
+# Upper bound for the screenshot of a failed test (in ms); a hung page must not hold the suite
+SCREENSHOT_TIMEOUT_MS = 5000
+
+
+class ArtifactPipeline:
+    """
+    Captures failure artifacts and hands them to a background writer.
+
+    The test thread only makes the Playwright calls (the browser encodes the screenshot
+    in the configured format and quality). Compression, writing and pruning run in a
+    worker thread behind a bounded queue: when it is full, artifacts are dropped rather
+    than stalling the suite. After every write the oldest artifacts beyond the count or
+    size limit are deleted.
+    """
+
+    def __init__(self, directory=ARTIFACT_DIR, image_format=ARTIFACT_IMAGE_FORMAT, quality=ARTIFACT_IMAGE_QUALITY,
+                 dom_snapshots=ARTIFACT_DOM_SNAPSHOTS, max_files=ARTIFACT_MAX_FILES, max_mb=ARTIFACT_MAX_MB,
+                 queue_size=32):
+        """
+        Initialize the pipeline and start its writer.
+
+        Args:
+            directory: Output directory (created if missing)
+            image_format: Screenshot format, 'jpeg' or 'png'
+            quality: JPEG quality (0-100), ignored for PNG
+            dom_snapshots: Whether to save the gzipped page HTML
+            max_files: Artifacts kept at most (0 = no limit)
+            max_mb: Total size of the artifacts kept at most, in MB (0 = no limit)
+            queue_size: Artifacts waiting to be written before new ones are dropped
+        """
+        if image_format not in ("jpeg", "png"):
+            raise ValueError(f"Unknown image format '{image_format}', expected 'jpeg' or 'png'")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.image_format = image_format
+        self.quality = quality
+        self.dom_snapshots = dom_snapshots
+        self.max_files = max_files
+        self.max_bytes = max_mb * 1024 * 1024
+        self.dropped = 0
+        self.log = get_logger("ArtifactPipeline")
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._worker = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._worker.start()
+
+    def capture_failure(self, page, name):
+        """
+        Capture the screenshot and DOM snapshot of a failed test.
+
+        Args:
+            page: Playwright page of the test
+            name: File name stem of the artifacts
+
+        Returns:
+            list: Paths the artifacts will be written to
+        """
+        paths = []
+        options = {"quality": self.quality} if self.image_format == "jpeg" else {}
+        try:
+            image = page.screenshot(type=self.image_format, animations="disabled", timeout=SCREENSHOT_TIMEOUT_MS,
+                                    **options)
+            paths.append(self._submit(f"{name}.{'jpg' if self.image_format == 'jpeg' else 'png'}", image))
+        except Exception as e:
+            self.log.warning(f"No screenshot for {name}: {e}")
+
+        if self.dom_snapshots:
+            try:
+                paths.append(self._submit(f"{name}.html.gz", page.content(), compress=True))
+            except Exception as e:
+                self.log.warning(f"No DOM snapshot for {name}: {e}")
+
+        return [path for path in paths if path]
+
+    def trace_path(self, name):
+        """Path a failed test's Playwright trace is saved to (Playwright writes it, already zipped)."""
+        return self.directory / f"{name}.trace.zip"
+
+    def trace_saved(self):
+        """Apply the retention limits after a trace was written."""
+        try:
+            self._queue.put_nowait((None, None, False))
+        except queue.Full:
+            # The queued writes prune anyway
+            pass
+
+    def close(self, timeout=30):
+        """
+        Write the queued artifacts and stop the writer.
+
+        Args:
+            timeout: Seconds to wait for the queue to drain
+        """
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._worker.join(timeout)
+        if self.dropped:
+            self.log.warning(f"{self.dropped} artifacts dropped because the writer could not keep up")
+
+    def _submit(self, filename, data, compress=False):
+        path = self.directory / filename
+        try:
+            self._queue.put_nowait((path, data, compress))
+        except queue.Full:
+            self.dropped += 1
+            return None
+        return path
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            path, data, compress = item
+            try:
+                if path:
+                    self._write(path, data, compress)
+                self.prune()
+            except Exception as e:
+                self.log.warning(f"Could not write artifact {path}: {e}")
+
+    @staticmethod
+    def _write(path, data, compress):
+        if isinstance(data, str):
+            data = data.encode()
+        if compress:
+            data = gzip.compress(data, compresslevel=6)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def prune(self):
+        """Delete the oldest artifacts beyond the count and size limits."""
+        files = []
+        for path in self.directory.iterdir():
+            try:
+                if path.is_file() and not path.name.startswith("."):
+                    stat = path.stat()
+                    files.append((stat.st_mtime, stat.st_size, path))
+            except FileNotFoundError:
+                # Pruned by another worker in the meantime
+                continue
+
+        kept_files = kept_bytes = 0
+        for _, size, path in sorted(files, reverse=True):
+            kept_files += 1
+            kept_bytes += size
+            if (self.max_files and kept_files > self.max_files) or (self.max_bytes and kept_bytes > self.max_bytes):
+                path.unlink(missing_ok=True)
@@ -0,0 +1,145 @@
+"""
+Drives many search -> rank -> reserve flows concurrently on one event loop.
+
+Usage:
+    python -m utils.async_runner --scenarios config/test_data.json --concurrency 8
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+from config.config import BASE_URL, SCENARIOS_PATH, ASYNC_CONCURRENCY, SEARCH_MODE, RESULTS_STORE_PATH
+from pages.base_page import BasePage
+from pages.async_airbnb_search_page import AsyncAirbnbSearchPage
+from pages.async_airbnb_result_page import AsyncAirbnbResultPage
+from pages.async_airbnb_reservation_page import AsyncAirbnbReservationPage
+from utils.logging_utils import get_logger
+from utils.request_router import RequestRouter
+from utils.results_store import ResultsStore, new_run_id
+from utils.scenario_loader import iter_scenarios, scenario_id
+from utils.step_tracer import start_tracing, stop_tracing
+
+# Same "maximized" viewport as the pytest context fixture
+VIEWPORT = {"width": 2560, "height": 1440}
+
+log = get_logger("AsyncRunner")
+
+DEFAULT_TRACE_DIR = os.getenv("STEP_TRACE_DIR", "reports/traces")
+
+
+async def run_flow(browser, scenario, semaphore, trace_dir=None, store=None, run_id=None):
+    """
+    Run one search -> rank -> reserve flow in its own browser context.
+
+    Args:
+        browser: Async Playwright browser
+        scenario: Scenario dict (location, dates, guests, phone)
+        semaphore: Limits how many flows run at once
+        trace_dir: Directory for the flow's step spans (None = not written)
+        store: ResultsStore the passed flow is appended to (None = not stored)
+        run_id: Run id of the stored flow
+
+    Returns:
+        dict: Scenario id, status, duration and the flow's results or error
+    """
+    sid = scenario_id(scenario)
+    async with semaphore:
+        started = time.monotonic()
+        # Each flow runs in its own task, so it gets its own tracer
+        tracer, token = start_tracing(f"async_runner::{sid}")
+        context = await browser.new_context(viewport=VIEWPORT)
+        await RequestRouter.from_config().aattach(context)
+        try:
+            page = await context.new_page()
+
+            # Created before searching so search API responses are captured in network extraction mode
+            results = AsyncAirbnbResultPage(page)
+            guests = {"adults": scenario["adults"], "children": scenario["children"]}
+            search_page = AsyncAirbnbSearchPage(page)
+            if SEARCH_MODE == "ui":
+                await search_page.goto(BASE_URL)
+            await search_page.search(scenario["location"], scenario["checkin"], scenario["checkout"],
+                                     scenario["adults"], scenario["children"])
+            await search_page.validate_search(scenario["location"], scenario["checkin"], scenario["checkout"], guests)
+
+            best = await results.find_best_rated_cheapest_listing()
+            reservation = await AsyncAirbnbReservationPage(results.listing_page).reserve(scenario["phone"], scenario)
+            outcome = {"status": "passed", "best": best, "reservation": reservation}
+            if store:
+                await asyncio.to_thread(store.record_run, run_id, scenario, results.ranked_listings, best,
+                                        reservation, tracer.spans, test=f"async_runner::{sid}")
+        except Exception as e:
+            log.warning(f"Scenario {sid} failed: {e!r}")
+            outcome = {"status": "failed", "error": repr(e)}
+        finally:
+            log.info(f"Scenario {sid} done", extra={"duration_ms": round((time.monotonic() - started) * 1000)})
+            await context.close()
+            stop_tracing(token)
+            BasePage.timing_profile.record_spans(tracer.spans)
+            if trace_dir:
+                tracer.write(trace_dir)
+
+    return {"scenario": sid, "duration": round(time.monotonic() - started, 2), **outcome}
+
+
+async def run_flows(scenarios, concurrency=ASYNC_CONCURRENCY, headless=True, trace_dir=None, store=None):
+    """
+    Run flows for all scenarios, at most `concurrency` at a time, in one browser.
+
+    Args:
+        scenarios: Iterable of scenario dicts
+        concurrency: Maximum number of flows in flight
+        headless: Whether to run the browser headless
+        trace_dir: Directory for per-flow step spans (None = not written)
+        store: ResultsStore the passed flows are appended to, under one run id (None = not stored)
+
+    Returns:
+        list: One result dict per scenario, in scenario order
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    run_id = new_run_id()
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=headless)
+        try:
+            return await asyncio.gather(*(run_flow(browser, scenario, semaphore, trace_dir, store, run_id)
+                                          for scenario in scenarios))
+        finally:
+            await browser.close()
+            BasePage.timing_profile.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Airbnb search/reserve flows concurrently")
+    parser.add_argument("--scenarios", default=SCENARIOS_PATH, help="Scenario file (.json, .jsonl or .csv)")
+    parser.add_argument("--concurrency", type=int, default=ASYNC_CONCURRENCY, help="Flows in flight at once")
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    parser.add_argument("--trace-dir", default=DEFAULT_TRACE_DIR,
+                        help="Directory for per-flow step spans (STEP_TRACE_DIR)")
+    parser.add_argument("--output", default="temp/async_runs.jsonl", help="JSON lines file for the results")
+    parser.add_argument("--results-store", default=RESULTS_STORE_PATH,
+                        help="Run history the passed flows are appended to, '' = none (RESULTS_STORE_PATH)")
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    store = ResultsStore(args.results_store) if args.results_store else None
+    results = asyncio.run(run_flows(iter_scenarios(args.scenarios), args.concurrency, not args.headed,
+                                    args.trace_dir, store))
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        for result in results:
+            f.write(json.dumps(result) + "\n")
+
+    passed = sum(result["status"] == "passed" for result in results)
+    log.info(f"{passed}/{len(results)} flows passed in {time.monotonic() - started:.1f}s, results in {output}")
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,304 @@
+"""
+Long-lived Chromium that pytest sessions attach to over CDP instead of launching their own.
+
+The daemon keeps one browser running with a remote debugging port and hands out
+leases through a small HTTP control API:
+
+    GET    /health                  200 if the browser answers on CDP, 503 otherwise
+    POST   /lease?contexts=N        lease for a session needing N contexts (429 when full)
+    DELETE /lease/<id>              return a lease
+
+At most `max_contexts` contexts are leased out at once. After `max_sessions` leases
+the browser is restarted as soon as the running sessions are done, which bounds
+its memory growth; a browser that stops answering is restarted right away.
+
+Usage:
+    python -m utils.browser_daemon --host 0.0.0.0 --cdp-port 9222 --control-port 9223
+"""
+import argparse
+import itertools
+import json
+import signal
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from playwright.sync_api import sync_playwright
+
+from config.config import BROWSER_DAEMON_MAX_SESSIONS, BROWSER_DAEMON_MAX_CONTEXTS
+from utils.logging_utils import get_logger
+
+log = get_logger("BrowserDaemon")
+
+
+class BrowserDaemon:
+    """
+    Owns the shared browser and the lease bookkeeping.
+
+    Playwright is only used from the thread running `run`; the control API threads
+    only update the bookkeeping and wake that thread up.
+    """
+
+    def __init__(self, cdp_port=9222, max_sessions=BROWSER_DAEMON_MAX_SESSIONS,
+                 max_contexts=BROWSER_DAEMON_MAX_CONTEXTS, headless=True, health_interval_sec=10):
+        """
+        Initialize the daemon.
+
+        Args:
+            cdp_port: Remote debugging port of the browser
+            max_sessions: Leases handed out before the browser is restarted (0 = never)
+            max_contexts: Contexts leased out at once
+            headless: Whether to run the browser headless
+            health_interval_sec: Seconds between health checks
+        """
+        self.cdp_port = cdp_port
+        self.max_sessions = max_sessions
+        self.max_contexts = max_contexts
+        self.headless = headless
+        self.health_interval_sec = health_interval_sec
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._lease_ids = itertools.count(1)
+        self._leases = {}
+        self._sessions = 0
+        self._restarts = 0
+        self._ready = False
+        self._restart_pending = False
+
+    # --- Leases (called from the control API threads) ---
+
+    def lease(self, contexts=1):
+        """
+        Lease the browser to a session.
+
+        Args:
+            contexts: Number of contexts the session creates at most at once
+
+        Returns:
+            dict: {'lease', 'cdp_port'}, or None while the browser is full or restarting
+        """
+        with self._lock:
+            if not self._ready or self._restart_pending:
+                return None
+            if sum(self._leases.values()) + contexts > self.max_contexts:
+                return None
+
+            lease_id = str(next(self._lease_ids))
+            self._leases[lease_id] = contexts
+            self._sessions += 1
+            if self.max_sessions and self._sessions >= self.max_sessions:
+                # No new leases; restart once the running sessions are done
+                self._restart_pending = True
+            return {"lease": lease_id, "cdp_port": self.cdp_port}
+
+    def release(self, lease_id):
+        """Return a lease; triggers a pending restart once no lease is left."""
+        with self._lock:
+            self._leases.pop(lease_id, None)
+            if self._restart_pending and not self._leases:
+                self._wake.set()
+
+    def status(self):
+        """Snapshot of the daemon state."""
+        alive = self._cdp_alive()
+        with self._lock:
+            return {
+                "healthy": self._ready and alive,
+                "leases": len(self._leases),
+                "contexts": sum(self._leases.values()),
+                "max_contexts": self.max_contexts,
+                "sessions_since_restart": self._sessions,
+                "restarts": self._restarts,
+                "restart_pending": self._restart_pending,
+            }
+
+    def _cdp_alive(self):
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{self.cdp_port}/json/version", timeout=2) as response:
+                return response.status == 200
+        except (urllib.error.URLError, OSError):
+            return False
+
+    # --- Browser lifecycle (thread running `run` only) ---
+
+    def run(self, host="127.0.0.1", control_port=9223):
+        """
+        Launch the browser and serve the control API until stopped (blocking).
+
+        Args:
+            host: Interface of the control API and the debugging port
+            control_port: Port of the control API
+        """
+        server = ThreadingHTTPServer((host, control_port), _control_handler(self))
+        threading.Thread(target=server.serve_forever, name="browser-daemon-control", daemon=True).start()
+        log.info(f"Control API on http://{host}:{control_port}, CDP on port {self.cdp_port}")
+
+        with sync_playwright() as playwright:
+            browser = self._launch(playwright, host)
+            try:
+                while not self._stopped.is_set():
+                    self._wake.wait(self.health_interval_sec)
+                    self._wake.clear()
+
+                    with self._lock:
+                        drained = self._restart_pending and not self._leases
+                    if drained or not browser.is_connected() or not self._cdp_alive():
+                        reason = "session limit reached" if drained else "browser not answering"
+                        log.info(f"Restarting browser ({reason})")
+                        browser = self._restart(playwright, browser, host)
+            finally:
+                self._close(browser)
+                server.shutdown()
+
+    def stop(self):
+        """Stop the daemon; `run` returns after closing the browser."""
+        self._stopped.set()
+        self._wake.set()
+
+    def _launch(self, playwright, host):
+        browser = playwright.chromium.launch(headless=self.headless, args=[
+            f"--remote-debugging-port={self.cdp_port}",
+            f"--remote-debugging-address={host}",
+        ])
+        with self._lock:
+            self._ready = True
+            self._restart_pending = False
+            self._sessions = 0
+        return browser
+
+    def _restart(self, playwright, browser, host):
+        with self._lock:
+            self._ready = False
+            # Sessions of a crashed browser are gone; their leases are void
+            self._leases.clear()
+            self._restarts += 1
+        self._close(browser)
+        return self._launch(playwright, host)
+
+    @staticmethod
+    def _close(browser):
+        try:
+            browser.close()
+        except Exception:
+            pass
+
+
+def _control_handler(daemon):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if urlparse(self.path).path != "/health":
+                return self._reply(404, {"error": "not found"})
+            status = daemon.status()
+            self._reply(200 if status["healthy"] else 503, status)
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            if url.path != "/lease":
+                return self._reply(404, {"error": "not found"})
+            contexts = int(parse_qs(url.query).get("contexts", ["1"])[0])
+            lease = daemon.lease(contexts)
+            if lease is None:
+                return self._reply(429, {"error": "browser full or restarting", **daemon.status()})
+            self._reply(200, lease)
+
+        def do_DELETE(self):
+            parts = urlparse(self.path).path.strip("/").split("/")
+            if len(parts) != 2 or parts[0] != "lease":
+                return self._reply(404, {"error": "not found"})
+            daemon.release(parts[1])
+            self._reply(200, {"released": parts[1]})
+
+        def _reply(self, code, body):
+            payload = json.dumps(body).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class BrowserDaemonClient:
+    """Leases the daemon's browser for a test session."""
+
+    def __init__(self, url):
+        """
+        Initialize the client.
+
+        Args:
+            url: Control API URL of the daemon (e.g. http://browser:9223)
+        """
+        self.url = url.rstrip("/")
+
+    def lease(self, contexts=1, wait_sec=30):
+        """
+        Lease the browser, waiting while it is full or restarting.
+
+        Args:
+            contexts: Number of contexts the session creates at most at once
+            wait_sec: How long to wait for a free slot
+
+        Returns:
+            dict: Lease with its 'cdp_url', or None if the daemon is unreachable or stays full
+        """
+        deadline = time.monotonic() + wait_sec
+        while True:
+            try:
+                request = urllib.request.Request(f"{self.url}/lease?contexts={contexts}", method="POST")
+                with urllib.request.urlopen(request, timeout=5) as response:
+                    lease = json.load(response)
+                break
+            except urllib.error.HTTPError as e:
+                if e.code != 429 or time.monotonic() > deadline:
+                    log.warning(f"Browser daemon refused a lease: {e.code}")
+                    return None
+                time.sleep(0.5)
+            except (urllib.error.URLError, OSError) as e:
+                log.warning(f"Browser daemon unreachable at {self.url}: {e}")
+                return None
+
+        # Chromium only accepts CDP connections addressed by IP or localhost
+        host = socket.gethostbyname(urlparse(self.url).hostname)
+        return {**lease, "cdp_url": f"http://{host}:{lease['cdp_port']}"}
+
+    def release(self, lease):
+        """Return a lease (errors are ignored: a restarted daemon has forgotten it anyway)."""
+        try:
+            request = urllib.request.Request(f"{self.url}/lease/{lease['lease']}", method="DELETE")
+            urllib.request.urlopen(request, timeout=5).close()
+        except (urllib.error.URLError, OSError):
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a shared Chromium for pytest sessions to attach to over CDP")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface of the control API and the CDP port")
+    parser.add_argument("--cdp-port", type=int, default=9222, help="Remote debugging port of the browser")
+    parser.add_argument("--control-port", type=int, default=9223, help="Port of the control API")
+    parser.add_argument("--max-sessions", type=int, default=BROWSER_DAEMON_MAX_SESSIONS,
+                        help="Sessions before the browser is restarted (0 = never)")
+    parser.add_argument("--max-contexts", type=int, default=BROWSER_DAEMON_MAX_CONTEXTS,
+                        help="Contexts leased out at once")
+    parser.add_argument("--headed", action="store_true", help="Show the browser")
+    args = parser.parse_args()
+
+    daemon = BrowserDaemon(args.cdp_port, args.max_sessions, args.max_contexts, not args.headed)
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+    try:
+        daemon.run(args.host, args.control_port)
+    except KeyboardInterrupt:
+        daemon.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+ContextPool: Warm browser contexts reused across the tests of one worker.
+"""
+import json
+import os
+from collections import deque
+from pathlib import Path
+
+from utils.logging_utils import get_logger
+
+# Restores an origin's localStorage to the snapshot and deletes its IndexedDB databases
+_RESET_STORAGE_SCRIPT = """
+async (items) => {
+    localStorage.clear();
+    sessionStorage.clear();
+    for (const {name, value} of items) localStorage.setItem(name, value);
+    const databases = indexedDB.databases ? await indexedDB.databases() : [];
+    await Promise.all(databases.map(({name}) => new Promise((resolve) => {
+        const request = indexedDB.deleteDatabase(name);
+        request.onsuccess = request.onerror = request.onblocked = resolve;
+    })));
+}
+"""
+
+# Blank document served for an origin while its storage is reset, so no request leaves the browser
+_BLANK_PAGE = "<!doctype html><title>reset</title>"
+
+
+class ContextPool:
+    """
+    Bounded pool of browser contexts that keep their cache and cookies warm between tests.
+
+    A context is snapshotted when it is created, before any test uses it: from the
+    storage_state file if there is one, otherwise after `warm_up` has prepared it
+    (consent, locale, ...), and only that warmed state is saved to the file. Between
+    tests it is reset cheaply to the snapshot: its pages are closed, its cookies are
+    restored, and every origin whose storage changed gets its localStorage restored
+    and its IndexedDB deleted. sessionStorage lives and dies with the closed pages.
+    What a pooled test can still observe from earlier tests is the HTTP and service
+    worker caches; mark a test isolated_context for a fresh context.
+    """
+
+    def __init__(self, factory, size, storage_state_path=None, warm_up=None):
+        """
+        Initialize the pool.
+
+        Args:
+            factory: Callable taking a storage_state path (or None) and returning a new context
+            size: Maximum number of idle contexts kept; 0 disables pooling
+            storage_state_path: File the warm storage state is loaded from, and saved to after a warm-up
+            warm_up: Callable preparing a context created without storage state (None = none)
+        """
+        self.size = size
+        self.storage_state_path = Path(storage_state_path) if storage_state_path else None
+        self.warm_up = warm_up
+        self.log = get_logger(self.__class__.__name__)
+        self._factory = factory
+        self._idle = deque()
+        self._snapshots = {}
+
+    @property
+    def enabled(self):
+        """Whether contexts are pooled at all."""
+        return self.size > 0
+
+    def acquire(self):
+        """
+        Return a warm idle context, or a new one if none is idle.
+
+        Returns:
+            Playwright browser context
+        """
+        if self._idle:
+            return self._idle.popleft()
+
+        storage_state = self.storage_state_path if self.storage_state_path and self.storage_state_path.exists() else None
+        self.log.info(f"Creating pooled context (storage state: {storage_state or 'none'})")
+        context = self._factory(str(storage_state) if storage_state else None)
+
+        warmed = False
+        if storage_state is None and self.warm_up:
+            try:
+                self.warm_up(context)
+                warmed = True
+            except Exception as e:
+                self.log.warning(f"Could not warm up pooled context, starting it cold: {e}")
+            for page in list(context.pages):
+                page.close()
+
+        # Every test on this context starts from its state before the first test
+        self._snapshots[context] = context.storage_state()
+        if warmed and self.storage_state_path:
+            self._save_storage_state(self._snapshots[context])
+        return context
+
+    def release(self, context):
+        """
+        Reset a context and return it to the pool, or close it if the pool is full.
+
+        Args:
+            context: Context previously returned by acquire()
+        """
+        try:
+            self._reset(context)
+        except Exception as e:
+            self.log.warning(f"Could not reset pooled context, closing it: {e}")
+            self._close(context)
+            return
+
+        if len(self._idle) < self.size:
+            self._idle.append(context)
+        else:
+            self._close(context)
+
+    def close(self):
+        """Close every idle context."""
+        while self._idle:
+            self._close(self._idle.popleft())
+
+    def _reset(self, context):
+        for page in list(context.pages):
+            page.close()
+
+        snapshot = self._snapshots[context]
+        context.clear_cookies()
+        context.add_cookies(snapshot["cookies"])
+        self._reset_storage(context, snapshot)
+
+    def _reset_storage(self, context, snapshot):
+        """Restore localStorage and drop IndexedDB on every origin that differs from the snapshot."""
+        warm = {origin["origin"]: origin["localStorage"] for origin in snapshot.get("origins", [])}
+        current = {origin["origin"]: origin for origin in context.storage_state(indexed_db=True)["origins"]}
+        changed = [origin for origin in sorted(set(warm) | set(current))
+                   if origin not in current or current[origin].get("indexedDB")
+                   or _by_name(current[origin].get("localStorage", [])) != _by_name(warm.get(origin, []))]
+        if not changed:
+            return
+
+        page = context.new_page()
+        try:
+            page.route("**/*", lambda route: route.fulfill(status=200, content_type="text/html", body=_BLANK_PAGE))
+            for origin in changed:
+                page.goto(origin)
+                page.evaluate(_RESET_STORAGE_SCRIPT, warm.get(origin, []))
+        finally:
+            page.close()
+
+    def _close(self, context):
+        self._snapshots.pop(context, None)
+        context.close()
+
+    def _save_storage_state(self, snapshot):
+        # Written atomically, parallel workers may save at the same time
+        self.storage_state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.storage_state_path.with_name(f"{self.storage_state_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.storage_state_path)
+
+
+def _by_name(items):
+    return sorted((item["name"], item["value"]) for item in items)
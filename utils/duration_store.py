@@ -0,0 +1,72 @@
+"""
+DurationStore: Historical durations (in seconds) per key, persisted across runs.
+"""
+import fcntl
+import json
+import os
+from pathlib import Path
+
+
+class DurationStore:
+    """
+    Small JSON store of smoothed durations per key (scenario id, test node id, ...).
+
+    Each new observation is blended into the stored value (exponentially weighted),
+    so a single slow run does not dominate. Saving merges with what other workers
+    wrote in the meantime.
+    """
+
+    def __init__(self, path, smoothing=0.5):
+        """
+        Initialize the store and load the existing history.
+
+        Args:
+            path: JSON file holding {key: seconds}
+            smoothing: Weight of a new observation (1 keeps only the latest)
+        """
+        self.path = Path(path)
+        self.smoothing = smoothing
+        self._durations = self._load()
+        self._updates = {}
+
+    def get(self, key, default=None):
+        """Return the historical duration of a key, or default if unknown."""
+        return self._durations.get(key, default)
+
+    def known(self):
+        """Return a copy of all known durations."""
+        return dict(self._durations)
+
+    def record(self, key, seconds):
+        """
+        Blend a new observed duration into the history of a key.
+
+        Args:
+            key: Scenario id, test node id, ...
+            seconds: Observed duration
+        """
+        previous = self._durations.get(key)
+        value = seconds if previous is None else previous + self.smoothing * (seconds - previous)
+        self._durations[key] = value
+        self._updates[key] = value
+
+    def save(self):
+        """Write the recorded durations, merged with the current file contents."""
+        if not self._updates:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(self.path.name + ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            merged = {**self._load(), **self._updates}
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(merged, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        self._updates = {}
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
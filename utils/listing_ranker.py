@@ -0,0 +1,98 @@
+"""
+ListingRanker: Streaming top-k selection of listings under a scoring policy.
+"""
+import heapq
+import itertools
+
+from config.config import TOP_K_LISTINGS, RANKING_POLICY, MIN_REVIEWS
+
+
+def rating_then_price(listing):
+    """Highest rating first, then lowest price."""
+    return listing["rating"], -listing["price"]
+
+
+def weighted_score(listing, rating_weight=1.0, price_weight=0.01):
+    """Single weighted score: every rating point is worth 1 / price_weight of nightly price."""
+    return rating_weight * listing["rating"] - price_weight * listing["price"]
+
+
+SCORING_POLICIES = {
+    "rating_price": rating_then_price,
+    "weighted": weighted_score,
+}
+
+
+class ListingRanker:
+    """
+    Keeps only the best `top_k` listings seen so far in a bounded min-heap.
+
+    Listings are added one at a time as they are extracted, so memory stays at
+    O(top_k) no matter how many result pages are scanned.
+    """
+
+    def __init__(self, top_k=TOP_K_LISTINGS, policy=RANKING_POLICY, min_reviews=MIN_REVIEWS):
+        """
+        Initialize the ranker.
+
+        Args:
+            top_k: Number of listings to keep
+            policy: Name from SCORING_POLICIES, or a callable returning a sortable
+                score for a listing (higher is better)
+            min_reviews: Listings with fewer reviews are discarded
+        """
+        if top_k < 1:
+            raise ValueError(f"top_k must be at least 1, got {top_k}")
+        if isinstance(policy, str):
+            if policy not in SCORING_POLICIES:
+                raise ValueError(f"Unknown ranking policy '{policy}', expected one of {sorted(SCORING_POLICIES)}")
+            policy = SCORING_POLICIES[policy]
+
+        self.top_k = top_k
+        self.policy = policy
+        self.min_reviews = min_reviews
+        self.seen = 0
+        self._heap = []
+        self._order = itertools.count()
+
+    def add(self, listing):
+        """
+        Offer a listing to the ranking.
+
+        Args:
+            listing: Dict with at least 'rating', 'price' and 'reviews'
+
+        Returns:
+            bool: True if the listing is currently in the top-k
+        """
+        self.seen += 1
+        if listing.get("reviews", 0) < self.min_reviews:
+            return False
+
+        # Earlier listings win ties, so the sequence number is negated
+        entry = (self.policy(listing), -next(self._order), listing)
+        if len(self._heap) < self.top_k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def extend(self, listings):
+        """Offer several listings in order."""
+        for listing in listings:
+            self.add(listing)
+
+    def ranked(self):
+        """
+        Return the kept listings, best first, with their 'rank' set (1 = best).
+
+        Returns:
+            list: Up to top_k listing dicts
+        """
+        entries = sorted(self._heap, key=lambda entry: entry[:2], reverse=True)
+        ranked = []
+        for rank, (_, _, listing) in enumerate(entries, start=1):
+            ranked.append({**listing, "rank": rank})
+        return ranked
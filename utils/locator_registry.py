@@ -0,0 +1,180 @@
+"""
+LocatorRegistry: Self-healing element lookup through ordered fallback strategies.
+"""
+import fcntl
+import json
+import os
+from pathlib import Path
+
+from config.config import LOCATOR_CACHE_PATH, WAIT_AFTER_ACTION_MS
+from utils.logging_utils import get_logger
+
+# Strategy kinds, in the order a chain should list them (most to least stable)
+STRATEGIES = ("testid", "role", "text", "css")
+
+# Finds the first candidate with a visible match; one round trip that polls in the page.
+# Role names are matched like Playwright's default: case-insensitive substring.
+_PROBE_SCRIPT = """
+(candidates) => {
+    const ROLES = {
+        button: 'button, [role="button"], input[type="button"], input[type="submit"]',
+        link: 'a[href], [role="link"]',
+        textbox: 'input:not([type]), input[type="text"], input[type="search"], input[type="tel"], textarea,'
+            + ' [role="textbox"], [role="combobox"]',
+    };
+    const visible = (el) => {
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0 && getComputedStyle(el).visibility !== "hidden";
+    };
+    const nameOf = (el) => (el.getAttribute("aria-label") || el.innerText || el.value || "").trim().toLowerCase();
+    const byText = (text) => {
+        const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+        const found = [];
+        while (walker.nextNode()) {
+            if (walker.currentNode.textContent.toLowerCase().includes(text)) found.push(walker.currentNode.parentElement);
+        }
+        return found;
+    };
+    const find = (c) => {
+        try {
+            if (c.testid) return document.querySelectorAll(`[data-testid="${CSS.escape(c.testid)}"]`);
+            if (c.role) return [...document.querySelectorAll(ROLES[c.role] || `[role="${c.role}"]`)]
+                .filter(el => !c.name || nameOf(el).includes(c.name.toLowerCase()));
+            if (c.text) return byText(c.text.toLowerCase());
+            if (c.css) return document.querySelectorAll(c.css);
+        } catch (e) {}
+        return [];
+    };
+    for (let i = 0; i < candidates.length; i++) {
+        if ([...find(candidates[i])].some(visible)) return {index: i};
+    }
+    return null;
+}
+"""
+
+
+class LocatorChain:
+    """
+    One logical element and its ordered fallback strategies.
+
+    Each strategy is a dict with one of: {'testid': ...}, {'role': ..., 'name': ...},
+    {'text': ...} or {'css': ...}.
+    """
+
+    def __init__(self, name, *strategies):
+        """
+        Initialize the chain.
+
+        Args:
+            name: Unique name of the element (e.g. 'search.checkin'), key of the cache
+            *strategies: Strategies in fallback order
+        """
+        if not strategies:
+            raise ValueError(f"Locator '{name}' needs at least one strategy")
+        for strategy in strategies:
+            if not any(kind in strategy for kind in STRATEGIES):
+                raise ValueError(f"Locator '{name}' has an unknown strategy {strategy}, expected one of {STRATEGIES}")
+        self.name = name
+        self.strategies = list(strategies)
+
+    @staticmethod
+    def selector(strategy):
+        """Playwright selector equivalent to a strategy."""
+        if "testid" in strategy:
+            return f'[data-testid="{strategy["testid"]}"]'
+        if "role" in strategy:
+            name = f'[name={json.dumps(strategy["name"])}]' if strategy.get("name") else ""
+            return f'role={strategy["role"]}{name}'
+        if "text" in strategy:
+            return f'text={strategy["text"]}'
+        return strategy["css"]
+
+    @property
+    def primary(self):
+        """Selector of the first strategy."""
+        return self.selector(self.strategies[0])
+
+    def __repr__(self):
+        return f"LocatorChain({self.name!r})"
+
+
+class LocatorRegistry:
+    """
+    Resolves locator chains to the selector that currently matches, probing all
+    strategies in one round trip.
+
+    The winning strategy of every element is cached on disk, so later runs try it
+    first; a change of winner is logged, since it means a selector has drifted.
+    """
+
+    def __init__(self, cache_path=LOCATOR_CACHE_PATH):
+        """
+        Initialize the registry and load the cached winners.
+
+        Args:
+            cache_path: JSON file holding {element name: winning selector}
+        """
+        self.cache_path = Path(cache_path)
+        self.log = get_logger("LocatorRegistry")
+        self._winners = self._load()
+
+    def ordered(self, chain):
+        """Strategies of a chain, the cached winner first."""
+        winner = self._winners.get(chain.name)
+        return sorted(chain.strategies, key=lambda strategy: chain.selector(strategy) != winner)
+
+    def resolve(self, page, chain, timeout=WAIT_AFTER_ACTION_MS):
+        """
+        Wait until a strategy of the chain matches a visible element (sync API).
+
+        Args:
+            page: Playwright page
+            chain: LocatorChain of the element
+            timeout: Maximum time to wait (in ms)
+
+        Returns:
+            str: Playwright selector of the first matching strategy
+
+        Raises:
+            TimeoutError: If no strategy matched in time (Playwright's, so it is retryable)
+        """
+        strategies = self.ordered(chain)
+        handle = page.wait_for_function(_PROBE_SCRIPT, arg=strategies, timeout=timeout, polling=100)
+        return self._record(chain, strategies[handle.json_value()["index"]])
+
+    async def aresolve(self, page, chain, timeout=WAIT_AFTER_ACTION_MS):
+        """Same as resolve, for the async API."""
+        strategies = self.ordered(chain)
+        handle = await page.wait_for_function(_PROBE_SCRIPT, arg=strategies, timeout=timeout, polling=100)
+        return self._record(chain, strategies[(await handle.json_value())["index"]])
+
+    def _record(self, chain, strategy):
+        selector = chain.selector(strategy)
+        if self._winners.get(chain.name) != selector:
+            if strategy is not chain.strategies[0]:
+                self.log.warning(f"Locator {chain.name}: preferred strategy did not match, healed with {selector}")
+            self._winners[chain.name] = selector
+            self._save(chain.name, selector)
+        return selector
+
+    def _save(self, name, selector):
+        """Write one winner, merged with what other workers cached in the meantime."""
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path.with_name(self.cache_path.name + ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            merged = {**self._load(), name: selector}
+            tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(merged, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.cache_path)
+
+    def _load(self):
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+
+# Registry of all page objects
+DEFAULT_LOCATOR_REGISTRY = LocatorRegistry()
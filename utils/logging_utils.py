@@ -1,11 +1,201 @@
+"""
+Logging: Records go through a bounded queue to one background writer, as JSON lines.
+
+Every record is tagged on the calling thread with the test (or async flow) it belongs
+to, the xdist worker and the page-object step running at the time; formatting and
+I/O happen in the writer thread. Noisy messages are sampled by passing
+`extra={"sample": "<kind>"}`: per test and kind the first LOG_SAMPLE_BURST are kept,
+then one in LOG_SAMPLE_EVERY.
+"""
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+
+from config.config import (LOG_LEVEL, LOG_FORMAT, LOG_PATH, LOG_QUEUE_SIZE, LOG_SAMPLE_BURST, LOG_SAMPLE_EVERY)
+from utils.step_tracer import current_tracer
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "test", "worker", "step"}
+
+_lock = threading.Lock()
+_handler = None
+_listener = None
+
+
+def worker_id():
+    """Id of the xdist worker running this process ('main' without xdist)."""
+    return os.getenv("PYTEST_XDIST_WORKER", "main")
+
+
+class ContextFilter(logging.Filter):
+    """Tags records with the running test, worker and step (on the calling thread)."""
+
+    def filter(self, record):
+        tracer = current_tracer()
+        record.test = tracer.test_id
+        record.worker = worker_id()
+        record.step = tracer.current_step
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps the first `burst` records per test and sample kind, then one in `every`."""
+
+    def __init__(self, burst=LOG_SAMPLE_BURST, every=LOG_SAMPLE_EVERY):
+        """
+        Initialize the filter.
+
+        Args:
+            burst: Records of a kind always kept per test
+            every: Keep one in this many of the remaining records (0 = drop them all)
+        """
+        super().__init__()
+        self.burst = burst
+        self.every = every
+        self._counts = {}
+
+    def filter(self, record):
+        kind = getattr(record, "sample", None)
+        if kind is None:
+            return True
+        key = (getattr(record, "test", None), record.name, kind)
+        count = self._counts[key] = self._counts.get(key, 0) + 1
+        if count <= self.burst:
+            return True
+        if self.every and (count - self.burst) % self.every == 0:
+            # Stands for the records dropped since the last one kept
+            record.sampled = self.every
+            return True
+        return False
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: time, level, logger, message, context and `extra` fields."""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "test": getattr(record, "test", None),
+            "worker": getattr(record, "worker", None),
+            "step": getattr(record, "step", None),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the writer falls behind."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        # Formatting is left to the writer; only the message is resolved here. A copy, since
+        # the record also propagates to the root handlers (pytest's log capture)
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _output_handler(path, fmt):
+    if path:
+        path = Path(path.format(worker=worker_id()))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handler = logging.FileHandler(path, encoding="utf-8")
+    else:
+        handler = logging.StreamHandler(sys.stderr)
+    if fmt == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('[%(asctime)s] %(levelname)s - %(name)s [%(test)s]: %(message)s'))
+    return handler
+
+
+def configure_logging(path=LOG_PATH, fmt=LOG_FORMAT, queue_size=LOG_QUEUE_SIZE):
+    """
+    Start (or restart with new settings) the background log writer.
+
+    Args:
+        path: Log file, '{worker}' is replaced by the xdist worker id (empty = stderr)
+        fmt: 'json' or 'text'
+        queue_size: Records waiting for the writer before new ones are dropped
+    """
+    global _handler, _listener
+    if fmt not in ("json", "text"):
+        raise ValueError(f"Unknown log format '{fmt}', expected 'json' or 'text'")
+
+    with _lock:
+        handler = _DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        listener = QueueListener(handler.queue, _output_handler(path, fmt), respect_handler_level=True)
+        listener.start()
+
+        previous, previous_listener = _handler, _listener
+        _handler, _listener = handler, listener
+        if previous:
+            for logger in logging.Logger.manager.loggerDict.values():
+                if isinstance(logger, logging.Logger) and previous in logger.handlers:
+                    logger.removeHandler(previous)
+                    logger.addHandler(handler)
+    if previous_listener:
+        _stop(previous, previous_listener)
+
+
+def shutdown_logging():
+    """Write the queued records and stop the writer."""
+    with _lock:
+        handler, listener = _handler, _listener
+    if listener:
+        _stop(handler, listener)
+
+
+def _stop(handler, listener):
+    if listener._thread is None:
+        # Already stopped
+        return
+    listener.stop()
+    for output in listener.handlers:
+        output.close()
+    if handler.dropped:
+        sys.stderr.write(f"{handler.dropped} log records dropped because the writer could not keep up\n")
+
+
+atexit.register(shutdown_logging)
+
+# Logger filters, so pytest's log capture gets the same context and sampling
+_context_filter = ContextFilter()
+_sampling_filter = SamplingFilter()
+
 
 def get_logger(name):
     logger = logging.getLogger(name)
     if not logger.handlers:
-        logger.setLevel(logging.INFO)
-        handler = logging.StreamHandler()
-        formatter = logging.Formatter('[%(asctime)s] %(levelname)s - %(name)s: %(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+        if _handler is None:
+            configure_logging()
+        logger.setLevel(LOG_LEVEL)
+        logger.addFilter(_context_filter)
+        logger.addFilter(_sampling_filter)
+        logger.addHandler(_handler)
     return logger
@@ -0,0 +1,152 @@
+"""
+OverlayRegistry: Known interrupting overlays, dismissed in the background whenever they appear.
+"""
+import re
+import weakref
+
+from config.config import OVERLAYS
+from utils.logging_utils import get_logger
+
+# Time allowed per dismiss button (in ms); the overlay is on screen, so its button is too
+DISMISS_TIMEOUT_MS = 2000
+
+
+class Overlay:
+    """An overlay that can cover the page, and how to get rid of it."""
+
+    def __init__(self, name, trigger, dismiss=(), key="Escape", skip_url=None):
+        """
+        Initialize the overlay.
+
+        Args:
+            name: Name of the overlay (e.g. 'translation'), used in OVERLAYS and the logs
+            trigger: Selector that is visible while the overlay is shown
+            dismiss: Selectors of buttons closing it, tried in order
+            key: Key pressed when no dismiss button worked (None = none)
+            skip_url: Regex of page URLs where the same dialog is part of the flow and is left open
+        """
+        self.name = name
+        self.trigger = trigger
+        self.dismiss = tuple(dismiss)
+        self.key = key
+        self.skip_url = re.compile(skip_url) if skip_url else None
+
+    def __repr__(self):
+        return f"Overlay({self.name!r})"
+
+
+# Overlays of the site. The login nudge is the same modal the checkout opens for the phone number, and
+# it mounts before its input renders, so only the page (checkout under /book/) tells the two apart.
+KNOWN_OVERLAYS = (
+    Overlay("translation",
+            '[role="dialog"]:has-text("Translation on")',
+            dismiss=('[role="dialog"]:has-text("Translation on") button[aria-label="Close"]',
+                     'div > div > section > div > div > div:nth-child(2)> div > div > button')),
+    Overlay("cookie_consent",
+            '[data-testid="main-cookies-banner-container"]',
+            dismiss=('[data-testid="main-cookies-banner-container"] button:has-text("Accept all")',
+                     '[data-testid="main-cookies-banner-container"] button:has-text("OK")'),
+            key=None),
+    Overlay("login_nudge",
+            '[role="dialog"]:has-text("Log in or sign up")',
+            dismiss=('[role="dialog"]:has-text("Log in or sign up") button[aria-label="Close"]',),
+            skip_url=r"/book/"),
+)
+
+
+class OverlayRegistry:
+    """
+    Installs Playwright locator handlers for known overlays on a page.
+
+    Before every actionability check Playwright looks for the registered overlays and
+    runs their handler when one is visible, so page objects never wait for (or on) an
+    overlay that may not exist. Each page is set up once, however many page objects
+    are created for it.
+    """
+
+    def __init__(self, overlays=KNOWN_OVERLAYS, timeout=DISMISS_TIMEOUT_MS):
+        """
+        Initialize the registry.
+
+        Args:
+            overlays: Overlays to dismiss
+            timeout: Time allowed per dismiss button (in ms)
+        """
+        self.overlays = list(overlays)
+        self.timeout = timeout
+        self.dismissed = {}
+        self.log = get_logger("OverlayRegistry")
+        self._installed = weakref.WeakSet()
+
+    @classmethod
+    def from_config(cls, names=OVERLAYS):
+        """
+        Registry of the known overlays named in OVERLAYS.
+
+        Args:
+            names: Comma-separated overlay names ('' = none)
+
+        Returns:
+            OverlayRegistry: Registry with the selected overlays
+        """
+        known = {overlay.name: overlay for overlay in KNOWN_OVERLAYS}
+        selected = [name.strip() for name in names.split(",") if name.strip()]
+        unknown = [name for name in selected if name not in known]
+        if unknown:
+            raise ValueError(f"Unknown overlays {unknown}, expected some of {list(known)}")
+        return cls([known[name] for name in selected])
+
+    def install(self, page):
+        """Register the overlay handlers on a page (sync API); no-op if already done."""
+        if page in self._installed:
+            return
+        self._installed.add(page)
+        for overlay in self.overlays:
+            # An overlay that may be left open must not make the action wait for it to close
+            page.add_locator_handler(page.locator(overlay.trigger).first,
+                                     lambda trigger, overlay=overlay: self._dismiss(page, overlay),
+                                     no_wait_after=overlay.skip_url is not None)
+
+    async def ainstall(self, page):
+        """Same as install, for the async API."""
+        if page in self._installed:
+            return
+        self._installed.add(page)
+        for overlay in self.overlays:
+            await page.add_locator_handler(page.locator(overlay.trigger).first,
+                                           lambda trigger, overlay=overlay: self._adismiss(page, overlay),
+                                           no_wait_after=overlay.skip_url is not None)
+
+    def _dismiss(self, page, overlay):
+        if overlay.skip_url and overlay.skip_url.search(page.url):
+            return
+        for selector in overlay.dismiss:
+            try:
+                page.locator(selector).first.click(timeout=self.timeout)
+                return self._record(overlay)
+            except Exception:
+                continue
+        if overlay.key:
+            page.keyboard.press(overlay.key)
+            self._record(overlay)
+
+    async def _adismiss(self, page, overlay):
+        if overlay.skip_url and overlay.skip_url.search(page.url):
+            return
+        for selector in overlay.dismiss:
+            try:
+                await page.locator(selector).first.click(timeout=self.timeout)
+                return self._record(overlay)
+            except Exception:
+                continue
+        if overlay.key:
+            await page.keyboard.press(overlay.key)
+            self._record(overlay)
+
+    def _record(self, overlay):
+        self.dismissed[overlay.name] = self.dismissed.get(overlay.name, 0) + 1
+        self.log.info(f"Dismissed overlay {overlay.name}")
+
+
+# Registry of all page objects
+DEFAULT_OVERLAY_REGISTRY = OverlayRegistry.from_config()
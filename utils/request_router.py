@@ -0,0 +1,172 @@
+"""
+RequestRouter: Blocks or stubs page resources the tests never look at.
+"""
+import re
+import weakref
+
+from config.config import BLOCK_RESOURCES, ROUTE_ALLOWLIST
+from utils.logging_utils import get_logger
+
+# Resource categories that can be switched off, by Playwright resource type
+RESOURCE_TYPES = {
+    "images": {"image"},
+    "fonts": {"font"},
+    "media": {"media"},
+    "stylesheets": {"stylesheet"},
+}
+
+# Third-party and first-party tracking endpoints, matched against the request URL
+ANALYTICS_PATTERNS = [
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+    r"facebook\.(net|com)/tr",
+    r"bat\.bing\.com",
+    r"hotjar\.com",
+    r"sentry\.io",
+    r"/tracking/",
+    r"/api/v2/(client_events|logging|marketing_event_tracking)",
+]
+
+# Policy values: keep the resource, abort the request, or answer it with an empty body
+_POLICY_VALUES = ("on", "off", "stub")
+
+
+class RequestRouter:
+    """
+    Routes every request of a browser context through a block/stub policy.
+
+    Keeps per-category counters of blocked requests and the number and size of the
+    requests that went through, so they can be reported per test. The bytes a blocked
+    request would have cost are never downloaded, so they are not known.
+    """
+
+    def __init__(self, policy=None, allowlist=None):
+        """
+        Initialize the router.
+
+        Args:
+            policy: Dict of category ('images', 'fonts', 'media', 'stylesheets', 'analytics')
+                to 'on', 'off' or 'stub'. Missing categories are kept.
+            allowlist: Regexes of URLs that are never blocked
+        """
+        self.policy = {category: value for category, value in (policy or {}).items() if value != "on"}
+        self.allowlist = [re.compile(pattern) for pattern in (allowlist or [])]
+        self._analytics = re.compile("|".join(ANALYTICS_PATTERNS))
+        self.log = get_logger(self.__class__.__name__)
+        self.reset_stats()
+
+    @classmethod
+    def from_config(cls):
+        """Build a router from BLOCK_RESOURCES and ROUTE_ALLOWLIST."""
+        return cls(parse_policy(BLOCK_RESOURCES), [p for p in ROUTE_ALLOWLIST.split(",") if p.strip()])
+
+    @property
+    def enabled(self):
+        """Whether anything is blocked at all."""
+        return bool(self.policy)
+
+    def attach(self, context):
+        """
+        Install the router on a browser context (sync API).
+
+        Args:
+            context: Playwright browser context
+        """
+        if not self.enabled:
+            return
+        context.route("**/*", self._handle)
+        context.on("requestfinished", self._count_request)
+
+    async def aattach(self, context):
+        """Same as attach, for the async API."""
+        if not self.enabled:
+            return
+        await context.route("**/*", self._handle)
+        context.on("requestfinished", self._acount_request)
+
+    def reset_stats(self):
+        """Reset the counters (e.g. between tests)."""
+        self.blocked = {}
+        self._stubbed = weakref.WeakSet()
+        self.allowed_requests = 0
+        self.allowed_bytes = 0
+
+    def stats(self):
+        """
+        Return the counters since the last reset.
+
+        Returns:
+            dict: Blocked requests per category and total, requests and bytes loaded (headers and
+                body as transferred) by the ones that went through
+        """
+        return {
+            "blocked_requests": sum(self.blocked.values()),
+            "blocked_by_category": dict(self.blocked),
+            "allowed_requests": self.allowed_requests,
+            "allowed_bytes": self.allowed_bytes,
+        }
+
+    def _category(self, request):
+        """Return the policy category a request falls under, or None."""
+        url = request.url
+        if any(pattern.search(url) for pattern in self.allowlist):
+            return None
+        if "analytics" in self.policy and self._analytics.search(url):
+            return "analytics"
+        for category, resource_types in RESOURCE_TYPES.items():
+            if category in self.policy and request.resource_type in resource_types:
+                return category
+        return None
+
+    def _handle(self, route):
+        # Route calls are returned so the async API can await them (sync API returns None)
+        category = self._category(route.request)
+        if category is None:
+            return route.fallback()
+
+        self.blocked[category] = self.blocked.get(category, 0) + 1
+        if self.policy[category] == "stub":
+            # A stubbed request still finishes, but loaded nothing
+            self._stubbed.add(route.request)
+            return route.fulfill(status=200, body=b"")
+        return route.abort("blockedbyclient")
+
+    def _count_request(self, request):
+        # Transferred sizes, right for chunked and compressed bodies alike (content-length is not)
+        if request not in self._stubbed:
+            self._count(request.sizes())
+
+    async def _acount_request(self, request):
+        if request not in self._stubbed:
+            self._count(await request.sizes())
+
+    def _count(self, sizes):
+        self.allowed_requests += 1
+        self.allowed_bytes += sum(max(sizes[key], 0) for key in
+                                  ("requestHeadersSize", "requestBodySize", "responseHeadersSize", "responseBodySize"))
+
+
+def parse_policy(text):
+    """
+    Parse a policy string such as 'images=off,analytics=stub'.
+
+    Args:
+        text: Comma-separated category=value pairs
+
+    Returns:
+        dict: Category to policy value
+
+    Raises:
+        ValueError: On unknown categories or values
+    """
+    policy = {}
+    for pair in filter(None, (part.strip() for part in text.split(","))):
+        category, _, value = pair.partition("=")
+        category, value = category.strip(), value.strip() or "off"
+        if category not in RESOURCE_TYPES and category != "analytics":
+            raise ValueError(f"Unknown resource category '{category}' in '{text}'")
+        if value not in _POLICY_VALUES:
+            raise ValueError(f"Unknown policy '{value}' for '{category}', expected one of {_POLICY_VALUES}")
+        policy[category] = value
+    return policy
@@ -0,0 +1,301 @@
+"""
+ResultsStore: Append-only history of runs (listings, winner, reservation, step timings) with an index.
+
+Each run is one compact JSON line in the data file; a sidecar index (also JSON lines)
+holds the run id, location, dates, time and the byte range of every run, so queries
+only read the runs they match. Appends lock the data file, so pytest workers and
+async runners can share one store.
+
+Usage:
+    python -m utils.results_store --location "Tel Aviv" --price-drift
+    python -m utils.results_store --step-latency "AirbnbSearchPage.try_click.attempt:search.checkin"
+    python -m utils.results_store --regressions
+"""
+import argparse
+import fcntl
+import json
+import os
+import statistics
+import time
+import uuid
+from pathlib import Path
+
+from config.config import RESULTS_STORE_PATH, RUN_ID
+from utils.timing_profile import step_key
+
+# Fields of a run copied into the index
+INDEX_FIELDS = ("run_id", "location", "checkin", "checkout", "ts")
+
+
+def new_run_id():
+    """Id for a new run: RUN_ID if set (e.g. the CI build number), otherwise a random one."""
+    return RUN_ID or f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+def summarize_spans(spans):
+    """
+    Total duration per step of a test's spans.
+
+    Args:
+        spans: Span dicts of a StepTracer
+
+    Returns:
+        dict: {step key (see utils.timing_profile.step_key): total ms of its successful spans}
+    """
+    steps = {}
+    for span in spans:
+        if span["status"] == "ok":
+            key = step_key(span.get("page_object", "test"), span["name"], span.get("selector"))
+            steps[key] = round(steps.get(key, 0) + span["duration_ms"], 1)
+    return steps
+
+
+class ResultsStore:
+    """Append-only store of run results, queryable by location, dates and run id."""
+
+    def __init__(self, path=RESULTS_STORE_PATH):
+        """
+        Initialize the store (files are created on the first append).
+
+        Args:
+            path: JSON lines data file; the index is written next to it as <path>.idx
+        """
+        self.path = Path(path)
+        self.index_path = self.path.with_name(self.path.name + ".idx")
+
+    def record_run(self, run_id, scenario, listings, winner, reservation, spans=(), test=None):
+        """
+        Append the outcome of one scenario.
+
+        Args:
+            run_id: Id of the run (shared by all scenarios of a session)
+            scenario: Scenario dict ('location', 'checkin', 'checkout', 'adults', 'children')
+            listings: Ranked listings of the search, best first
+            winner: Selected listing
+            reservation: Reservation details
+            spans: Step spans of the scenario, stored as totals per step
+            test: Test node id or flow name
+
+        Returns:
+            dict: The stored record
+        """
+        record = {
+            "run_id": run_id,
+            "ts": round(time.time(), 3),
+            "test": test,
+            "worker": os.getenv("PYTEST_XDIST_WORKER", "main"),
+            **{key: scenario.get(key) for key in ("location", "checkin", "checkout", "adults", "children")},
+            "listings": listings,
+            "winner": winner,
+            "reservation": reservation,
+            "steps": summarize_spans(spans),
+        }
+        self.append(record)
+        return record
+
+    def append(self, record):
+        """
+        Append one record and its index entry (atomic against other writers).
+
+        Args:
+            record: JSON-serializable dict with at least the INDEX_FIELDS
+        """
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            offset = f.seek(0, os.SEEK_END)
+            self._sync_index(offset)
+            f.write(line)
+            f.flush()
+            self._append_index([self._index_entry(record, offset, len(line))])
+
+    # --- Queries ---
+
+    def index(self):
+        """Index entries of all runs, oldest first (rebuilt if behind the data file)."""
+        if not self.path.exists():
+            return []
+        with open(self.path, "rb") as f:
+            fcntl.flock(f, fcntl.LOCK_SH)
+            entries = self._read_index()
+            size = f.seek(0, os.SEEK_END)
+        if entries is not None and self._end_of(entries[-1] if entries else None) == size:
+            return entries
+
+        with open(self.path, "ab") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            if entries is None:
+                self.index_path.unlink(missing_ok=True)
+            self._sync_index(f.seek(0, os.SEEK_END))
+            return self._read_index() or []
+
+    def find(self, location=None, checkin=None, checkout=None, run_id=None, since=None):
+        """
+        Records matching all given criteria, oldest first.
+
+        Args:
+            location: Search location
+            checkin: Check-in date as stored (e.g. '2025-07-01')
+            checkout: Check-out date as stored
+            run_id: Run id
+            since: Only runs at or after this Unix time
+
+        Returns:
+            list: Matching run records
+        """
+        criteria = {"location": location, "checkin": checkin, "checkout": checkout, "run_id": run_id}
+        entries = [entry for entry in self.index()
+                   if all(value is None or entry[key] == value for key, value in criteria.items())
+                   and (since is None or entry["ts"] >= since)]
+        if not entries:
+            return []
+        records = []
+        with open(self.path, "rb") as f:
+            for entry in entries:
+                f.seek(entry["offset"])
+                records.append(json.loads(f.read(entry["length"])))
+        return records
+
+    def price_drift(self, location, checkin=None, checkout=None):
+        """
+        Price of the selected listing per run, for spotting drift over time.
+
+        Returns:
+            list: {'ts', 'run_id', 'price', 'url'} dicts, oldest first
+        """
+        return [{"ts": record["ts"], "run_id": record["run_id"], "price": record["winner"]["price"],
+                 "url": record["winner"]["url"]}
+                for record in self.find(location, checkin, checkout) if record.get("winner")]
+
+    def step_latency(self, step, location=None):
+        """
+        Duration of a step per run.
+
+        Args:
+            step: Step key, e.g. 'AirbnbSearchPage.try_click.attempt:search.checkin'
+            location: Only runs for this location
+
+        Returns:
+            list: {'ts', 'run_id', 'duration_ms'} dicts, oldest first
+        """
+        return [{"ts": record["ts"], "run_id": record["run_id"], "duration_ms": record["steps"][step]}
+                for record in self.find(location) if step in record.get("steps", {})]
+
+    def step_regressions(self, baseline=20, factor=1.5, location=None):
+        """
+        Steps whose latest duration exceeds the median of their previous runs by a factor.
+
+        Args:
+            baseline: Number of earlier observations the median is taken over
+            factor: Ratio of latest to median that counts as a regression
+            location: Only runs for this location
+
+        Returns:
+            list: {'step', 'run_id', 'latest_ms', 'baseline_ms', 'ratio'} dicts, worst first
+        """
+        history = {}
+        for record in self.find(location):
+            for step, duration_ms in record.get("steps", {}).items():
+                history.setdefault(step, []).append((record["run_id"], duration_ms))
+
+        regressions = []
+        for step, observations in history.items():
+            if len(observations) < 2:
+                continue
+            run_id, latest = observations[-1]
+            median = statistics.median(duration for _, duration in observations[-baseline - 1:-1])
+            if median > 0 and latest / median >= factor:
+                regressions.append({"step": step, "run_id": run_id, "latest_ms": latest, "baseline_ms": median,
+                                    "ratio": round(latest / median, 2)})
+        return sorted(regressions, key=lambda regression: regression["ratio"], reverse=True)
+
+    # --- Index maintenance (callers hold the data file lock) ---
+
+    @staticmethod
+    def _index_entry(record, offset, length):
+        return {**{key: record.get(key) for key in INDEX_FIELDS}, "offset": offset, "length": length}
+
+    @staticmethod
+    def _end_of(entry):
+        return entry["offset"] + entry["length"] if entry else 0
+
+    def _read_index(self):
+        """All index entries, or None if the index is damaged."""
+        try:
+            with open(self.index_path) as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+        except json.JSONDecodeError:
+            return None
+
+    def _index_end(self):
+        """Data file offset up to which the index is complete, from its last entry (None if damaged)."""
+        try:
+            with open(self.index_path, "rb") as f:
+                size = f.seek(0, os.SEEK_END)
+                if size == 0:
+                    return 0
+                f.seek(max(0, size - 4096))
+                return self._end_of(json.loads(f.read().splitlines()[-1]))
+        except FileNotFoundError:
+            return 0
+        except (ValueError, KeyError, IndexError):
+            return None
+
+    def _append_index(self, entries):
+        with open(self.index_path, "a") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def _sync_index(self, size):
+        """Index the runs written after the last index entry (e.g. by a writer that crashed)."""
+        covered = self._index_end()
+        if covered == size:
+            return
+        if covered is None or covered > size:
+            # Damaged, or the index of another data file: start over
+            self.index_path.unlink(missing_ok=True)
+            covered = 0
+
+        missing = []
+        with open(self.path, "rb") as f:
+            f.seek(covered)
+            offset = covered
+            for line in f:
+                if line.endswith(b"\n"):
+                    missing.append(self._index_entry(json.loads(line), offset, len(line)))
+                offset += len(line)
+        self._append_index(missing)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the run results store")
+    parser.add_argument("--store", default=RESULTS_STORE_PATH, help="Data file of the store (RESULTS_STORE_PATH)")
+    parser.add_argument("--location", help="Only runs for this location")
+    parser.add_argument("--checkin", help="Only runs with this check-in date")
+    parser.add_argument("--checkout", help="Only runs with this check-out date")
+    parser.add_argument("--run-id", help="Only this run")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--price-drift", action="store_true", help="Price of the selected listing per run")
+    group.add_argument("--step-latency", metavar="STEP", help="Duration of a step per run")
+    group.add_argument("--regressions", action="store_true",
+                       help="Steps whose latest duration is well above their recent median")
+    args = parser.parse_args()
+
+    store = ResultsStore(args.store)
+    if args.price_drift:
+        rows = store.price_drift(args.location, args.checkin, args.checkout)
+    elif args.step_latency:
+        rows = store.step_latency(args.step_latency, args.location)
+    elif args.regressions:
+        rows = store.step_regressions(location=args.location)
+    else:
+        rows = store.find(args.location, args.checkin, args.checkout, args.run_id)
+    for row in rows:
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+RetryPolicy: Backoff, retry budgets and circuit breaking for page interactions.
+"""
+import copy
+import random
+import time
+import weakref
+
+from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
+
+from config.config import (RETRY_BASE_DELAY_MS, RETRY_MAX_DELAY_MS, RETRY_JITTER, RETRY_BUDGET_MS, BREAKER_THRESHOLD,
+                           BREAKER_COOLDOWN_SEC)
+from utils.logging_utils import get_logger
+
+# Playwright error messages of elements that went away while being used (re-rendered by the site)
+_DETACHED_MARKERS = ("detached", "not attached")
+
+log = get_logger("RetryPolicy")
+
+
+def is_retryable(error):
+    """
+    Whether an interaction error is transient and worth another attempt.
+
+    Only timeouts and elements detached by a re-render are retried; anything else
+    (assertions, closed pages, bad selectors, suite time limits) fails fast.
+    """
+    if isinstance(error, PlaywrightTimeoutError):
+        return True
+    if isinstance(error, PlaywrightError):
+        message = str(error).lower()
+        return any(marker in message for marker in _DETACHED_MARKERS)
+    return False
+
+
+class RetryBudget:
+    """Retry time (failed attempts, recovery and backoff) still allowed for one test."""
+
+    def __init__(self, budget_ms=RETRY_BUDGET_MS):
+        """
+        Initialize the budget.
+
+        Args:
+            budget_ms: Total retry time allowed (in ms)
+        """
+        self.budget_ms = budget_ms
+        self.spent_ms = 0.0
+
+    @property
+    def remaining_ms(self):
+        """Retry time left (in ms)."""
+        return max(0.0, self.budget_ms - self.spent_ms)
+
+    @property
+    def exhausted(self):
+        """Whether no retry time is left."""
+        return self.remaining_ms <= 0
+
+    def spend(self, ms):
+        """Charge retry time to the budget."""
+        self.spent_ms += ms
+
+
+# One budget per Playwright page, i.e. per test (pages are not shared between tests)
+_budgets = weakref.WeakKeyDictionary()
+
+
+def retry_budget(page):
+    """
+    Return the retry budget of a page, creating it on first use.
+
+    Args:
+        page: Playwright page (sync or async)
+
+    Returns:
+        RetryBudget: Budget shared by all page objects of that page
+    """
+    if page not in _budgets:
+        _budgets[page] = RetryBudget()
+    return _budgets[page]
+
+
+class CircuitBreaker:
+    """
+    Stops retrying a selector after it failed several calls in a row.
+
+    An open breaker lets calls through with a single attempt. After the cooldown one
+    call is retried normally again: a success closes the breaker, a failure reopens it.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown_sec=BREAKER_COOLDOWN_SEC, clock=time.monotonic):
+        """
+        Initialize the breaker.
+
+        Args:
+            threshold: Consecutive failed calls that open the breaker (0 = never)
+            cooldown_sec: Seconds before an open breaker allows retries again
+            clock: Time source (in seconds)
+        """
+        self.threshold = threshold
+        self.cooldown_sec = cooldown_sec
+        self._clock = clock
+        self._failures = {}
+        self._opened_at = {}
+
+    def is_open(self, key):
+        """Whether calls for this key should not be retried."""
+        opened_at = self._opened_at.get(key)
+        if opened_at is None:
+            return False
+        if self._clock() - opened_at < self.cooldown_sec:
+            return True
+
+        # Half-open: allow one retried call, the next failure reopens at once
+        del self._opened_at[key]
+        self._failures[key] = self.threshold - 1
+        return False
+
+    def record_success(self, key):
+        """Close the breaker of a key."""
+        self._failures.pop(key, None)
+        self._opened_at.pop(key, None)
+
+    def record_failure(self, key):
+        """Count a failed call; opens the breaker at the threshold."""
+        self._failures[key] = self._failures.get(key, 0) + 1
+        if self.threshold and self._failures[key] >= self.threshold and key not in self._opened_at:
+            self._opened_at[key] = self._clock()
+            log.warning(f"Selector {key} failed {self._failures[key]} calls in a row, "
+                        f"not retrying it for {self.cooldown_sec}s")
+
+
+class RetryPolicy:
+    """
+    Runs an interaction with exponential backoff and jitter.
+
+    A retry happens only if the error is retryable, attempts are left, the test's
+    retry budget is not used up and the selector's breaker is closed. Sleeping and
+    recovery are passed in, so the same policy drives the sync and the async API.
+    """
+
+    def __init__(self, base_delay_ms=RETRY_BASE_DELAY_MS, max_delay_ms=RETRY_MAX_DELAY_MS, multiplier=2.0,
+                 jitter=RETRY_JITTER, breaker=None, classify=is_retryable, rng=None):
+        """
+        Initialize the policy.
+
+        Args:
+            base_delay_ms: Delay before the first retry (in ms)
+            max_delay_ms: Upper bound of any delay (in ms)
+            multiplier: Growth of the delay per retry
+            jitter: Fraction of each delay that is randomized (0 = fixed delays)
+            breaker: CircuitBreaker shared by the calls of this policy
+            classify: Callable telling whether an error is retryable
+            rng: Random source of the jitter
+        """
+        if not 0 <= jitter <= 1:
+            raise ValueError(f"jitter must be between 0 and 1, got {jitter}")
+        self.base_delay_ms = base_delay_ms
+        self.max_delay_ms = max_delay_ms
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.breaker = breaker or CircuitBreaker()
+        self.classify = classify
+        self.rng = rng or random.Random()
+
+    def with_base_delay(self, base_delay_ms):
+        """Return a copy of this policy with another first delay (sharing breaker and jitter source)."""
+        policy = copy.copy(self)
+        policy.base_delay_ms = base_delay_ms
+        return policy
+
+    def backoff_ms(self, retry):
+        """
+        Delay before the given retry.
+
+        Args:
+            retry: Retry number, starting at 1
+
+        Returns:
+            float: Delay in ms, between (1 - jitter) and 1 times the exponential delay
+        """
+        delay = min(self.max_delay_ms, self.base_delay_ms * self.multiplier ** (retry - 1))
+        return delay * (1 - self.jitter * self.rng.random())
+
+    def attempts_for(self, key, attempts):
+        """Number of attempts a call for this key gets (1 while its breaker is open)."""
+        return 1 if self.breaker.is_open(key) else attempts
+
+    def next_delay_ms(self, error, key, attempt, attempts, budget):
+        """
+        Decide what happens after a failed attempt.
+
+        Args:
+            error: Exception raised by the attempt
+            key: Selector (or other key) of the call
+            attempt: Number of the failed attempt, starting at 1
+            attempts: Attempts the call is allowed
+            budget: RetryBudget of the test, already charged for the failed attempt
+
+        Returns:
+            float: Delay before the next attempt (in ms), or None to raise the error
+        """
+        if not self.classify(error):
+            return None
+        if attempt >= attempts or budget.exhausted:
+            self.breaker.record_failure(key)
+            return None
+        return min(self.backoff_ms(attempt), budget.remaining_ms)
+
+    def call(self, operation, key, budget, attempts, sleep_ms, recover=None):
+        """
+        Run an operation under this policy (sync API).
+
+        Args:
+            operation: Callable taking the attempt number
+            key: Selector (or other key) the breaker tracks
+            budget: RetryBudget of the test
+            attempts: Maximum number of attempts
+            sleep_ms: Callable sleeping the given number of ms
+            recover: Optional callable run before each retry, taking the failed attempt number
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            Exception: The error of the last attempt
+        """
+        attempts = self.attempts_for(key, attempts)
+        for attempt in range(1, attempts + 1):
+            started = time.monotonic()
+            try:
+                result = operation(attempt)
+            except Exception as error:
+                budget.spend((time.monotonic() - started) * 1000)
+                delay_ms = self.next_delay_ms(error, key, attempt, attempts, budget)
+                if delay_ms is None:
+                    raise
+
+                started = time.monotonic()
+                if recover:
+                    recover(attempt)
+                sleep_ms(delay_ms)
+                budget.spend((time.monotonic() - started) * 1000)
+            else:
+                self.breaker.record_success(key)
+                return result
+
+    async def acall(self, operation, key, budget, attempts, sleep_ms, recover=None):
+        """
+        Run an operation under this policy (async API).
+
+        Same as call, with coroutine functions for operation, sleep_ms and recover.
+        """
+        attempts = self.attempts_for(key, attempts)
+        for attempt in range(1, attempts + 1):
+            started = time.monotonic()
+            try:
+                result = await operation(attempt)
+            except Exception as error:
+                budget.spend((time.monotonic() - started) * 1000)
+                delay_ms = self.next_delay_ms(error, key, attempt, attempts, budget)
+                if delay_ms is None:
+                    raise
+
+                started = time.monotonic()
+                if recover:
+                    await recover(attempt)
+                await sleep_ms(delay_ms)
+                budget.spend((time.monotonic() - started) * 1000)
+            else:
+                self.breaker.record_success(key)
+                return result
+
+
+# Policy of all page objects; its breaker is shared by every test of the process
+DEFAULT_RETRY_POLICY = RetryPolicy()
@@ -0,0 +1,128 @@
+"""
+Scenario source: streams test scenarios from JSON/JSONL/CSV and shards them across workers.
+"""
+import csv
+import hashlib
+import heapq
+import json
+from pathlib import Path
+
+# CSV columns converted to int (everything else stays a string)
+_INT_FIELDS = ("adults", "children")
+
+
+def iter_scenarios(path):
+    """
+    Yield scenarios one at a time.
+
+    JSONL and CSV files are read line by line, so large matrices are never held in
+    memory as a whole. A JSON file may hold a single scenario object or a list.
+
+    Args:
+        path: Path to a .json, .jsonl or .csv file
+
+    Yields:
+        dict: One scenario (location, adults, children, checkin, checkout, phone, ...)
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    with open(path, newline="") as f:
+        if suffix == ".jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif suffix == ".csv":
+            for row in csv.DictReader(f):
+                yield {key: int(value) if key in _INT_FIELDS else value for key, value in row.items()}
+        elif suffix == ".json":
+            data = json.load(f)
+            yield from data if isinstance(data, list) else [data]
+        else:
+            raise ValueError(f"Unsupported scenario file '{path}', expected .json, .jsonl or .csv")
+
+
+def scenario_id(scenario):
+    """
+    Return the stable id of a scenario: its 'id' field, or one built from its search values.
+
+    Args:
+        scenario: Scenario dict
+
+    Returns:
+        str: Id used as pytest parameter id and as duration history key
+    """
+    if scenario.get("id"):
+        return str(scenario["id"])
+    return (f"{scenario['location']}_{scenario['checkin']}_{scenario['checkout']}"
+            f"_{scenario['adults']}a{scenario['children']}c").replace(" ", "-")
+
+
+def hash_shard(key, shard_count):
+    """Deterministic shard of a key, independent of Python's hash seed."""
+    return int(hashlib.sha1(key.encode()).hexdigest(), 16) % shard_count
+
+
+def assign_shards(ids, shard_count, durations=None):
+    """
+    Assign scenario ids to shards.
+
+    Scenarios without history keep their hash-based shard, so assignments stay stable
+    as the matrix grows. Scenarios with a known duration are then placed longest first
+    on the least loaded shard (LPT), which balances the expected wall time per shard.
+
+    Args:
+        ids: Scenario ids
+        shard_count: Number of shards
+        durations: Dict of scenario id to historical duration in seconds
+
+    Returns:
+        dict: Scenario id to shard index
+    """
+    durations = durations or {}
+    assignment = {}
+    load = [0.0] * shard_count
+    known = []
+
+    for sid in ids:
+        if sid in durations:
+            known.append(sid)
+        else:
+            assignment[sid] = hash_shard(sid, shard_count)
+
+    # Unknown scenarios count as an average one when balancing the known ones
+    average = sum(durations[sid] for sid in known) / len(known) if known else 0.0
+    for shard in assignment.values():
+        load[shard] += average
+
+    heap = [(shard_load, shard) for shard, shard_load in enumerate(load)]
+    heapq.heapify(heap)
+    for sid in sorted(known, key=lambda s: (-durations[s], s)):
+        shard_load, shard = heapq.heappop(heap)
+        assignment[sid] = shard
+        heapq.heappush(heap, (shard_load + durations[sid], shard))
+
+    return assignment
+
+
+def iter_sharded_scenarios(path, shard_count=1, durations=None, shard_index=None):
+    """
+    Stream scenarios together with their id and shard.
+
+    The file is read twice: once for the ids (to balance the shards), then again to
+    yield the scenarios, keeping only the requested shard if one is given.
+
+    Args:
+        path: Scenario file
+        shard_count: Number of shards
+        durations: Dict of scenario id to historical duration in seconds
+        shard_index: Only yield scenarios of this shard (None yields all)
+
+    Yields:
+        tuple: (scenario id, shard index, scenario dict)
+    """
+    assignment = assign_shards((scenario_id(s) for s in iter_scenarios(path)), shard_count, durations)
+    for scenario in iter_scenarios(path):
+        sid = scenario_id(scenario)
+        if shard_index is None or assignment[sid] == shard_index:
+            yield sid, assignment[sid], scenario
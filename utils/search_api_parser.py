@@ -0,0 +1,98 @@
+"""
+Parses listings out of Airbnb search API (StaysSearch) JSON payloads.
+
+The parser returns the same raw card fields as the DOM extraction in
+AirbnbResultPage ('rating', 'price', 'href', 'title'), so both sources share
+the same parsing, filtering and ranking.
+"""
+import base64
+from urllib.parse import urlparse, parse_qs, urlencode
+
+# Search URL query parameters carried over to listing URLs (search name -> listing name)
+_LISTING_QUERY_PARAMS = {"adults": "adults", "children": "children", "checkin": "check_in", "checkout": "check_out"}
+
+
+def parse_search_results(payload, search_url):
+    """
+    Extract raw card fields for every listing in a search API payload.
+
+    Args:
+        payload: Decoded JSON body of a StaysSearch response
+        search_url: URL of the result page, used to carry dates and guests into listing URLs
+
+    Returns:
+        list: One dict of raw card fields per search result, in response order
+    """
+    listing_query = _listing_query(search_url)
+    cards = []
+    for results in _find_values(payload, "searchResults"):
+        if not isinstance(results, list):
+            continue
+        for result in results:
+            listing_id = _listing_id(result)
+            if not listing_id:
+                continue
+            cards.append({
+                "rating": result.get("avgRatingLocalized"),
+                "price": _nightly_price(result),
+                "href": f"/rooms/{listing_id}" + (f"?{listing_query}" if listing_query else ""),
+                "title": _title(result),
+            })
+    return cards
+
+
+def _find_values(node, key):
+    """Yield every value stored under `key` anywhere in a JSON tree."""
+    if isinstance(node, dict):
+        for k, value in node.items():
+            if k == key:
+                yield value
+            else:
+                yield from _find_values(value, key)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _find_values(item, key)
+
+
+def _listing_query(search_url):
+    """Build the listing URL query (dates and guests) from the search URL."""
+    query = parse_qs(urlparse(search_url).query)
+    params = {listing_name: query[search_name][0]
+              for search_name, listing_name in _LISTING_QUERY_PARAMS.items() if search_name in query}
+    return urlencode(params)
+
+
+def _listing_id(result):
+    """Return the numeric listing id of a search result, or None."""
+    listing = result.get("listing") or {}
+    if listing.get("id"):
+        return str(listing["id"])
+
+    # Newer payloads only carry a relay id: base64("DemandStayListing:<id>")
+    relay_id = (result.get("demandStayListing") or {}).get("id")
+    if relay_id:
+        try:
+            decoded = base64.b64decode(relay_id + "=" * (-len(relay_id) % 4)).decode()
+        except ValueError:
+            return None
+        return decoded.rsplit(":", 1)[-1] or None
+    return None
+
+
+def _nightly_price(result):
+    """Return the nightly price label ('$123 per night'), or None if only a total is quoted."""
+    line = (result.get("structuredDisplayPrice") or {}).get("primaryLine") or {}
+    label = line.get("accessibilityLabel") or ""
+    if " per night" in label:
+        return label
+    price = line.get("discountedPrice") or line.get("price")
+    if price and line.get("qualifier") == "night":
+        return f"{price} per night"
+    return None
+
+
+def _title(result):
+    """Return the listing name, falling back to its category title."""
+    listing = result.get("listing") or {}
+    name = (result.get("nameLocalized") or {}).get("localizedStringWithTranslationPreference")
+    return (name or listing.get("name") or result.get("title") or listing.get("title") or "").strip()
@@ -0,0 +1,62 @@
+import heapq
+import os
+import pytest
+
+from utils.step_tracer import start_tracing, stop_tracing
+
+DEFAULT_TRACE_DIR = os.getenv("STEP_TRACE_DIR", "reports/traces")
+DEFAULT_SLOWEST_STEPS = 10
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--step-trace-dir",
+        action="store",
+        default=DEFAULT_TRACE_DIR,
+        help="Directory for per-test step spans (<test>.jsonl and Chrome <test>.trace.json) (STEP_TRACE_DIR)"
+    )
+    parser.addoption(
+        "--slowest-steps",
+        action="store",
+        type=int,
+        default=DEFAULT_SLOWEST_STEPS,
+        help="Number of slowest steps listed in the terminal summary (0 = none)"
+    )
+
+@pytest.fixture(autouse=True)
+def step_tracer(request):
+    """Trace the page-object steps of every test and write them when it ends."""
+    tracer, token = start_tracing(request.node.nodeid)
+    yield tracer
+    stop_tracing(token)
+
+    if not tracer.spans:
+        return
+    tracer.write(request.config.getoption("--step-trace-dir"))
+
+    # Carried on the teardown report, so the summary also works with xdist workers
+    slowest = heapq.nlargest(request.config.getoption("--slowest-steps"), tracer.spans,
+                             key=lambda span: span["duration_ms"])
+    request.node.user_properties.append(("step_timing", {
+        "slowest": [{"test": request.node.nodeid, **span} for span in slowest],
+        "retry_ms": tracer.retry_time_ms(),
+    }))
+
+def pytest_terminal_summary(terminalreporter, config):
+    limit = config.getoption("--slowest-steps")
+    timings = [value for reports in terminalreporter.stats.values() for report in reports
+               if getattr(report, "when", None) == "teardown"
+               for name, value in getattr(report, "user_properties", []) if name == "step_timing"]
+    if not timings or limit <= 0:
+        return
+
+    slowest = heapq.nlargest(limit, (span for timing in timings for span in timing["slowest"]),
+                             key=lambda span: span["duration_ms"])
+    terminalreporter.section("slowest page-object steps")
+    for span in slowest:
+        target = span.get("selector") or span.get("url") or ""
+        attempt = f" attempt {span['attempt']}" if "attempt" in span else ""
+        terminalreporter.write_line(
+            f"{span['duration_ms'] / 1000:8.2f}s  {span.get('page_object', '-')}.{span['name']}{attempt} "
+            f"[{span['status']}] {target[:80]}  ({span['test']})")
+    retry_ms = sum(timing["retry_ms"] for timing in timings)
+    terminalreporter.write_line(f"Time lost to retries: {retry_ms / 1000:.2f}s over {len(timings)} tests")
@@ -0,0 +1,155 @@
+"""
+StepTracer: Timing spans for page-object steps, exported as JSON lines and Chrome trace events.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Span names whose time counts as lost to retries
+RETRY_SPANS = ("retry_delay", "retry_refresh")
+
+_current = contextvars.ContextVar("step_tracer", default=None)
+
+
+class StepTracer:
+    """
+    Collects timing spans of one test (or one async flow).
+
+    A span records its name, start offset and duration in ms, an 'ok'/'error' status
+    and free-form tags (page object, method, selector, attempt, ...). Failed attempts
+    of retried steps carry 'attempt' and status 'error', so the time lost to retries
+    is the sum of failed attempts and retry delays.
+    """
+
+    def __init__(self, test_id):
+        """
+        Initialize the tracer.
+
+        Args:
+            test_id: Name of the test or flow the spans belong to
+        """
+        self.test_id = test_id
+        self.spans = []
+        self._origin = time.perf_counter()
+        self._depth = 0
+        self._open = []
+
+    @property
+    def current_step(self):
+        """Name of the innermost span still running, or None."""
+        return self._open[-1] if self._open else None
+
+    @contextmanager
+    def span(self, name, **tags):
+        """
+        Time the enclosed block as one span.
+
+        Args:
+            name: Step name (e.g. 'try_click', 'try_click.attempt', 'goto')
+            **tags: Extra fields stored with the span; None values are dropped
+        """
+        start = time.perf_counter()
+        status = "ok"
+        self._depth += 1
+        self._open.append(name)
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            self._depth -= 1
+            self._open.pop()
+            self.spans.append({
+                "name": name,
+                "start_ms": round((start - self._origin) * 1000, 3),
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                "depth": self._depth,
+                "status": status,
+                **{key: value for key, value in tags.items() if value is not None},
+            })
+
+    def retry_time_ms(self):
+        """Total time spent in failed attempts and retry delays (in ms)."""
+        return sum(span["duration_ms"] for span in self.spans
+                   if span["name"] in RETRY_SPANS or ("attempt" in span and span["status"] == "error"))
+
+    def write(self, directory):
+        """
+        Write the spans as <test>.jsonl and as Chrome trace events <test>.trace.json.
+
+        The trace file opens in chrome://tracing or https://ui.perfetto.dev.
+
+        Args:
+            directory: Output directory (created if missing)
+
+        Returns:
+            tuple: Paths of the JSON lines file and the trace file
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        name = self.test_id.replace("/", "_").replace("\\", "_").replace("::", "__")
+
+        jsonl_path = directory / f"{name}.jsonl"
+        with open(jsonl_path, "w") as f:
+            for span in sorted(self.spans, key=lambda span: span["start_ms"]):
+                f.write(json.dumps({"test": self.test_id, **span}) + "\n")
+
+        trace_path = directory / f"{name}.trace.json"
+        with open(trace_path, "w") as f:
+            json.dump({"traceEvents": [self._trace_event(span) for span in self.spans],
+                       "displayTimeUnit": "ms"}, f)
+
+        return jsonl_path, trace_path
+
+    def _trace_event(self, span):
+        args = {key: value for key, value in span.items() if key not in ("name", "start_ms", "duration_ms")}
+        return {
+            "name": span["name"],
+            "cat": span.get("page_object", "test"),
+            "ph": "X",
+            "ts": round(span["start_ms"] * 1000),
+            "dur": round(span["duration_ms"] * 1000),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+
+
+class _NullTracer:
+    """Tracer used when no test is being traced; spans cost nothing."""
+
+    test_id = None
+    current_step = None
+
+    @contextmanager
+    def span(self, name, **tags):
+        yield
+
+
+_NULL_TRACER = _NullTracer()
+
+
+def current_tracer():
+    """Return the tracer of the running test or flow, or a no-op tracer."""
+    return _current.get() or _NULL_TRACER
+
+
+def start_tracing(test_id):
+    """
+    Make a new tracer current for the running test or flow.
+
+    Returns:
+        tuple: (tracer, token to pass to stop_tracing)
+    """
+    tracer = StepTracer(test_id)
+    return tracer, _current.set(tracer)
+
+
+def stop_tracing(token):
+    """Restore the tracer that was current before start_tracing."""
+    _current.reset(token)
@@ -1,8 +1,25 @@
+import _thread
 import pytest
+import signal
+import threading
 import time
 import os
 
+from utils.duration_store import DurationStore
+
 DEFAULT_TIMEOUT = int(os.getenv("SUITE_TIMEOUT_SEC", 900))
+DEFAULT_TEST_SLICE = int(os.getenv("TEST_TIME_SLICE_SEC", 0))
+DEFAULT_ABORT_GRACE = int(os.getenv("SUITE_ABORT_GRACE_SEC", 30))
+DEFAULT_DURATIONS_PATH = os.getenv("TEST_DURATIONS_PATH", "temp/test_durations.json")
+
+class TimeSliceExceeded(BaseException):
+    """
+    Raised inside a test that ran past its time slice or past the suite budget.
+
+    The alarm fires at whatever line the test is running, so this derives from
+    BaseException (like pytest's own Failed): `except Exception` handlers in page
+    objects and the retry loop cannot swallow it.
+    """
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -12,12 +29,125 @@ def pytest_addoption(parser):
         default=DEFAULT_TIMEOUT,
         help="Fail the suite if it runs longer than the given number of seconds (from SUITE_TIMEOUT_SEC in .env)"
     )
+    parser.addoption(
+        "--test-time-slice",
+        action="store",
+        type=int,
+        default=DEFAULT_TEST_SLICE,
+        help="Fail a single test after this many seconds, 0 = only bounded by the suite budget (TEST_TIME_SLICE_SEC)"
+    )
+    parser.addoption(
+        "--suite-abort-grace",
+        action="store",
+        type=int,
+        default=DEFAULT_ABORT_GRACE,
+        help="Seconds past the suite budget before a stuck run is interrupted (SUITE_ABORT_GRACE_SEC)"
+    )
+    parser.addoption(
+        "--durations-path",
+        action="store",
+        default=DEFAULT_DURATIONS_PATH,
+        help="Per-test duration history used to order and pre-skip tests (TEST_DURATIONS_PATH)"
+    )
+
+def pytest_configure(config):
+    config.test_durations = DurationStore(config.rootpath / config.getoption("--durations-path"))
+    config.observed_durations = {}
+    # Set to False (e.g. by a conftest) to leave the history untouched for this run
+    config.record_test_durations = True
 
 def pytest_sessionstart(session):
     session.start_time = time.time()
+    session.deadline = session.start_time + session.config.getoption("--suite-timeout")
+
+    # Watchdog: stop scheduling at the deadline, interrupt a stuck test after the grace period.
+    # KeyboardInterrupt still runs pytest_sessionfinish, so reports are written.
+    session.finished = threading.Event()
+    grace = session.config.getoption("--suite-abort-grace")
+
+    def watchdog():
+        if session.finished.wait(max(0.0, session.deadline - time.time())):
+            return
+        session.shouldstop = "Suite budget exhausted"
+        if not session.finished.wait(grace):
+            _thread.interrupt_main()
+
+    threading.Thread(target=watchdog, name="suite-timeout-watchdog", daemon=True).start()
+
+def remaining_budget(session):
+    return session.deadline - time.time()
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(session, config, items):
+    """Run the longest tests first and skip up front the ones that cannot fit in the budget."""
+    history = config.test_durations
+    known = [history.get(item.nodeid) for item in items if history.get(item.nodeid) is not None]
+    if not known:
+        return
+
+    # Tests without history count as an average one
+    average = sum(known) / len(known)
+    estimate = {item.nodeid: history.get(item.nodeid, average) for item in items}
+    items.sort(key=lambda item: estimate[item.nodeid], reverse=True)
+
+    # Parallel workers share the budget, so the capacity grows with their number
+    capacity = config.getoption("--suite-timeout") * int(os.getenv("PYTEST_XDIST_WORKER_COUNT", 1))
+    planned = 0.0
+    for item in items:
+        if planned + estimate[item.nodeid] > capacity:
+            item.add_marker(pytest.mark.skip(
+                reason=f"Expected {estimate[item.nodeid]:.0f}s does not fit in the remaining suite budget"))
+        else:
+            planned += estimate[item.nodeid]
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    session = item.session
+    remaining = remaining_budget(session)
+    if remaining <= 0:
+        session.shouldstop = "Suite budget exhausted"
+        item.add_marker(pytest.mark.skip(reason="Suite budget exhausted"))
+
+    # Time slice of this test: its own limit, never past the suite deadline
+    time_slice = item.config.getoption("--test-time-slice")
+    limit = min(time_slice, remaining) if time_slice > 0 else remaining
+    alarm = limit > 0 and hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+    if alarm:
+        def on_alarm(signum, frame):
+            if remaining_budget(session) <= 0:
+                session.shouldstop = "Suite budget exhausted"
+                raise TimeSliceExceeded(f"Suite budget of {item.config.getoption('--suite-timeout')}s exhausted")
+            raise TimeSliceExceeded(f"Test exceeded its time slice of {time_slice}s")
+
+        previous_handler = signal.signal(signal.SIGALRM, on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, limit)
+    try:
+        yield
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    # Setup, call and teardown all count towards a test's duration
+    outcome = yield
+    report = outcome.get_result()
+    if not report.skipped:
+        observed = item.config.observed_durations
+        observed[item.nodeid] = observed.get(item.nodeid, 0.0) + report.duration
 
 def pytest_sessionfinish(session, exitstatus):
+    session.finished.set()
+
+    # Each process (or xdist worker) merges the durations of the tests it ran into the history
+    if session.config.record_test_durations:
+        for nodeid, duration in session.config.observed_durations.items():
+            session.config.test_durations.record(nodeid, duration)
+        session.config.test_durations.save()
+
     timeout = session.config.getoption("--suite-timeout")
     elapsed = time.time() - session.start_time
     if elapsed > timeout:
-        pytest.exit(f"Test suite exceeded timeout of {timeout} seconds (elapsed: {elapsed:.2f})", returncode=1)
\ No newline at end of file
+        pytest.exit(f"Test suite exceeded timeout of {timeout} seconds (elapsed: {elapsed:.2f})", returncode=1)
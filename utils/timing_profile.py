@@ -0,0 +1,151 @@
+"""
+TimingProfile: Per-step timeouts derived from the durations observed in earlier runs.
+"""
+import fcntl
+import json
+import math
+import os
+from pathlib import Path
+
+from config.config import (TIMING_PROFILE, TIMING_PROFILE_PATH, TIMING_HEADROOM, TIMING_MIN_SAMPLES, TIMING_MIN_MS,
+                           TIMING_MAX_MS)
+
+PROFILES = ("local", "ci", "replay")
+
+# Spans whose successful durations size the timeouts of the same step
+TUNED_STEPS = ("try_click.attempt", "try_to_get_by_role.attempt", "try_to_get_text.attempt", "wait_for_element",
+               "wait_for_url_change", "wait_for_cards", "wait_for_new_cards", "resolve")
+
+
+def resolve_profile(name=TIMING_PROFILE, replay=False):
+    """
+    Name of the timing profile to use.
+
+    Args:
+        name: 'local', 'ci', 'replay', 'off' or 'auto' (replay when replaying HAR files,
+            ci when the CI environment variable is set, local otherwise)
+        replay: Whether the run replays recorded traffic
+
+    Returns:
+        str: Profile name, or 'off'
+    """
+    if name == "auto":
+        return "replay" if replay else "ci" if os.getenv("CI") else "local"
+    if name != "off" and name not in PROFILES:
+        raise ValueError(f"Unknown timing profile '{name}', expected 'auto', 'off' or one of {PROFILES}")
+    return name
+
+
+def step_key(page_object, step, selector=None):
+    """Key of a step in the profile (e.g. 'AirbnbSearchPage.try_click.attempt:search.checkin')."""
+    return f"{page_object}.{step}:{selector or ''}"
+
+
+class TimingProfile:
+    """
+    Recent durations per step for one environment, and the timeouts they imply.
+
+    A step's timeout is its p99 duration times the headroom, kept within
+    [min_ms, max_ms]. Until a step has `min_samples` observations the caller's
+    default applies. The file holds all profiles; saving merges the new samples
+    with what other workers wrote in the meantime and keeps the latest `max_samples`.
+    """
+
+    def __init__(self, path=TIMING_PROFILE_PATH, profile=None, percentile=0.99, headroom=TIMING_HEADROOM,
+                 min_samples=TIMING_MIN_SAMPLES, min_ms=TIMING_MIN_MS, max_ms=TIMING_MAX_MS, max_samples=200):
+        """
+        Initialize the profile and load its history.
+
+        Args:
+            path: JSON file holding {profile: {step key: [durations in ms]}}
+            profile: Profile name, or 'off' for fixed defaults (None = resolve_profile())
+            percentile: Percentile of the durations a timeout is based on
+            headroom: Factor applied to that percentile
+            min_samples: Observations needed before a step's timeout is tuned
+            min_ms: Lower bound of a tuned timeout (in ms)
+            max_ms: Upper bound of a tuned timeout (in ms)
+            max_samples: Durations kept per step
+        """
+        self.path = Path(path)
+        self.profile = profile or resolve_profile()
+        self.percentile = percentile
+        self.headroom = headroom
+        self.min_samples = min_samples
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.max_samples = max_samples
+        self._samples = self._load().get(self.profile, {}) if self.enabled else {}
+        self._updates = {}
+        self._timeouts = {}
+
+    @property
+    def enabled(self):
+        """Whether timeouts are tuned (False for the 'off' profile)."""
+        return self.profile != "off"
+
+    def timeout_ms(self, key, default):
+        """
+        Timeout of a step.
+
+        Args:
+            key: Step key (see step_key)
+            default: Timeout used while the step has too few observations (in ms)
+
+        Returns:
+            int: Timeout in ms
+        """
+        if not self.enabled:
+            return default
+        if key not in self._timeouts:
+            samples = self._samples.get(key, [])
+            if len(samples) < self.min_samples:
+                return default
+            ordered = sorted(samples)
+            observed = ordered[min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)]
+            self._timeouts[key] = round(min(self.max_ms, max(self.min_ms, observed * self.headroom)))
+        return self._timeouts[key]
+
+    def record(self, key, duration_ms):
+        """Add an observed duration of a step (applies to timeouts from the next run on)."""
+        if self.enabled:
+            self._updates.setdefault(key, []).append(round(duration_ms, 1))
+
+    def record_spans(self, spans):
+        """
+        Add the successful tuned steps among a test's spans.
+
+        Args:
+            spans: Span dicts of a StepTracer
+        """
+        for span in spans:
+            if span["name"] in TUNED_STEPS and span["status"] == "ok":
+                self.record(step_key(span.get("page_object"), span["name"], span.get("selector")),
+                            span["duration_ms"])
+
+    def save(self):
+        """Write the recorded durations, merged with the current file contents."""
+        if not self._updates:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_name(self.path.name + ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            profiles = self._load()
+            steps = profiles.setdefault(self.profile, {})
+            for key, durations in self._updates.items():
+                steps[key] = (steps.get(key, []) + durations)[-self.max_samples:]
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(profiles, f, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        self._updates = {}
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+
+# Timing profile of all page objects; conftest replaces it once the run's profile is known
+DEFAULT_TIMING_PROFILE = TimingProfile()